@@ -1,3 +1,4 @@
+import click
 from flask import Flask, jsonify, redirect, send_from_directory
 from flask_cors import CORS
 import os
@@ -5,9 +6,12 @@ from datetime import datetime
 import logging
 from config import config
 from models.user import db, User
-from models.conversation import Conversation
+from models.conversation import Conversation, backfill_conversation_flags, backfill_conversation_settings
+from models.schema import ensure_schema
+from models.stats import reconcile_stats_counters
 from routes.chat import chat_bp
 from routes.admin import admin_bp
+from services.rag_pipeline import rag_pipeline
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -35,11 +39,40 @@ db.init_app(app)
 app.register_blueprint(chat_bp)
 app.register_blueprint(admin_bp)
 
-# Create tables
+# Create tables; columns added to existing databases since, and their
+# backfills, are applied once with `flask --app app upgrade-db` rather than
+# in every worker process
 with app.app_context():
     db.create_all()
 
 
+@app.cli.command('upgrade-db')
+def upgrade_db():
+    """Upgrade an existing database: new columns and indexes, backfills and stats counters"""
+    added = ensure_schema()
+    click.echo(f"Schema: added {', '.join(added)}" if added else "Schema: up to date")
+
+    # Flag conversations stored before crisis flagging existed
+    backfilled = backfill_conversation_flags(app_config.FLAG_BACKFILL_BATCH_SIZE)
+    click.echo(f"Backfilled crisis flags for {backfilled} conversations")
+    if 'conversations.mode' in added:
+        # Only once, when the columns first appear: rows whose context has
+        # no mode stay NULL and would otherwise be re-read on every run
+        backfilled = backfill_conversation_settings(app_config.FLAG_BACKFILL_BATCH_SIZE)
+        click.echo(f"Backfilled chat mode for {backfilled} conversations")
+
+    # Seed the dashboard counters, or correct them after writes that
+    # bypassed the ORM (e.g. manual SQL; POST /admin/api/stats/reconcile
+    # does the same without a deploy)
+    drift = reconcile_stats_counters()
+    click.echo(f"Reconciled stats counters: {drift}" if drift else "Stats counters: in sync")
+
+
+# Pick up resource data edits without a restart
+if app_config.RESOURCE_RELOAD_INTERVAL > 0:
+    rag_pipeline.start_watcher(app_config.RESOURCE_RELOAD_INTERVAL)
+
+
 @app.route('/')
 def home():
     """Serve the frontend HTML file"""
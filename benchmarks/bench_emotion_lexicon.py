@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for the local lexicon emotion scorer
+
+Usage: python benchmarks/bench_emotion_lexicon.py [message_count]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.emotion_lexicon import emotion_scorer  # noqa: E402
+
+SAMPLE_MESSAGES = [
+    "I'm hungry",
+    "need a shelter",
+    "thanks",
+    "I lost my job last week and I'm really worried about paying rent",
+    "I feel hopeless and I don't know where to turn",
+    "Things are getting better, I have an interview tomorrow and I'm excited",
+    "I'm not happy with how things are going but I'm trying to stay motivated",
+    "My family got evicted and we are sleeping in the car, I am so scared",
+    "Can you help me find a food bank near Oakland?",
+    "I finally found a place to stay, feeling grateful and relieved",
+]
+
+
+def build_corpus(count: int):
+    random.seed(7)
+    return [random.choice(SAMPLE_MESSAGES) for _ in range(count)]
+
+
+def bench(label: str, fn, count: int, repeats: int = 3):
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<28} {best * 1000:9.2f} ms   {count / best:12,.0f} msgs/sec")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    corpus = build_corpus(count)
+
+    print(f"Scoring {count:,} messages (best of 3)")
+    print("-" * 64)
+    bench("score_batch (vectorized)", lambda: emotion_scorer.score_batch(corpus), count)
+    bench("score (one at a time)", lambda: [emotion_scorer.score(text) for text in corpus], count)
+
+
+if __name__ == "__main__":
+    main()
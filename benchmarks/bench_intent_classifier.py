@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compiled intent classifier against the per-service keyword scans
+
+The legacy functions below reproduce the substring scans that Gemini, Claude,
+the RAG pipeline and the admin flagging each ran over the same message.
+
+Usage: python benchmarks/bench_intent_classifier.py [words_per_message]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.intent_classifier import intent_classifier  # noqa: E402
+
+LEGACY_GREETINGS = ['hi', 'hello', 'hey', 'good morning', 'good afternoon', 'good evening', 'sup', "what's up"]
+LEGACY_CRISIS = ['hurt', 'unsafe', 'no home', 'suicidal', 'kill myself',
+                 'end it all', 'want to die', 'hopeless', 'nowhere to go']
+LEGACY_GEMINI_NEEDS = [
+    ('food', ['food', 'hungry', 'eat', 'meal', 'grocery']),
+    ('housing', ['housing', 'shelter', 'homeless', 'place to stay', 'rent']),
+    ('health', ['health', 'medical', 'doctor', 'clinic', 'sick']),
+    ('employment', ['job', 'work', 'employment', 'income']),
+    ('mental_health', ['mental', 'therapy', 'counseling', 'depression', 'anxiety']),
+    ('legal', ['legal', 'lawyer', 'immigration', 'eviction'])
+]
+LEGACY_CLAUDE_NEEDS = [
+    ('food', ["food", "hungry", "eat", "meal"]),
+    ('shelter', ["shelter", "housing", "sleep", "bed", "place to stay"]),
+    ('healthcare', ["health", "medical", "doctor", "clinic", "sick"]),
+    ('employment', ["job", "work", "employment", "career"])
+]
+
+FILLER = ("I have been trying to keep things together for my kids but this month has been really "
+          "difficult and the landlord keeps calling about the money we owe and I do not know "
+          "who else to ask").split()
+SIGNALS = ["hungry", "place to stay", "lost my job", "doctor", "hopeless", "therapy", "eviction"]
+
+
+def legacy_scan(message: str):
+    lower = message.lower()
+    greeting = any(g in lower.strip() for g in LEGACY_GREETINGS) and len(lower.split()) <= 3
+    gemini = [need for need, words in LEGACY_GEMINI_NEEDS if any(w in lower for w in words)]
+    claude = [need for need, words in LEGACY_CLAUDE_NEEDS if any(w in lower for w in words)]
+    crisis = any(k in lower for k in LEGACY_CRISIS)
+    flagged = any(k in lower for k in LEGACY_CRISIS)
+    return greeting, gemini, claude, crisis, flagged
+
+
+def build_messages(words: int, count: int = 200):
+    rng = random.Random(7)
+    messages = []
+    for _ in range(count):
+        tokens = [rng.choice(FILLER) for _ in range(words)]
+        for signal in rng.sample(SIGNALS, 2):
+            tokens.insert(rng.randrange(len(tokens)), signal)
+        messages.append(' '.join(tokens))
+    return messages
+
+
+def bench(label: str, fn, messages, repeats: int = 5):
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for message in messages:
+            fn(message)
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<28} {best / len(messages) * 1e6:9.1f} us/msg")
+
+
+def main():
+    sizes = [int(sys.argv[1])] if len(sys.argv) > 1 else [20, 200, 2000]
+    for words in sizes:
+        messages = build_messages(words)
+        print(f"\nMessages of ~{words} words (best of 5)")
+        print("-" * 48)
+        bench("legacy substring scans", legacy_scan, messages)
+        bench("compiled classifier", intent_classifier.classify, messages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark keyword, semantic and hybrid retrieval in the RAG pipeline
+
+Quality is measured on HELD_OUT phrasings that share no term with
+vector_index.CATEGORY_TERMS (checked at startup), so the semantic side
+cannot win by matching a longer keyword list. For each method it reports
+need -> category accuracy and recall@k: per query, the share of the top k
+results that are in the expected category, out of min(k, resources in
+that category), averaged over queries. The IN_VOCABULARY set, whose
+phrasings do overlap CATEGORY_TERMS, is reported alongside for contrast.
+Also reports top-k search latency over the real catalogue and a synthetic
+scaled-up one.
+
+Usage: python benchmarks/bench_rag_retrieval.py [scaled_resource_count]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.rag_pipeline import rag_pipeline  # noqa: E402
+from services.resource_index import tokenize  # noqa: E402
+from services.vector_index import CATEGORY_TERMS, VectorIndex  # noqa: E402
+
+RECALL_KS = (5, 10)
+
+# (user phrasing, expected category); no term appears in CATEGORY_TERMS
+HELD_OUT = [
+    ("nothing left in the fridge for the kids", 'food'),
+    ("can't afford to feed my family", 'food'),
+    ("looking for a soup kitchen", 'food'),
+    ("free hot supper tonight", 'food'),
+    ("need baby formula", 'food'),
+    ("nowhere to crash tonight", 'shelter'),
+    ("living in my car", 'shelter'),
+    ("landlord is kicking us out", 'shelter'),
+    ("need emergency lodging", 'shelter'),
+    ("out on the street in the cold", 'shelter'),
+    ("toothache won't go away", 'healthcare'),
+    ("need a prescription refilled", 'healthcare'),
+    ("feeling depressed and anxious", 'healthcare'),
+    ("chest pain and no coverage", 'healthcare'),
+    ("need to get vaccinated", 'healthcare'),
+    ("want to get hired somewhere", 'employment'),
+    ("lost my paycheck", 'employment'),
+    ("help filling out applications", 'employment'),
+    ("unemployed and need money", 'employment'),
+    ("vocational classes", 'employment'),
+]
+
+# Phrasings whose key words were folded into CATEGORY_TERMS
+IN_VOCABULARY = [
+    ("I'm hungry", 'food'),
+    ("need groceries for my kids", 'food'),
+    ("where can I get a free lunch", 'food'),
+    ("food stamps", 'food'),
+    ("I am starving", 'food'),
+    ("somewhere to sleep tonight", 'shelter'),
+    ("I need a bed", 'shelter'),
+    ("we got evicted last week", 'shelter'),
+    ("can't pay rent, about to be homeless", 'shelter'),
+    ("place to stay for my family", 'shelter'),
+    ("need to see a therapist", 'healthcare'),
+    ("counseling for grief", 'healthcare'),
+    ("my tooth hurts, need a dentist", 'healthcare'),
+    ("I'm sick and have no insurance", 'healthcare'),
+    ("mental health support", 'healthcare'),
+    ("looking for a job", 'employment'),
+    ("help with my resume", 'employment'),
+    ("who is hiring near me", 'employment'),
+    ("job training programs", 'employment'),
+    ("I lost my income", 'employment'),
+]
+
+
+def check_held_out():
+    """Fail loudly if a held-out phrasing reuses a category term"""
+    vocabulary = set(tokenize(' '.join(CATEGORY_TERMS.values()))) | set(CATEGORY_TERMS)
+    for text, _ in HELD_OUT:
+        shared = vocabulary.intersection(tokenize(text))
+        assert not shared, f"held-out phrasing {text!r} shares {sorted(shared)} with CATEGORY_TERMS"
+
+
+def accuracy(labeled, classify):
+    hits = sum(1 for text, expected in labeled if classify(text) == expected)
+    return hits / len(labeled)
+
+
+def recall_at_k(labeled, search, categories, k):
+    """Mean share of the top k in the expected category, out of min(k, category size)"""
+    totals = {category: categories.count(category) for category in set(categories)}
+    recalls = []
+    for text, expected in labeled:
+        relevant = sum(1 for record_id in search(text, k) if categories[record_id] == expected)
+        recalls.append(relevant / min(k, totals[expected]))
+    return sum(recalls) / len(recalls)
+
+
+def timed(fn, runs):
+    started = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - started) / runs * 1000
+
+
+def main():
+    scaled = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    vector_index = rag_pipeline.snapshot.vector_index
+
+    categories = vector_index.categories
+    check_held_out()
+
+    methods = [
+        ('keyword (bm25)', rag_pipeline._map_need_to_category,
+         lambda text, k: [record_id for _, record_id in rag_pipeline.resource_index.bm25(text, limit=k)]),
+        ('semantic (hashed n-grams)', lambda text: vector_index.classify(text)[0],
+         lambda text, k: [record_id for _, record_id in vector_index.search(text, k)]),
+    ]
+    for title, labeled in (('held-out phrasings', HELD_OUT), ('in-vocabulary phrasings', IN_VOCABULARY)):
+        print(f"{len(labeled)} {title}")
+        print("-" * 64)
+        print(f"{'':<28} {'category':>8} " + ' '.join(f"{f'recall@{k}':>9}" for k in RECALL_KS))
+        for name, classify, search in methods:
+            recalls = ' '.join(f"{recall_at_k(labeled, search, categories, k):9.0%}" for k in RECALL_KS)
+            print(f"{name:<28} {accuracy(labeled, classify):8.0%} {recalls}")
+        print()
+
+    query = "somewhere safe to sleep tonight with my kids"
+    print(f"Top-10 search latency, query: {query!r}")
+    print("-" * 64)
+    print(f"{'keyword index':<28} {timed(lambda: rag_pipeline.search_resources(query), 200):9.3f} ms"
+          f"   ({len(vector_index)} resources)")
+    print(f"{'vector index':<28} {timed(lambda: vector_index.search(query, 10), 200):9.3f} ms"
+          f"   ({len(vector_index)} resources)")
+    print(f"{'hybrid (bm25+vector+rerank)':<28} "
+          f"{timed(lambda: rag_pipeline.hybrid_search(query, '94612', k=10), 200):9.3f} ms"
+          f"   ({len(vector_index)} resources)")
+
+    rng = np.random.default_rng(7)
+    rows = rng.integers(0, len(vector_index), scaled)
+    big = VectorIndex(vector_index.embedder, vector_index.vectors[rows],
+                      [vector_index.categories[i] for i in rows])
+    print(f"{'vector index (scaled)':<28} {timed(lambda: big.search(query, 10), 50):9.3f} ms"
+          f"   ({len(big):,} resources, {big.get_stats()['bytes'] / 1e6:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,88 @@ class Config:
     # Gemini API Configuration
     GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY', None)
 
+    # Gemini HTTP connection pool
+    GEMINI_POOL_CONNECTIONS = int(os.environ.get('GEMINI_POOL_CONNECTIONS', 4))
+    GEMINI_POOL_MAXSIZE = int(os.environ.get('GEMINI_POOL_MAXSIZE', 10))
+    GEMINI_POOL_BLOCK = os.environ.get(
+        'GEMINI_POOL_BLOCK', 'False').lower() == 'true'
+    GEMINI_KEEPALIVE = os.environ.get(
+        'GEMINI_KEEPALIVE', 'True').lower() == 'true'
+    GEMINI_TIMEOUT = float(os.environ.get('GEMINI_TIMEOUT', 30))
+
+    # Concurrent emotion scoring + response generation in /api/chat/message
+    CHAT_CONCURRENT_ANALYSIS = os.environ.get(
+        'CHAT_CONCURRENT_ANALYSIS', 'True').lower() == 'true'
+    CHAT_EXECUTOR_WORKERS = int(os.environ.get('CHAT_EXECUTOR_WORKERS', 8))
+    EMOTION_SCORING_TIMEOUT = float(
+        os.environ.get('EMOTION_SCORING_TIMEOUT', 10))
+    SUPPORT_RESPONSE_TIMEOUT = float(
+        os.environ.get('SUPPORT_RESPONSE_TIMEOUT', 35))
+
+    # Deferred (background) emotion scoring written back to Conversation.context
+    CHAT_DEFERRED_ANALYSIS = os.environ.get(
+        'CHAT_DEFERRED_ANALYSIS', 'False').lower() == 'true'
+    EMOTION_WORKERS = int(os.environ.get('EMOTION_WORKERS', 2))
+    EMOTION_QUEUE_SIZE = int(os.environ.get('EMOTION_QUEUE_SIZE', 1000))
+
+    # Gemini response cache: "memory", "redis" (shares REDIS_URL) or "none"
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_MAXSIZE = int(os.environ.get('RESPONSE_CACHE_MAXSIZE', 1024))
+    RESPONSE_CACHE_TTL = float(os.environ.get('RESPONSE_CACHE_TTL', 3600))
+    # Distress/anxiety at or above this marks a prompt as high urgency (never cached)
+    CACHE_URGENCY_THRESHOLD = float(
+        os.environ.get('CACHE_URGENCY_THRESHOLD', 0.8))
+
+    # Primary emotion scorer: "gemini" (LLM call) or "lexicon" (local, no API cost)
+    EMOTION_ENGINE = os.environ.get('EMOTION_ENGINE', 'gemini').lower()
+
+    # Batch emotion scoring: texts packed into one prompt per chunk
+    EMOTION_BATCH_SIZE = int(os.environ.get('EMOTION_BATCH_SIZE', 25))
+    EMOTION_BATCH_MAX_CHARS = int(
+        os.environ.get('EMOTION_BATCH_MAX_CHARS', 12000))
+    EMOTION_BATCH_LIMIT = int(os.environ.get('EMOTION_BATCH_LIMIT', 500))
+
+    # Emotion score memo keyed on normalized message text
+    EMOTION_MEMO_MAXSIZE = int(os.environ.get('EMOTION_MEMO_MAXSIZE', 2048))
+    EMOTION_MEMO_TTL = float(os.environ.get('EMOTION_MEMO_TTL', 86400))
+    EMOTION_MEMO_MAX_CHARS = int(os.environ.get('EMOTION_MEMO_MAX_CHARS', 200))
+
+    # RAG resource catalogue: editable JSON source (a file, or a directory of
+    # *.json files merged together) compiled to a SQLite store
+    RESOURCE_DATA_PATH = os.environ.get('RESOURCE_DATA_PATH', os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'data', 'resources.json'))
+    RESOURCE_STORE_PATH = os.environ.get('RESOURCE_STORE_PATH', os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'instance', 'resources.db'))
+    RESOURCE_STORE_MMAP_SIZE = int(
+        os.environ.get('RESOURCE_STORE_MMAP_SIZE', 64 * 1024 * 1024))
+    # Seconds between checks of the catalogue for edits; 0 disables hot reload
+    RESOURCE_RELOAD_INTERVAL = float(
+        os.environ.get('RESOURCE_RELOAD_INTERVAL', 5))
+
+    # RAG need matching: "keyword" lists, "semantic" vector similarity, or
+    # "hybrid" BM25 + vector relevance reranked by the ranking heuristics
+    RAG_RETRIEVAL_MODE = os.environ.get('RAG_RETRIEVAL_MODE', 'keyword').lower()
+    RAG_EMBEDDING_DIM = int(os.environ.get('RAG_EMBEDDING_DIM', 512))
+    RAG_SEMANTIC_MIN_SCORE = float(
+        os.environ.get('RAG_SEMANTIC_MIN_SCORE', 0.1))
+    RAG_HYBRID_ALPHA = float(os.environ.get('RAG_HYBRID_ALPHA', 0.5))
+    RAG_HYBRID_CANDIDATES = int(os.environ.get('RAG_HYBRID_CANDIDATES', 30))
+    RAG_HYBRID_WEIGHT = float(os.environ.get('RAG_HYBRID_WEIGHT', 5))
+
+    # RAG nearest-resource retrieval
+    RAG_TOP_K = int(os.environ.get('RAG_TOP_K', 3))
+    GAZETTEER_PATH = os.environ.get('GAZETTEER_PATH', os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'data', 'gazetteer.tsv'))
+    RAG_NEAREST_K = int(os.environ.get('RAG_NEAREST_K', 10))
+    RAG_MAX_DISTANCE_MILES = float(
+        os.environ.get('RAG_MAX_DISTANCE_MILES', 25))
+    RAG_RANKING_CACHE_SIZE = int(
+        os.environ.get('RAG_RANKING_CACHE_SIZE', 4096))
+
+    # Crisis flagging: rows per commit when backfilling older conversations
+    FLAG_BACKFILL_BATCH_SIZE = int(
+        os.environ.get('FLAG_BACKFILL_BATCH_SIZE', 500))
+
     # Legacy CAG Configuration (if needed)
     CAG_API_KEY = os.environ.get('CAG_API_KEY', None)
     CAG_MODEL_NAME = os.environ.get('CAG_MODEL_NAME', 'default-model')
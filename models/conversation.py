@@ -1,10 +1,20 @@
+import json
 from datetime import datetime
+from typing import Any, Optional, Tuple
+from sqlalchemy import event
+from services.intent_classifier import intent_classifier
 from .user import db
 
 
 class Conversation(db.Model):
     """Conversation model for storing chat messages"""
     __tablename__ = 'conversations'
+    __table_args__ = (
+        # Per-user history, newest first: history, summaries, admin user views
+        db.Index('ix_conversations_user_id_created_at', 'user_id', 'created_at'),
+        # Flagged conversations, newest first, for the admin review queue
+        db.Index('ix_conversations_is_flagged_created_at', 'is_flagged', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -12,14 +22,34 @@ class Conversation(db.Model):
     response = db.Column(db.Text, nullable=True)  # Claude's response
     # 'user' or 'assistant'
     message_type = db.Column(db.String(20), default='user')
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Indexed for recent-activity feeds, "today" counts and age-based cleanup
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
     # Context information
     context = db.Column(db.JSON, nullable=True)  # Store context as JSON
 
+    # Chat mode ('coach'/'assistant') and prompt type the reply was made
+    # with, copied out of the request so usage breakdowns are an indexed
+    # GROUP BY instead of a pass over the JSON context. NULL for older rows
+    # that never recorded them
+    mode = db.Column(db.String(20), nullable=True, index=True)
+    prompt_type = db.Column(db.String(40), nullable=True, index=True)
+
+    # Crisis flagging, computed once when the row is written. flagged_terms
+    # is NULL only for rows written before flagging existed (see
+    # backfill_conversation_flags)
+    is_flagged = db.Column(db.Boolean, nullable=False, default=False, server_default='0')
+    flagged_terms = db.Column(db.JSON(none_as_null=True), nullable=True)
+
     def __repr__(self):
         return f'<Conversation {self.id}: User {self.user_id} - {self.message_type}>'
 
+    def apply_flags(self):
+        """Flag the message for crisis language and record the matched terms"""
+        intents = intent_classifier.classify(self.message)
+        self.is_flagged = intents.crisis
+        self.flagged_terms = list(intents.crisis_terms)
+
     def to_dict(self):
         """Convert conversation to dictionary for JSON responses"""
         return {
@@ -29,5 +59,92 @@ class Conversation(db.Model):
             'response': self.response,
             'message_type': self.message_type,
             'context': self.context,
+            'mode': self.mode,
+            'prompt_type': self.prompt_type,
+            'is_flagged': self.is_flagged,
+            'flagged_terms': self.flagged_terms,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
+
+
+@event.listens_for(Conversation, 'before_insert')
+def _flag_on_insert(mapper, connection, conversation):
+    conversation.apply_flags()
+
+
+def backfill_conversation_flags(batch_size: int = 500) -> int:
+    """
+    Flag conversations written before flagging existed
+
+    Walks unflagged rows in ID order, committing every batch, so it can be
+    stopped and rerun safely. Needs an application context.
+
+    Returns:
+        Number of conversations updated
+    """
+    updated = 0
+    last_id = 0
+    while True:
+        batch = Conversation.query.filter(
+            Conversation.flagged_terms.is_(None), Conversation.id > last_id
+        ).order_by(Conversation.id).limit(batch_size).all()
+        if not batch:
+            return updated
+        for conversation in batch:
+            conversation.apply_flags()
+        db.session.commit()
+        updated += len(batch)
+        last_id = batch[-1].id
+
+
+def settings_from_context(context: Any) -> Tuple[Optional[str], Optional[str]]:
+    """
+    (mode, prompt_type) recorded in a stored context, if any
+
+    Checks the top level first, then the client's user_context, which takes
+    precedence as the admin views always did.
+    """
+    if isinstance(context, str):
+        try:
+            context = json.loads(context)
+        except ValueError:
+            return None, None
+    if not isinstance(context, dict):
+        return None, None
+
+    mode, prompt_type = context.get('mode'), context.get('prompt_type')
+    user_context = context.get('user_context')
+    if isinstance(user_context, dict):
+        mode = user_context.get('mode', mode)
+        prompt_type = user_context.get('prompt_type', prompt_type)
+    return (mode if isinstance(mode, str) else None,
+            prompt_type if isinstance(prompt_type, str) else None)
+
+
+def backfill_conversation_settings(batch_size: int = 500) -> int:
+    """
+    Fill mode and prompt_type from the JSON context of older conversations
+
+    Walks rows with a context but no mode in ID order, committing every
+    batch. Rows whose context records neither setting are left NULL.
+    Needs an application context.
+
+    Returns:
+        Number of conversations updated
+    """
+    updated = 0
+    last_id = 0
+    while True:
+        batch = Conversation.query.filter(
+            Conversation.mode.is_(None), Conversation.context.isnot(None), Conversation.id > last_id
+        ).order_by(Conversation.id).limit(batch_size).all()
+        if not batch:
+            return updated
+        for conversation in batch:
+            mode, prompt_type = settings_from_context(conversation.context)
+            if mode or prompt_type:
+                conversation.mode = mode
+                conversation.prompt_type = conversation.prompt_type or prompt_type
+                updated += 1
+        db.session.commit()
+        last_id = batch[-1].id
@@ -0,0 +1,48 @@
+# Schema upkeep for existing SQLite databases
+
+import logging
+from sqlalchemy import inspect
+from .user import db
+
+logger = logging.getLogger(__name__)
+
+
+def ensure_schema():
+    """
+    Bring existing tables up to the models
+
+    ``db.create_all()`` only creates missing tables, so columns and indexes
+    added to a model later are added here. Needs an application context.
+
+    Returns:
+        List of "table.column" / index names that were added
+    """
+    added = []
+    inspector = inspect(db.engine)
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=db.engine.dialect)
+                ddl = f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'
+                if column.server_default is not None:
+                    ddl += f" DEFAULT '{column.server_default.arg}'"
+                    if not column.nullable:
+                        ddl += ' NOT NULL'
+                connection.exec_driver_sql(ddl)
+                added.append(f'{table.name}.{column.name}')
+
+            existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(connection)
+                    added.append(index.name)
+
+    if added:
+        logger.info(f"Schema updated: {', '.join(added)}")
+    return added
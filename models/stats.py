@@ -0,0 +1,187 @@
+# Materialized dashboard counters, maintained on insert/delete
+
+from datetime import date, datetime
+from typing import Dict, Optional
+from sqlalchemy import event, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm.attributes import get_history
+from .user import db, User
+from .conversation import Conversation
+
+
+class StatsCounter(db.Model):
+    """
+    One named counter per row
+
+    Totals use plain names ('users', 'conversations',
+    'flagged_conversations'); per-day counts are keyed by UTC date
+    ('users:2024-05-01'), so a new day simply starts from an absent row.
+    """
+    __tablename__ = 'stats_counters'
+
+    name = db.Column(db.String(64), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<StatsCounter {self.name}={self.value}>'
+
+
+def _day_key(prefix: str, day: date) -> str:
+    return f'{prefix}:{day.isoformat()}'
+
+
+def _utc_day(created_at: Optional[datetime]) -> Optional[date]:
+    # created_at defaults to datetime.utcnow, so days are UTC days; legacy
+    # rows written before the column existed have none
+    return created_at.date() if created_at else None
+
+
+def _today_deltas(prefix: str, days: Dict[date, int]) -> Dict[str, int]:
+    """
+    Per-day counter deltas, for today only
+
+    Only today's counter is ever read, and reconcile prunes earlier ones, so
+    adjusting a past day would just recreate its row with a negative value.
+    """
+    today = datetime.utcnow().date()
+    return {_day_key(prefix, today): days[today]} if today in days else {}
+
+
+def _bump(connection, deltas: Dict[str, int]):
+    """Add deltas to counters in the caller's transaction"""
+    for name, delta in deltas.items():
+        if not delta:
+            continue
+        statement = sqlite_insert(StatsCounter.__table__).values(name=name, value=delta)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=['name'], set_={'value': StatsCounter.__table__.c.value + delta}))
+
+
+@event.listens_for(User, 'after_insert')
+def _count_user_insert(mapper, connection, user):
+    _bump(connection, {'users': 1, **_today_deltas('users', {_utc_day(user.created_at): 1})})
+
+
+@event.listens_for(User, 'after_delete')
+def _count_user_delete(mapper, connection, user):
+    _bump(connection, {'users': -1, **_today_deltas('users', {_utc_day(user.created_at): -1})})
+
+
+@event.listens_for(Conversation, 'after_insert')
+def _count_conversation_insert(mapper, connection, conversation):
+    _bump(connection, {
+        'conversations': 1,
+        **_today_deltas('conversations', {_utc_day(conversation.created_at): 1}),
+        'flagged_conversations': 1 if conversation.is_flagged else 0
+    })
+
+
+@event.listens_for(Conversation, 'after_update')
+def _count_conversation_update(mapper, connection, conversation):
+    history = get_history(conversation, 'is_flagged')
+    if history.has_changes() and history.deleted and bool(history.deleted[0]) != bool(conversation.is_flagged):
+        _bump(connection, {'flagged_conversations': 1 if conversation.is_flagged else -1})
+
+
+@event.listens_for(Conversation, 'after_delete')
+def _count_conversation_delete(mapper, connection, conversation):
+    _bump(connection, {
+        'conversations': -1,
+        **_today_deltas('conversations', {_utc_day(conversation.created_at): -1}),
+        'flagged_conversations': -1 if conversation.is_flagged else 0
+    })
+
+
+def delete_conversations(query) -> int:
+    """
+    Bulk-delete the conversations a query matches, keeping counters right
+
+    ``query.delete()`` skips mapper events, so the counts being removed are
+    taken from the same filter first and subtracted in the same transaction.
+
+    Returns:
+        Number of conversations deleted
+    """
+    per_day = query.with_entities(
+        func.date(Conversation.created_at), func.count(), func.sum(Conversation.is_flagged)
+    ).group_by(func.date(Conversation.created_at)).all()
+
+    deltas: Dict[str, int] = {'conversations': 0, 'flagged_conversations': 0}
+    days: Dict[date, int] = {}
+    for day, count, flagged in per_day:
+        deltas['conversations'] -= count
+        deltas['flagged_conversations'] -= int(flagged or 0)
+        if day:
+            days[date.fromisoformat(day)] = -count
+    deltas.update(_today_deltas('conversations', days))
+
+    deleted = query.delete(synchronize_session=False)
+    _bump(db.session.connection(), deltas)
+    return deleted
+
+
+def delete_users(query) -> int:
+    """Bulk-delete the users a query matches, keeping counters right"""
+    per_day = query.with_entities(func.date(User.created_at), func.count())\
+        .group_by(func.date(User.created_at)).all()
+
+    deltas: Dict[str, int] = {'users': 0}
+    days: Dict[date, int] = {}
+    for day, count in per_day:
+        deltas['users'] -= count
+        if day:
+            days[date.fromisoformat(day)] = -count
+    deltas.update(_today_deltas('users', days))
+
+    deleted = query.delete(synchronize_session=False)
+    _bump(db.session.connection(), deltas)
+    return deleted
+
+
+def get_counter_stats(today: Optional[date] = None) -> Dict[str, int]:
+    """Dashboard totals from the counters table: one primary-key lookup"""
+    today = today or datetime.utcnow().date()
+    names = {
+        'total_users': 'users',
+        'total_conversations': 'conversations',
+        'today_users': _day_key('users', today),
+        'today_conversations': _day_key('conversations', today),
+        'flagged_conversations': 'flagged_conversations'
+    }
+    values = dict(db.session.query(StatsCounter.name, StatsCounter.value)
+                  .filter(StatsCounter.name.in_(names.values())).all())
+    return {stat: values.get(name, 0) for stat, name in names.items()}
+
+
+def reconcile_stats_counters(today: Optional[date] = None) -> Dict[str, Dict[str, int]]:
+    """
+    Recount from the base tables and correct any counter that drifted
+
+    Also drops per-day counters for past days, which nothing reads. Needs an
+    application context; commits.
+
+    Returns:
+        {counter name: {'stored': old value, 'actual': recounted value}} for
+        each corrected counter
+    """
+    today = today or datetime.utcnow().date()
+    start = datetime.combine(today, datetime.min.time())
+    actual = {
+        'users': User.query.count(),
+        'conversations': Conversation.query.count(),
+        'flagged_conversations': Conversation.query.filter(Conversation.is_flagged.is_(True)).count(),
+        _day_key('users', today): User.query.filter(User.created_at >= start).count(),
+        _day_key('conversations', today): Conversation.query.filter(Conversation.created_at >= start).count()
+    }
+
+    stored = dict(db.session.query(StatsCounter.name, StatsCounter.value).all())
+    drift = {name: {'stored': stored.get(name, 0), 'actual': value}
+             for name, value in actual.items() if stored.get(name, 0) != value}
+
+    for name, value in actual.items():
+        db.session.merge(StatsCounter(name=name, value=value))
+    stale = [name for name in stored if name not in actual]
+    if stale:
+        StatsCounter.query.filter(StatsCounter.name.in_(stale)).delete(synchronize_session=False)
+    db.session.commit()
+    return drift
@@ -16,7 +16,7 @@ class User(db.Model):
     # Current situation description
     situation = db.Column(db.Text, nullable=True)
     needs = db.Column(db.Text, nullable=True)  # What kind of help they need
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -1,8 +1,13 @@
 from flask import Blueprint, render_template_string, render_template, request, jsonify, redirect, url_for
 from models.user import User, db
-from models.conversation import Conversation
+from models.conversation import Conversation, backfill_conversation_flags, backfill_conversation_settings
+from models.stats import delete_conversations, delete_users, get_counter_stats, reconcile_stats_counters
+from services.gemini_service import gemini_service
+from services.rag_pipeline import rag_pipeline
+from routes.chat import emotion_worker
 from datetime import datetime, timedelta
-import json
+from config import Config
+from utils.pagination import keyset_page, page_size
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
@@ -522,10 +527,7 @@ def admin_dashboard():
     try:
         # Get basic statistics
         stats = {
-            'total_users': User.query.count(),
-            'total_conversations': Conversation.query.count(),
-            'today_users': User.query.filter(User.created_at >= datetime.now().date()).count(),
-            'today_conversations': Conversation.query.filter(Conversation.created_at >= datetime.now().date()).count(),
+            **get_counter_stats(),
             'total_resources': 64,  # From RAG pipeline
             'oakland_resources': 32,
             'berkeley_resources': 32
@@ -562,27 +564,17 @@ def admin_dashboard():
             else:
                 stats['other_count'] += count
 
-        # Get mode usage counts
-        mode_counts = db.session.query(
-            Conversation.context,
+        # Get mode usage counts: one GROUP BY over the indexed mode column.
+        # Anything not in coach mode, including rows with no recorded mode,
+        # counts as assistant
+        mode_counts = dict(db.session.query(
+            Conversation.mode,
             db.func.count(Conversation.id).label('count')
-        ).filter(Conversation.context.isnot(None)).group_by(Conversation.context).all()
-        
-        coach_conversations = 0
-        assistant_conversations = 0
-        
-        for context, count in mode_counts:
-            try:
-                context_data = json.loads(context) if isinstance(context, str) else context
-                if isinstance(context_data, dict):
-                    mode = context_data.get('mode', 'assistant')
-                    if mode == 'coach':
-                        coach_conversations += count
-                    else:
-                        assistant_conversations += count
-            except:
-                assistant_conversations += count
-        
+        ).group_by(Conversation.mode).all())
+
+        coach_conversations = mode_counts.pop('coach', 0)
+        assistant_conversations = sum(mode_counts.values())
+
         stats['coach_conversations'] = coach_conversations
         stats['assistant_conversations'] = assistant_conversations
 
@@ -659,11 +651,9 @@ def export_users():
 def clear_old_data():
     """Clear conversations older than 30 days"""
     try:
-        cutoff_date = datetime.now() - timedelta(days=30)
-        deleted_count = Conversation.query.filter(
-            Conversation.created_at < cutoff_date).count()
-        Conversation.query.filter(
-            Conversation.created_at < cutoff_date).delete()
+        cutoff_date = datetime.utcnow() - timedelta(days=30)
+        deleted_count = delete_conversations(Conversation.query.filter(
+            Conversation.created_at < cutoff_date))
         db.session.commit()
 
         return jsonify({'success': True, 'deleted_count': deleted_count})
@@ -678,10 +668,10 @@ def reset_system():
     """Reset entire system - DELETE ALL DATA"""
     try:
         # Delete all conversations
-        Conversation.query.delete()
+        delete_conversations(Conversation.query)
 
         # Delete all users
-        User.query.delete()
+        delete_users(User.query)
 
         db.session.commit()
 
@@ -696,13 +686,38 @@ def reset_system():
 def api_stats():
     """API endpoint for real-time stats"""
     try:
-        stats = {
-            'total_users': User.query.count(),
-            'total_conversations': Conversation.query.count(),
-            'today_users': User.query.filter(User.created_at >= datetime.now().date()).count(),
-            'today_conversations': Conversation.query.filter(Conversation.created_at >= datetime.now().date()).count(),
-        }
-        return jsonify(stats)
+        # Maintained counters: one indexed read however large the tables grow
+        return jsonify(get_counter_stats())
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@admin_bp.route('/api/stats/reconcile', methods=['POST'])
+def api_reconcile_stats():
+    """Recount the stats counters from the tables and report any drift"""
+    try:
+        drift = reconcile_stats_counters()
+        return jsonify({'success': True, 'drift': drift, 'stats': get_counter_stats()})
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@admin_bp.route('/api/metrics')
+def api_metrics():
+    """API endpoint for service performance counters"""
+    try:
+        return jsonify({
+            'gemini_http': gemini_service.get_http_stats(),
+            'gemini_streaming': gemini_service.get_streaming_stats(),
+            'response_cache': gemini_service.get_cache_stats(),
+            'emotion_memo': gemini_service.get_emotion_memo_stats(),
+            'emotion_queue': emotion_worker.get_stats(),
+            'rag_resources': rag_pipeline.get_stats(),
+            'timestamp': datetime.now().isoformat()
+        })
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -710,8 +725,15 @@ def api_stats():
 
 @admin_bp.route('/api/conversations')
 def api_conversations():
-    """API endpoint for real conversation data"""
+    """
+    API endpoint for real conversation data, newest first
+    (?flagged=true|false filters on the indexed crisis flag; ?limit page size, default 100;
+    ?cursor the next_cursor of the previous page)
+    """
     try:
+        limit = page_size(request.args.get('limit', type=int), default=100)
+        flagged = request.args.get('flagged')
+
         # Get conversations with user data
         conversations_query = db.session.query(
             Conversation.id,
@@ -719,37 +741,27 @@ def api_conversations():
             Conversation.message,
             Conversation.response,
             Conversation.created_at,
-            Conversation.context,
+            Conversation.mode,
+            Conversation.is_flagged,
+            Conversation.flagged_terms,
             User.name.label('user_name'),
             User.location,
             User.situation,
             User.needs
-        ).join(User).order_by(Conversation.created_at.desc()).limit(100)
-        
+        ).join(User)
+        if flagged is not None:
+            conversations_query = conversations_query.filter(
+                Conversation.is_flagged == (flagged.lower() in ('1', 'true', 'yes')))
+        try:
+            conversations, next_cursor = keyset_page(
+                conversations_query, Conversation.created_at, Conversation.id,
+                request.args.get('cursor'), limit)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
         conversations_data = []
-        flagged_keywords = ['hurt', 'unsafe', 'no home', 'suicidal', 'kill myself', 'end it all', 'want to die', 'hopeless', 'nowhere to go']
-        
-        for conv in conversations_query:
-            # Extract mode from context
-            mode = 'support'  # default
-            if conv.context:
-                try:
-                    context_data = json.loads(conv.context) if isinstance(conv.context, str) else conv.context
-                    if isinstance(context_data, dict):
-                        mode = context_data.get('mode', 'support')
-                        # Also check user_context for mode
-                        user_context = context_data.get('user_context', {})
-                        if 'mode' in user_context:
-                            mode = user_context['mode']
-                except:
-                    pass
-            
-            # Check if conversation should be flagged
-            is_flagged = False
-            if conv.message:
-                message_lower = conv.message.lower()
-                is_flagged = any(keyword in message_lower for keyword in flagged_keywords)
-            
+
+        for conv in conversations:
             # Create user alias
             user_alias = f"User #{conv.user_id}"
             
@@ -762,26 +774,54 @@ def api_conversations():
                 'userAlias': user_alias,
                 'userLocation': conv.location or 'Unknown',
                 'userNeeds': conv.needs or conv.situation or 'General Support',
-                'mode': mode,
+                'mode': conv.mode or 'support',
                 'startTime': conv.created_at.isoformat() if conv.created_at else None,
                 'lastMessageTime': conv.created_at.isoformat() if conv.created_at else None,
                 'duration': estimated_duration,
                 'messageCount': 1,  # We're showing individual messages, not full conversations
                 'lastMessage': conv.message[:100] + '...' if conv.message and len(conv.message) > 100 else conv.message or '',
-                'isFlagged': is_flagged,
+                'isFlagged': conv.is_flagged,
+                'flaggedTerms': conv.flagged_terms or [],
                 'fullMessage': conv.message or '',
                 'response': conv.response or ''
             })
         
         return jsonify({
             'conversations': conversations_data,
-            'total_count': len(conversations_data)
+            'total_count': len(conversations_data),
+            'next_cursor': next_cursor
         })
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@admin_bp.route('/api/conversations/backfill-flags', methods=['POST'])
+def api_backfill_flags():
+    """Flag conversations stored before crisis flagging existed"""
+    try:
+        batch_size = request.args.get('batch_size', Config.FLAG_BACKFILL_BATCH_SIZE, type=int)
+        updated = backfill_conversation_flags(max(1, batch_size))
+        return jsonify({'success': True, 'updated': updated})
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@admin_bp.route('/api/conversations/backfill-modes', methods=['POST'])
+def api_backfill_modes():
+    """Copy mode and prompt type out of the JSON context of older conversations"""
+    try:
+        batch_size = request.args.get('batch_size', Config.FLAG_BACKFILL_BATCH_SIZE, type=int)
+        updated = backfill_conversation_settings(max(1, batch_size))
+        return jsonify({'success': True, 'updated': updated})
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
 @admin_bp.route('/api/conversation/<int:conversation_id>')
 def api_conversation_detail(conversation_id):
     """API endpoint for detailed conversation data"""
@@ -793,7 +833,9 @@ def api_conversation_detail(conversation_id):
             Conversation.message,
             Conversation.response,
             Conversation.created_at,
-            Conversation.context,
+            Conversation.mode,
+            Conversation.is_flagged,
+            Conversation.flagged_terms,
             User.name.label('user_name'),
             User.location,
             User.situation,
@@ -813,7 +855,8 @@ def api_conversation_detail(conversation_id):
             messages.append({
                 'time': conv.created_at.strftime('%H:%M') if conv.created_at else '00:00',
                 'sender': 'user',
-                'message': conv.message or ''
+                'message': conv.message or '',
+                'isFlagged': conv.is_flagged
             })
             
             # Add assistant response if available
@@ -825,30 +868,20 @@ def api_conversation_detail(conversation_id):
                     'message': conv.response
                 })
         
-        # Extract mode from context
-        mode = 'support'
-        if conversation.context:
-            try:
-                context_data = json.loads(conversation.context) if isinstance(conversation.context, str) else conversation.context
-                if isinstance(context_data, dict):
-                    mode = context_data.get('mode', 'support')
-                    user_context = context_data.get('user_context', {})
-                    if 'mode' in user_context:
-                        mode = user_context['mode']
-            except:
-                pass
-        
         conversation_detail = {
             'id': conversation.id,
             'userId': conversation.user_id,
             'userAlias': f"User #{conversation.user_id}",
             'userLocation': conversation.location or 'Unknown',
             'userNeeds': conversation.needs or conversation.situation or 'General Support',
-            'mode': mode,
+            'mode': conversation.mode or 'support',
             'startTime': user_conversations[0].created_at.isoformat() if user_conversations else None,
             'lastMessageTime': user_conversations[-1].created_at.isoformat() if user_conversations else None,
             'duration': len(user_conversations) * 2,  # Rough estimate
             'messageCount': len(messages),
+            'isFlagged': conversation.is_flagged,
+            'flaggedTerms': conversation.flagged_terms or [],
+            'flaggedMessageCount': sum(1 for conv in user_conversations if conv.is_flagged),
             'messages': messages
         }
         
@@ -865,12 +898,7 @@ def admin_dashboard_simple():
     """Simple admin dashboard view"""
     try:
         # Get statistics
-        stats = {
-            'total_users': User.query.count(),
-            'total_conversations': Conversation.query.count(),
-            'today_users': User.query.filter(User.created_at >= datetime.now().date()).count(),
-            'today_conversations': Conversation.query.filter(Conversation.created_at >= datetime.now().date()).count(),
-        }
+        stats = get_counter_stats()
         
         # Get recent activity (last 20 conversations)
         recent_conversations = db.session.query(
@@ -898,9 +926,14 @@ def admin_dashboard_simple():
 
 @admin_bp.route('/api/users')
 def api_users():
-    """API endpoint for real user data"""
+    """
+    API endpoint for real user data, newest first
+    (?limit= page size, ?cursor= the next_cursor of the previous page)
+    """
     try:
-        # Get users with conversation counts
+        limit = page_size(request.args.get('limit', type=int))
+
+        # Users with conversation count and last activity, in one grouped query
         users_query = db.session.query(
             User.id,
             User.name,
@@ -909,17 +942,20 @@ def api_users():
             User.needs,
             User.created_at,
             User.updated_at,
-            db.func.count(Conversation.id).label('conversation_count')
-        ).outerjoin(Conversation).group_by(User.id).order_by(User.created_at.desc())
-        
+            db.func.count(Conversation.id).label('conversation_count'),
+            db.func.max(Conversation.created_at).label('last_conversation_at')
+        ).outerjoin(Conversation).group_by(User.id)
+
+        try:
+            users, next_cursor = keyset_page(
+                users_query, User.created_at, User.id, request.args.get('cursor'), limit)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
         users_data = []
-        for user in users_query:
-            # Get the user's most recent conversation for last active time
-            last_conversation = Conversation.query.filter_by(user_id=user.id)\
-                .order_by(Conversation.created_at.desc()).first()
-            
-            last_active = last_conversation.created_at if last_conversation else user.updated_at
-            
+        for user in users:
+            last_active = user.last_conversation_at or user.updated_at
+
             users_data.append({
                 'id': user.id,
                 'name': user.name or 'Anonymous',
@@ -930,10 +966,11 @@ def api_users():
                 'last_active': last_active.isoformat() if last_active else None,
                 'conversation_count': user.conversation_count or 0
             })
-        
+
         return jsonify({
             'users': users_data,
-            'total_count': len(users_data)
+            'total_count': len(users_data),
+            'next_cursor': next_cursor
         })
         
     except Exception as e:
@@ -997,7 +1034,7 @@ def api_delete_user(user_id):
             return jsonify({'error': 'User not found'}), 404
         
         # Delete all user's conversations first
-        Conversation.query.filter_by(user_id=user_id).delete()
+        delete_conversations(Conversation.query.filter_by(user_id=user_id))
         
         # Delete the user
         db.session.delete(user)
@@ -1,12 +1,18 @@
 # Chat routes - /api/chat endpoints
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from datetime import datetime
+from itertools import islice
+import json
 import logging
+from config import Config
 from models.user import db, User
 from models.conversation import Conversation
-from services.gemini_service import get_support_response, analyze_journal_entry, summarize_conversation, score_emotional_state
-from services.rag_pipeline import get_local_resources
+from models.stats import delete_conversations
+from services.gemini_service import get_support_response, stream_support_response, respond_with_emotion_scores, analyze_journal_entry, summarize_conversation, score_emotional_state, score_emotional_state_batch
+from services.rag_pipeline import get_local_resources, search_local_resources, semantic_search_local_resources, hybrid_search_local_resources
+from services.background import BackgroundWorker
+from utils.pagination import decode_cursor, iter_keyset, keyset_page, page_size
 from typing import Optional, Dict, Any
 
 logger = logging.getLogger(__name__)
@@ -14,6 +20,90 @@ logger = logging.getLogger(__name__)
 # Create chat blueprint
 chat_bp = Blueprint('chat', __name__)
 
+# Worker queue for deferred emotion scoring
+emotion_worker = BackgroundWorker(
+    'emotion-scoring', workers=Config.EMOTION_WORKERS, maxsize=Config.EMOTION_QUEUE_SIZE)
+
+
+def _patch_emotion_context(conversation_id: int, **fields) -> bool:
+    """Merge fields into a Conversation's context; False if the row is gone"""
+    conversation = Conversation.query.get(conversation_id)
+    if not conversation:
+        return False
+
+    # Reassign so SQLAlchemy picks up the JSON change
+    conversation.context = {**(conversation.context or {}), **fields}
+    db.session.commit()
+    return True
+
+
+def _store_emotion_scores(app, conversation_id: int, message: str):
+    """
+    Score a message and patch the result into its Conversation row
+
+    If scoring or saving fails the row is marked 'failed', so clients
+    polling for the analysis stop waiting, and the error is re-raised for
+    the worker to count.
+    """
+    with app.app_context():
+        try:
+            emotion_scores = score_emotional_state(message)
+            if not _patch_emotion_context(conversation_id, emotion_analysis=emotion_scores,
+                                          emotion_status='complete'):
+                logger.info(
+                    f"Conversation {conversation_id} removed before scoring finished")
+        except Exception:
+            db.session.rollback()
+            try:
+                _patch_emotion_context(conversation_id, emotion_status='failed')
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Could not mark emotion analysis failed for conversation {conversation_id}: {str(e)}")
+            raise
+
+
+def _get_user_and_history(user_id: Optional[int], context: Dict[str, Any]):
+    """Find or create the chat user and load their recent conversation history"""
+    just_updated = context.get('justUpdated', False)
+
+    # Find or create user
+    user = None
+    if user_id:
+        user = User.query.get(user_id)
+
+    if not user:
+        # Create new user
+        user = User(
+            name=context.get('name', 'Anonymous'),
+            location=context.get('location', ''),
+            situation=context.get('situation', ''),
+            needs=context.get('needs', '')
+        )
+        db.session.add(user)
+        db.session.commit()
+        logger.info(f"Created new user: {user}")
+
+    history = []
+    if just_updated and user:
+        # Clear conversation history if profile was just updated
+        delete_conversations(Conversation.query.filter_by(user_id=user.id))
+        db.session.commit()
+        logger.info(
+            f"Cleared conversation history for user {user.id} due to profile update.")
+    elif user:
+        # Retrieve recent conversation history
+        history = Conversation.query.filter_by(user_id=user.id)\
+            .order_by(Conversation.created_at.desc())\
+            .limit(10).all()
+        history.reverse()  # Order from oldest to newest
+
+    return user, history
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Events frame"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 
 @chat_bp.route('/api/chat/message', methods=['POST'])
 def send_message():
@@ -31,59 +121,46 @@ def send_message():
         context = data.get('context', {})
         user_id = data.get('user_id')
         prompt_type = data.get('prompt_type', 'empathetic_coach')
-        just_updated = context.get('justUpdated', False)
 
         logger.info(f"Received chat message: {message[:50]}...")
 
-        # Find or create user
-        user = None
-        if user_id:
-            user = User.query.get(user_id)
-
-        if not user:
-            # Create new user
-            user = User(
-                name=context.get('name', 'Anonymous'),
-                location=context.get('location', ''),
-                situation=context.get('situation', ''),
-                needs=context.get('needs', '')
-            )
-            db.session.add(user)
-            db.session.commit()
-            logger.info(f"Created new user: {user}")
-
-        history = []
-        if just_updated and user:
-            # Clear conversation history if profile was just updated
-            Conversation.query.filter_by(user_id=user.id).delete()
-            db.session.commit()
-            logger.info(
-                f"Cleared conversation history for user {user.id} due to profile update.")
-        elif user:
-            # Retrieve recent conversation history
-            history = Conversation.query.filter_by(user_id=user.id)\
-                .order_by(Conversation.created_at.desc())\
-                .limit(10).all()
-            history.reverse()  # Order from oldest to newest
-
-        # Get emotion analysis for the message
-        emotion_scores = score_emotional_state(message)
+        user, history = _get_user_and_history(user_id, context)
 
         # Get mode from request (default to coach)
         mode = data.get('mode', 'coach')
 
-        # Get Gemini response with enhanced context, prompt type, and mode
-        gemini_response = get_support_response(message, {
+        user_profile = {
             'name': user.name,
             'location': user.location,
             'situation': user.situation,
             'needs': user.needs
-        }, prompt_type, mode, data.get('is_voice', False), history)
+        }
+
+        deferred_analysis = data.get(
+            'deferred_analysis', current_app.config.get('CHAT_DEFERRED_ANALYSIS', False))
+
+        if deferred_analysis:
+            # Reply now, score emotions on the background worker
+            gemini_response = get_support_response(
+                message, user_profile, prompt_type, mode, data.get('is_voice', False), history)
+            emotion_scores = None
+        elif current_app.config.get('CHAT_CONCURRENT_ANALYSIS', True):
+            # Score emotions and generate the reply at the same time
+            gemini_response, emotion_scores = respond_with_emotion_scores(
+                message, user_profile, prompt_type, mode, data.get('is_voice', False), history)
+        else:
+            # Get emotion analysis for the message
+            emotion_scores = score_emotional_state(message)
+
+            # Get Gemini response with enhanced context, prompt type, and mode
+            gemini_response = get_support_response(
+                message, user_profile, prompt_type, mode, data.get('is_voice', False), history, emotion_scores)
 
         # Save conversation with emotion analysis in context
         conversation_context = {
             'user_context': context,
-            'emotion_analysis': emotion_scores
+            'emotion_analysis': emotion_scores,
+            'emotion_status': 'pending' if deferred_analysis else 'complete'
         }
 
         conversation = Conversation(
@@ -91,17 +168,35 @@ def send_message():
             message=message,
             response=gemini_response,
             message_type='text',
-            context=conversation_context
+            context=conversation_context,
+            mode=mode,
+            prompt_type=prompt_type
         )
         db.session.add(conversation)
         db.session.commit()
 
         logger.info(f"Saved conversation for user {user.id}")
 
+        emotion_status = conversation_context['emotion_status']
+        if deferred_analysis:
+            app = current_app._get_current_object()
+            if not emotion_worker.submit(_store_emotion_scores, app, conversation.id, message):
+                # Queue is saturated - score inline rather than drop the analysis
+                emotion_scores = score_emotional_state(message)
+                emotion_status = 'complete'
+                conversation.context = {
+                    **conversation_context,
+                    'emotion_analysis': emotion_scores,
+                    'emotion_status': emotion_status
+                }
+                db.session.commit()
+
         return jsonify({
             'response': gemini_response,
             'user_id': user.id,
+            'conversation_id': conversation.id,
             'emotion_analysis': emotion_scores,
+            'emotion_status': emotion_status,
             'timestamp': conversation.created_at.isoformat()
         })
 
@@ -110,6 +205,132 @@ def send_message():
         return jsonify({'error': 'Internal server error'}), 500
 
 
+@chat_bp.route('/api/chat/message/stream', methods=['POST'])
+def stream_message():
+    """
+    Send a message to the AI assistant and stream the reply as Server-Sent Events
+    Emits 'start', one 'token' event per chunk, then 'done' once the conversation is saved,
+    or 'error' if the reply breaks off and nothing is saved
+    """
+    try:
+        data = request.get_json()
+
+        if not data or 'message' not in data:
+            return jsonify({'error': 'Message is required'}), 400
+
+        message = data['message']
+        context = data.get('context', {})
+        prompt_type = data.get('prompt_type', 'empathetic_coach')
+        mode = data.get('mode', 'coach')
+        is_voice = data.get('is_voice', False)
+
+        logger.info(f"Received streaming chat message: {message[:50]}...")
+
+        user, history = _get_user_and_history(data.get('user_id'), context)
+        user_id = user.id
+        user_profile = {
+            'name': user.name,
+            'location': user.location,
+            'situation': user.situation,
+            'needs': user.needs
+        }
+        app = current_app._get_current_object()
+
+    except Exception as e:
+        logger.error(f"Error starting chat stream: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+    def generate():
+        yield _sse_event('start', {'user_id': user_id})
+
+        chunks = []
+        try:
+            for chunk in stream_support_response(message, user_profile, prompt_type, mode, is_voice, history):
+                chunks.append(chunk)
+                yield _sse_event('token', {'text': chunk})
+        except Exception as e:
+            # The reply broke off part way; don't save it as if it were complete
+            logger.error(f"Chat stream interrupted: {str(e)}")
+            yield _sse_event('error', {'error': 'Reply interrupted'})
+            return
+
+        try:
+            # Persist once the full reply is known; scores are filled in later
+            conversation = Conversation(
+                user_id=user_id,
+                message=message,
+                response=''.join(chunks),
+                message_type='text',
+                context={
+                    'user_context': context,
+                    'emotion_analysis': None,
+                    'emotion_status': 'pending'
+                },
+                mode=mode,
+                prompt_type=prompt_type
+            )
+            db.session.add(conversation)
+            db.session.commit()
+            logger.info(f"Saved streamed conversation for user {user_id}")
+
+            emotion_scores = None
+            emotion_status = 'pending'
+            if not emotion_worker.submit(_store_emotion_scores, app, conversation.id, message):
+                # Queue is saturated - score inline rather than leave the row pending
+                emotion_scores = score_emotional_state(message)
+                emotion_status = 'complete'
+                conversation.context = {
+                    **conversation.context,
+                    'emotion_analysis': emotion_scores,
+                    'emotion_status': emotion_status
+                }
+                db.session.commit()
+
+            yield _sse_event('done', {
+                'user_id': user_id,
+                'conversation_id': conversation.id,
+                'emotion_analysis': emotion_scores,
+                'emotion_status': emotion_status,
+                'timestamp': conversation.created_at.isoformat()
+            })
+
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error saving streamed conversation: {str(e)}")
+            yield _sse_event('error', {'error': 'Internal server error'})
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+@chat_bp.route('/api/chat/message/<int:conversation_id>/emotion', methods=['GET'])
+def get_emotion_analysis(conversation_id):
+    """
+    Poll for the emotion analysis of a message
+    Used by clients that sent the message with deferred_analysis enabled;
+    status is 'pending', 'complete' or 'failed'
+    """
+    try:
+        conversation = Conversation.query.get(conversation_id)
+        if not conversation:
+            return jsonify({'error': 'Conversation not found'}), 404
+
+        conversation_context = conversation.context or {}
+        emotion_scores = conversation_context.get('emotion_analysis')
+
+        return jsonify({
+            'conversation_id': conversation.id,
+            'status': conversation_context.get('emotion_status', 'complete' if emotion_scores else 'pending'),
+            'emotion_analysis': emotion_scores
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting emotion analysis: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
 @chat_bp.route('/api/chat/resources', methods=['POST'])
 def get_resources():
     """
@@ -124,11 +345,14 @@ def get_resources():
         location = data['location']
         needs = data.get('needs', ['food'])  # Default to food
         situation = data.get('situation', '')
+        k = data.get('k')
+        if k is not None and (not isinstance(k, int) or not 1 <= k <= 20):
+            return jsonify({'error': 'k must be an integer between 1 and 20'}), 400
 
         logger.info(f"RAG resource request for {location} with needs: {needs}")
 
         # Get resources via RAG pipeline
-        resources = get_local_resources(location, needs, situation)
+        resources = get_local_resources(location, needs, situation, k)
 
         return jsonify({
             'resources': resources,
@@ -142,6 +366,43 @@ def get_resources():
         return jsonify({'error': 'Internal server error'}), 500
 
 
+@chat_bp.route('/api/chat/resources/search', methods=['GET'])
+def search_resources():
+    """
+    Free-text resource search, optionally narrowed by location and category
+    (mode=semantic ranks by embedding similarity instead of keyword matches;
+    mode=hybrid fuses both and reranks by distance from location)
+    """
+    try:
+        query = request.args.get('q', '').strip()
+        location = request.args.get('location')
+        category = request.args.get('category')
+        limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+        mode = request.args.get('mode', 'keyword')
+
+        if mode == 'semantic':
+            if not query:
+                return jsonify({'error': 'q is required for semantic search'}), 400
+            return jsonify(semantic_search_local_resources(query, location, limit))
+
+        if mode == 'hybrid':
+            if not query or not location:
+                return jsonify({'error': 'q and location are required for hybrid search'}), 400
+            situation = request.args.get('situation')
+            return jsonify(hybrid_search_local_resources(query, location, situation, limit))
+
+        if not query and not location and not category:
+            return jsonify({'error': 'q, location or category is required'}), 400
+
+        results = search_local_resources(query, location, category, limit)
+
+        return jsonify(results)
+
+    except Exception as e:
+        logger.error(f"Error searching resources: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
 @chat_bp.route('/api/chat/analyze-journal', methods=['POST'])
 def analyze_journal():
     """
@@ -172,10 +433,42 @@ def analyze_journal():
         return jsonify({'error': 'Internal server error'}), 500
 
 
+@chat_bp.route('/api/chat/score-batch', methods=['POST'])
+def score_batch():
+    """
+    Score emotional state for many texts in as few Gemini calls as possible
+    """
+    try:
+        data = request.get_json()
+
+        texts = data.get('texts') if data else None
+        if not isinstance(texts, list) or not texts:
+            return jsonify({'error': 'texts must be a non-empty list'}), 400
+        if not all(isinstance(text, str) for text in texts):
+            return jsonify({'error': 'texts must contain only strings'}), 400
+        if len(texts) > Config.EMOTION_BATCH_LIMIT:
+            return jsonify({'error': f'At most {Config.EMOTION_BATCH_LIMIT} texts per request'}), 400
+
+        logger.info(f"Scoring batch of {len(texts)} texts")
+
+        scores = score_emotional_state_batch(texts)
+
+        return jsonify({
+            'scores': scores,
+            'count': len(scores),
+            'timestamp': datetime.now().isoformat()
+        })
+
+    except Exception as e:
+        logger.error(f"Error scoring batch: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
 @chat_bp.route('/api/chat/summarize/<int:user_id>', methods=['GET'])
 def summarize_user_conversation(user_id):
     """
     Summarize a user's conversation history using Gemini
+    (the latest 10 conversations by default; ?limit and ?cursor select an earlier window)
     """
     try:
         user = User.query.get(user_id)
@@ -183,9 +476,13 @@ def summarize_user_conversation(user_id):
             return jsonify({'error': 'User not found'}), 404
 
         # Get recent conversations
-        conversations = Conversation.query.filter_by(user_id=user_id)\
-            .order_by(Conversation.created_at.desc())\
-            .limit(10).all()
+        try:
+            conversations, next_cursor = keyset_page(
+                Conversation.query.filter_by(user_id=user_id),
+                Conversation.created_at, Conversation.id,
+                request.args.get('cursor'), page_size(request.args.get('limit', type=int), default=10))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         if not conversations:
             return jsonify({'error': 'No conversations found'}), 404
@@ -207,6 +504,7 @@ def summarize_user_conversation(user_id):
             'summary': summary,
             'user_id': user_id,
             'conversation_count': len(conversations),
+            'next_cursor': next_cursor,
             'user_context': {
                 'name': user.name,
                 'location': user.location,
@@ -221,15 +519,22 @@ def summarize_user_conversation(user_id):
 
 @chat_bp.route('/api/chat/history/<int:user_id>', methods=['GET'])
 def get_chat_history(user_id):
-    """Get chat history for a user"""
+    """
+    Get chat history for a user
+    (the latest 20 conversations by default; pass next_cursor back as ?cursor for older ones)
+    """
     try:
         user = User.query.get(user_id)
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
-        conversations = Conversation.query.filter_by(user_id=user_id)\
-            .order_by(Conversation.created_at.desc())\
-            .limit(20).all()
+        try:
+            conversations, next_cursor = keyset_page(
+                Conversation.query.filter_by(user_id=user_id),
+                Conversation.created_at, Conversation.id,
+                request.args.get('cursor'), page_size(request.args.get('limit', type=int), default=20))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         history = []
         for conv in reversed(conversations):  # Show chronological order
@@ -237,7 +542,7 @@ def get_chat_history(user_id):
                 'id': conv.id,
                 'message': conv.message,
                 'response': conv.response,
-                'timestamp': conv.created_at.isoformat(),
+                'timestamp': conv.created_at.isoformat() if conv.created_at else None,
                 'message_type': conv.message_type,
                 'context': conv.context
             })
@@ -245,7 +550,8 @@ def get_chat_history(user_id):
         return jsonify({
             'history': history,
             'user_id': user_id,
-            'total_conversations': len(conversations)
+            'total_conversations': len(conversations),
+            'next_cursor': next_cursor
         })
 
     except Exception as e:
@@ -253,31 +559,65 @@ def get_chat_history(user_id):
         return jsonify({'error': 'Internal server error'}), 500
 
 
+# Rows fetched per query while streaming the full user list
+USERS_STREAM_BATCH = 500
+
+
 @chat_bp.route('/api/chat/users', methods=['GET'])
 def get_users():
-    """Get all users"""
+    """
+    Get users, oldest first, streamed as JSON
+    Without ?limit every user is returned; with ?limit (and ?cursor from the
+    previous page's next_cursor) one page is returned
+    """
     try:
-        users = User.query.all()
-        user_list = []
-
-        for user in users:
-            user_list.append({
-                'id': user.id,
-                'name': user.name,
-                'location': user.location,
-                'situation': user.situation,
-                'created_at': user.created_at.isoformat(),
-                'conversation_count': len(user.conversations)
-            })
-
-        return jsonify({
-            'users': user_list,
-            'total_users': len(user_list)
-        })
-
-    except Exception as e:
-        logger.error(f"Error getting users: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')
+        if cursor:
+            decode_cursor(cursor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Counted per user from the (user_id, created_at) index, not by loading rows
+    conversation_count = db.session.query(db.func.count(Conversation.id))\
+        .filter(Conversation.user_id == User.id)\
+        .correlate(User).scalar_subquery().label('conversation_count')
+    users_query = db.session.query(
+        User.id, User.name, User.location, User.situation, User.created_at, conversation_count)
+
+    if limit is None:
+        batches = iter_keyset(users_query, User.created_at, User.id, cursor,
+                              batch_size=USERS_STREAM_BATCH, descending=False)
+    else:
+        batches = iter_keyset(users_query, User.created_at, User.id, cursor,
+                              batch_size=page_size(limit), descending=False)
+        # A single page: stop after the first batch, keeping its cursor
+        batches = islice(batches, 1)
+
+    def generate():
+        yield '{"users": ['
+        total = 0
+        next_cursor = None
+        try:
+            for users, next_cursor in batches:
+                for user in users:
+                    yield (',' if total else '') + json.dumps({
+                        'id': user.id,
+                        'name': user.name,
+                        'location': user.location,
+                        'situation': user.situation,
+                        'created_at': user.created_at.isoformat() if user.created_at else None,
+                        'conversation_count': user.conversation_count
+                    })
+                    total += 1
+        except Exception as e:
+            # Headers are already sent; end with valid JSON that reports the failure
+            logger.error(f"Error getting users: {str(e)}")
+            yield f'], "total_users": {total}, "error": "Internal server error"}}'
+            return
+        yield f'], "total_users": {total}, "next_cursor": {json.dumps(next_cursor)}}}'
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
 
 @chat_bp.route('/api/chat/health', methods=['GET'])
@@ -0,0 +1,85 @@
+# Background worker queue - runs deferred jobs off the request path
+
+import logging
+import queue
+import threading
+from typing import Dict, Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundWorker:
+    """Bounded job queue drained by a small pool of daemon threads"""
+
+    def __init__(self, name: str, workers: int = 2, maxsize: int = 1000):
+        self.name = name
+        self.workers = workers
+        self.jobs = queue.Queue(maxsize=maxsize)
+
+        self._lock = threading.Lock()
+        self._threads = []
+        self._enqueued = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    def _ensure_started(self):
+        """Start worker threads on first use"""
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(
+                    target=self._run, name=f"{self.name}-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, job: Callable, *args, **kwargs) -> bool:
+        """
+        Queue a job for background execution
+
+        Returns:
+            True if queued, False if the queue is full
+        """
+        self._ensure_started()
+        try:
+            self.jobs.put_nowait((job, args, kwargs))
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            logger.warning(f"{self.name} queue full, job rejected")
+            return False
+
+        with self._lock:
+            self._enqueued += 1
+        return True
+
+    def _run(self):
+        while True:
+            job, args, kwargs = self.jobs.get()
+            try:
+                job(*args, **kwargs)
+                with self._lock:
+                    self._completed += 1
+            except Exception as e:
+                logger.error(f"{self.name} job failed: {str(e)}")
+                with self._lock:
+                    self._failed += 1
+            finally:
+                self.jobs.task_done()
+
+    def join(self):
+        """Block until every queued job has finished"""
+        self.jobs.join()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and job counters"""
+        with self._lock:
+            return {
+                'workers': len(self._threads),
+                'queued': self.jobs.qsize(),
+                'enqueued': self._enqueued,
+                'completed': self._completed,
+                'failed': self._failed,
+                'rejected': self._rejected
+            }
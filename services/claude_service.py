@@ -7,7 +7,8 @@ import requests
 import json
 from dotenv import load_dotenv
 from datetime import datetime
-from .rag_pipeline import rag_pipeline
+from .rag_pipeline import GENERAL_NEED, rag_pipeline
+from .intent_classifier import intent_classifier
 
 # Load environment variables from .env file
 load_dotenv()
@@ -141,10 +142,7 @@ Your goal is to provide thorough, accurate, and genuinely helpful information th
 
     def _is_simple_greeting(self, message: str) -> bool:
         """Check if message is a simple greeting"""
-        greetings = ['hi', 'hello', 'hey', 'good morning',
-                     'good afternoon', 'good evening', 'sup', 'what\'s up']
-        message_clean = message.lower().strip()
-        return any(greeting in message_clean for greeting in greetings) and len(message_clean.split()) <= 3
+        return intent_classifier.classify(message).greeting
 
     def get_support_response(self, message: str, context: Optional[Dict[str, Any]] = None, prompt_type: str = "empathetic_coach", history: Optional[List[Any]] = None) -> str:
         """
@@ -177,7 +175,8 @@ Your goal is to provide thorough, accurate, and genuinely helpful information th
                 rag_results = rag_pipeline.retrieve_resources(
                     context.get('location'),
                     needs,
-                    context.get('situation')
+                    context.get('situation'),
+                    message=message
                 )
                 rag_context = rag_pipeline.format_resources_for_claude(
                     rag_results)
@@ -283,36 +282,20 @@ Your goal is to provide thorough, accurate, and genuinely helpful information th
 
     def _extract_needs_from_message(self, message: str, context: Optional[Dict[str, Any]] = None) -> List[str]:
         """Extract needs from user message and context"""
-        needs = []
-        message_lower = message.lower()
-
         # Extract from message
-        if any(word in message_lower for word in ["food", "hungry", "eat", "meal"]):
-            needs.append("food")
-        if any(word in message_lower for word in ["shelter", "housing", "sleep", "bed", "place to stay"]):
-            needs.append("shelter")
-        if any(word in message_lower for word in ["health", "medical", "doctor", "clinic", "sick"]):
-            needs.append("healthcare")
-        if any(word in message_lower for word in ["job", "work", "employment", "career"]):
-            needs.append("employment")
+        needs = list(intent_classifier.classify(message).needs)
 
         # Extract from context
         if context and context.get('needs'):
-            context_needs = context['needs'].lower()
-            if any(word in context_needs for word in ["food", "hungry", "eat"]):
-                needs.append("food")
-            if any(word in context_needs for word in ["shelter", "housing", "sleep"]):
-                needs.append("shelter")
-            if any(word in context_needs for word in ["health", "medical"]):
-                needs.append("healthcare")
-            if any(word in context_needs for word in ["job", "work", "employment"]):
-                needs.append("employment")
-
-        # Default to food if no specific needs detected
+            needs.extend(need for need in intent_classifier.classify(context['needs']).needs
+                         if need not in needs)
+
+        # Default to general if no specific needs detected; keyword
+        # retrieval treats it as food
         if not needs:
-            needs = ["food"]
+            needs = [GENERAL_NEED]
 
-        return list(set(needs))  # Remove duplicates
+        return needs
 
     # Keep all the existing methods for journal analysis, conversation summary, etc.
     def analyze_journal_entry(self, journal_text: str, user_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -0,0 +1,258 @@
+# Local emotion scoring engine - weighted lexicon scored with NumPy
+
+import re
+from typing import Dict, Any, List
+import numpy as np
+
+DIMENSIONS = ('distress', 'hope', 'motivation', 'anxiety', 'positivity')
+
+# Neutral-text score for each dimension; lexicon evidence moves scores away from it
+BASELINES = np.array([0.2, 0.4, 0.4, 0.2, 0.5], dtype=np.float32)
+
+# word -> {dimension: weight}; negative weights pull a dimension down
+EMOTION_LEXICON = {
+    # distress
+    'sad': {'distress': 0.6, 'positivity': -0.5},
+    'depressed': {'distress': 0.9, 'hope': -0.4, 'motivation': -0.4, 'positivity': -0.6},
+    'depression': {'distress': 0.8, 'motivation': -0.3, 'positivity': -0.5},
+    'hopeless': {'distress': 1.0, 'hope': -1.0, 'positivity': -0.7},
+    'helpless': {'distress': 0.8, 'hope': -0.6, 'motivation': -0.4},
+    'miserable': {'distress': 0.9, 'positivity': -0.8},
+    'struggle': {'distress': 0.5, 'positivity': -0.2},
+    'struggling': {'distress': 0.6, 'positivity': -0.3},
+    'difficult': {'distress': 0.4, 'positivity': -0.2},
+    'hard': {'distress': 0.3, 'positivity': -0.1},
+    'hurt': {'distress': 0.7, 'positivity': -0.4},
+    'pain': {'distress': 0.6, 'positivity': -0.4},
+    'lonely': {'distress': 0.6, 'positivity': -0.4},
+    'alone': {'distress': 0.4, 'positivity': -0.2},
+    'crying': {'distress': 0.7, 'positivity': -0.5},
+    'exhausted': {'distress': 0.5, 'motivation': -0.6},
+    'tired': {'distress': 0.3, 'motivation': -0.4},
+    'broke': {'distress': 0.5, 'anxiety': 0.3},
+    'homeless': {'distress': 0.6, 'anxiety': 0.4},
+    'evicted': {'distress': 0.7, 'anxiety': 0.6},
+    'eviction': {'distress': 0.6, 'anxiety': 0.6},
+    'hungry': {'distress': 0.4, 'anxiety': 0.2},
+    'starving': {'distress': 0.7, 'anxiety': 0.4},
+    'lost': {'distress': 0.5, 'hope': -0.2},
+    'desperate': {'distress': 0.9, 'anxiety': 0.6, 'hope': -0.4},
+    'suicidal': {'distress': 1.5, 'hope': -1.2, 'anxiety': 0.8, 'positivity': -1.0},
+    'die': {'distress': 1.0, 'hope': -0.6, 'positivity': -0.6},
+    'unsafe': {'distress': 0.8, 'anxiety': 0.9},
+    'abuse': {'distress': 0.9, 'anxiety': 0.7},
+    'angry': {'distress': 0.5, 'positivity': -0.4},
+    'upset': {'distress': 0.5, 'positivity': -0.4},
+    'overwhelmed': {'distress': 0.7, 'anxiety': 0.6, 'motivation': -0.3},
+    'stuck': {'distress': 0.4, 'hope': -0.3, 'motivation': -0.3},
+    'failure': {'distress': 0.6, 'hope': -0.3, 'positivity': -0.4},
+    'worthless': {'distress': 1.0, 'hope': -0.6, 'positivity': -0.8},
+    'terrible': {'distress': 0.6, 'positivity': -0.6},
+    'awful': {'distress': 0.6, 'positivity': -0.6},
+    'bad': {'distress': 0.3, 'positivity': -0.4},
+    'worse': {'distress': 0.5, 'hope': -0.3, 'positivity': -0.4},
+    'worst': {'distress': 0.7, 'positivity': -0.6},
+    # anxiety
+    'anxious': {'anxiety': 0.9, 'distress': 0.4},
+    'anxiety': {'anxiety': 0.8, 'distress': 0.3},
+    'worried': {'anxiety': 0.7, 'distress': 0.3},
+    'worry': {'anxiety': 0.6, 'distress': 0.2},
+    'scared': {'anxiety': 0.8, 'distress': 0.4},
+    'afraid': {'anxiety': 0.8, 'distress': 0.4},
+    'fear': {'anxiety': 0.7, 'distress': 0.3},
+    'nervous': {'anxiety': 0.7},
+    'panic': {'anxiety': 1.0, 'distress': 0.5},
+    'stressed': {'anxiety': 0.7, 'distress': 0.4},
+    'stress': {'anxiety': 0.6, 'distress': 0.3},
+    'urgent': {'anxiety': 0.6},
+    'emergency': {'anxiety': 0.7, 'distress': 0.4},
+    'tonight': {'anxiety': 0.2},
+    'uncertain': {'anxiety': 0.5},
+    'unsure': {'anxiety': 0.4},
+    'danger': {'anxiety': 0.9, 'distress': 0.5},
+    # hope
+    'hope': {'hope': 0.8, 'positivity': 0.3},
+    'hopeful': {'hope': 0.9, 'positivity': 0.5},
+    'better': {'hope': 0.5, 'positivity': 0.4},
+    'improve': {'hope': 0.5, 'motivation': 0.4},
+    'improving': {'hope': 0.6, 'motivation': 0.3, 'positivity': 0.3},
+    'future': {'hope': 0.4},
+    'optimistic': {'hope': 0.9, 'positivity': 0.6},
+    'possible': {'hope': 0.3},
+    'believe': {'hope': 0.4, 'motivation': 0.2},
+    'progress': {'hope': 0.5, 'motivation': 0.4, 'positivity': 0.3},
+    'opportunity': {'hope': 0.5, 'motivation': 0.3},
+    'support': {'hope': 0.3, 'positivity': 0.1},
+    'help': {'hope': 0.2},
+    'safe': {'hope': 0.4, 'anxiety': -0.4, 'positivity': 0.3},
+    # motivation
+    'motivated': {'motivation': 0.9, 'positivity': 0.3},
+    'determined': {'motivation': 0.9, 'hope': 0.3},
+    'ready': {'motivation': 0.6},
+    'try': {'motivation': 0.4},
+    'trying': {'motivation': 0.5},
+    'working': {'motivation': 0.4},
+    'goal': {'motivation': 0.6, 'hope': 0.2},
+    'goals': {'motivation': 0.6, 'hope': 0.2},
+    'plan': {'motivation': 0.5, 'hope': 0.2},
+    'apply': {'motivation': 0.5},
+    'applied': {'motivation': 0.5},
+    'interview': {'motivation': 0.5, 'hope': 0.3, 'anxiety': 0.2},
+    'start': {'motivation': 0.4},
+    'focus': {'motivation': 0.4},
+    'want': {'motivation': 0.2},
+    'unmotivated': {'motivation': -0.9, 'distress': 0.3},
+    'lazy': {'motivation': -0.6},
+    'quit': {'motivation': -0.6, 'distress': 0.3},
+    # positivity
+    'happy': {'positivity': 0.9, 'distress': -0.4},
+    'glad': {'positivity': 0.7},
+    'good': {'positivity': 0.5},
+    'great': {'positivity': 0.8},
+    'grateful': {'positivity': 0.8, 'hope': 0.3},
+    'thankful': {'positivity': 0.8, 'hope': 0.3},
+    'thanks': {'positivity': 0.5},
+    'thank': {'positivity': 0.5},
+    'relieved': {'positivity': 0.7, 'anxiety': -0.6, 'distress': -0.3},
+    'calm': {'positivity': 0.5, 'anxiety': -0.6},
+    'okay': {'positivity': 0.2},
+    'fine': {'positivity': 0.2},
+    'love': {'positivity': 0.8},
+    'proud': {'positivity': 0.8, 'motivation': 0.4},
+    'excited': {'positivity': 0.8, 'motivation': 0.5},
+    'positive': {'positivity': 0.7, 'hope': 0.3},
+    'wonderful': {'positivity': 0.9},
+    'amazing': {'positivity': 0.9},
+}
+
+# Words that flip the polarity of the emotion words that follow them
+NEGATORS = ('not', 'no', 'never', 'dont', 'cant', 'cannot', 'wont', 'isnt', 'arent',
+            'wasnt', 'didnt', 'doesnt', 'havent', 'hardly', 'without', 'nothing', 'nobody')
+
+# Words that amplify the emotion word that follows them
+INTENSIFIERS = {'very': 1.5, 'really': 1.4, 'so': 1.3, 'extremely': 1.8,
+                'completely': 1.6, 'totally': 1.5, 'too': 1.3, 'super': 1.4}
+
+_TOKEN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+
+class LexiconEmotionScorer:
+    """
+    Weighted-lexicon emotion scorer with negation handling
+
+    Messages are mapped to token-id arrays; weight lookup, negation scopes,
+    intensifiers and per-message aggregation are NumPy array operations, so a
+    batch of thousands of messages is scored with a handful of vector passes.
+    """
+
+    def __init__(self, lexicon: Dict[str, Dict[str, float]] = EMOTION_LEXICON, negation_window: int = 3, negation_factor: float = -0.6, scale: float = 0.8):
+        """
+        Args:
+            lexicon: word -> {dimension: weight}
+            negation_window: How many following tokens a negator applies to
+            negation_factor: Multiplier applied to negated emotion words
+            scale: Steepness of the raw-evidence to 0-1 squashing
+        """
+        self.negation_window = negation_window
+        self.negation_factor = negation_factor
+        self.scale = scale
+
+        # Id 0 is reserved for out-of-vocabulary tokens and carries no weight
+        words = sorted(set(lexicon) | set(NEGATORS) | set(INTENSIFIERS))
+        self.vocab = {word: i + 1 for i, word in enumerate(words)}
+
+        size = len(words) + 1
+        self.weights = np.zeros((size, len(DIMENSIONS)), dtype=np.float32)
+        self.is_negator = np.zeros(size, dtype=bool)
+        self.boost = np.ones(size, dtype=np.float32)
+
+        for word, weights in lexicon.items():
+            for dimension, weight in weights.items():
+                self.weights[self.vocab[word], DIMENSIONS.index(dimension)] = weight
+        for word in NEGATORS:
+            self.is_negator[self.vocab[word]] = True
+        for word, factor in INTENSIFIERS.items():
+            self.boost[self.vocab[word]] = factor
+
+    def token_ids(self, text: str) -> np.ndarray:
+        """Map text to an array of vocabulary ids (0 for unknown words)"""
+        vocab = self.vocab
+        tokens = _TOKEN.findall(text.lower())
+        return np.fromiter((vocab.get(token.replace("'", ''), 0) for token in tokens),
+                           dtype=np.int32, count=len(tokens))
+
+    def score(self, text: str) -> Dict[str, Any]:
+        """Score a single message"""
+        return self.score_batch([text])[0]
+
+    def score_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Score many messages in one vectorized pass"""
+        if not texts:
+            return []
+
+        id_arrays = [self.token_ids(text) for text in texts]
+        lengths = np.fromiter((len(ids) for ids in id_arrays),
+                              dtype=np.int64, count=len(id_arrays))
+        raw = self._raw_scores(np.concatenate(id_arrays), lengths)
+        return self._to_dicts(self._squash(raw, lengths))
+
+    def _raw_scores(self, ids: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """Sum negation- and intensity-adjusted weights per message"""
+        n_docs = len(lengths)
+        raw = np.zeros((n_docs, len(DIMENSIONS)), dtype=np.float32)
+        if ids.size == 0:
+            return raw
+
+        positions = np.arange(ids.size)
+        doc_of_token = np.repeat(np.arange(n_docs), lengths)
+        doc_start = np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+        # negators_before[i] = number of negators in tokens [0, i)
+        negators_before = np.concatenate(
+            ([0], np.cumsum(self.is_negator[ids])))
+        window_start = np.maximum(positions - self.negation_window, doc_start)
+        negated = (negators_before[positions] -
+                   negators_before[window_start]) > 0
+
+        # Intensifiers amplify the next token within the same message
+        boost = np.ones(ids.size, dtype=np.float32)
+        boost[1:] = self.boost[ids[:-1]]
+        boost[doc_start == positions] = 1.0
+
+        factor = np.where(negated, self.negation_factor, 1.0) * boost
+        contributions = self.weights[ids] * factor[:, None]
+
+        for d in range(len(DIMENSIONS)):
+            raw[:, d] = np.bincount(
+                doc_of_token, weights=contributions[:, d], minlength=n_docs)
+        return raw
+
+    def _squash(self, raw: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """Map raw evidence onto 0-1 around each dimension's neutral baseline"""
+        # Damp long texts so one emotional word in a paragraph is not saturating
+        damp = 1.0 / np.sqrt(np.maximum(lengths, 1) / 8.0).clip(min=1.0)
+        pull = np.tanh(raw * self.scale * damp[:, None])
+        scores = np.where(pull >= 0,
+                          BASELINES + pull * (1.0 - BASELINES),
+                          BASELINES + pull * BASELINES)
+        return np.clip(scores, 0.0, 1.0)
+
+    def _to_dicts(self, scores: np.ndarray) -> List[Dict[str, Any]]:
+        valence = (scores[:, 1] + scores[:, 4]) - (scores[:, 0] + scores[:, 3])
+        baseline_valence = (BASELINES[1] + BASELINES[4]) - (BASELINES[0] + BASELINES[3])
+        sentiment = np.select(
+            [valence > baseline_valence + 0.15, valence < baseline_valence - 0.15],
+            ['positive', 'negative'], 'neutral')
+
+        rounded = np.round(scores, 3).tolist()
+        results = []
+        for row, overall in zip(rounded, sentiment.tolist()):
+            result = dict(zip(DIMENSIONS, row))
+            result['overall_sentiment'] = overall
+            result['source'] = 'lexicon'
+            results.append(result)
+        return results
+
+
+# Global instance
+emotion_scorer = LexiconEmotionScorer()
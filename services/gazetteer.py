@@ -0,0 +1,126 @@
+# Offline gazetteer - place names and ZIP codes to coordinates and region
+
+import logging
+import mmap
+import os
+import re
+from array import array
+from collections import namedtuple
+from typing import Optional
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+Place = namedtuple('Place', ['name', 'lat', 'lon', 'region', 'kind'])
+
+# Earlier kinds win when names of the same length match
+KIND_PRIORITY = {'zip': 0, 'city': 1, 'neighborhood': 2}
+
+# Longest place name, in words, that resolve() tries
+MAX_NAME_WORDS = 3
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+class Gazetteer:
+    """
+    Sorted, memory-mapped place table
+
+    The data file has one ``name<TAB>lat<TAB>lon<TAB>region<TAB>kind`` line
+    per place, sorted bytewise by name. Only the line start offsets are held
+    in memory (an ``array('I')``); lookups binary-search the mapped file, so
+    the table can grow to every ZIP code in the state without a dict of
+    Python objects per entry.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._data = b''
+        self._offsets = array('I')
+
+        try:
+            self._file = open(path, 'rb')
+            if os.fstat(self._file.fileno()).st_size:
+                self._data = mmap.mmap(
+                    self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError as e:
+            logger.error(f"Gazetteer unavailable at {path}: {str(e)}")
+            return
+
+        position = 0
+        size = len(self._data)
+        while position < size:
+            self._offsets.append(position)
+            end = self._data.find(b'\n', position)
+            position = size if end == -1 else end + 1
+
+        logger.info(f"Gazetteer loaded: {len(self._offsets)} places")
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def _line(self, index: int) -> bytes:
+        start = self._offsets[index]
+        end = self._data.find(b'\n', start)
+        return self._data[start:end if end != -1 else len(self._data)]
+
+    def _key(self, index: int) -> bytes:
+        line = self._line(index)
+        return line[:line.find(b'\t')]
+
+    def lookup(self, name: str) -> Optional[Place]:
+        """Exact lookup of a normalized place name or ZIP code"""
+        key = name.encode('utf-8')
+        low, high = 0, len(self._offsets)
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == len(self._offsets) or self._key(low) != key:
+            return None
+
+        fields = self._line(low).decode('utf-8').split('\t')
+        return Place(fields[0], float(fields[1]), float(fields[2]), fields[3], fields[4])
+
+    def resolve(self, location: str) -> Optional[Place]:
+        """
+        Find the best place named in free text
+
+        A known ZIP code wins outright. Otherwise every run of up to
+        MAX_NAME_WORDS whole words is looked up, so "sf" matches only as a word
+        and never inside "transfer"; longer names win, then cities over
+        neighborhoods.
+        """
+        if not location:
+            return None
+
+        words = _WORD.findall(location.lower())
+        for word in words:
+            if len(word) == 5 and word.isdigit():
+                place = self.lookup(word)
+                if place:
+                    return place
+
+        best = None
+        for size in range(min(MAX_NAME_WORDS, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                place = self.lookup(' '.join(words[start:start + size]))
+                if place and (best is None or KIND_PRIORITY[place.kind] < KIND_PRIORITY[best.kind]):
+                    best = place
+            if best:
+                return best
+        return None
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        if self._file:
+            self._file.close()
+
+
+# Global gazetteer instance
+gazetteer = Gazetteer(Config.GAZETTEER_PATH)
@@ -1,30 +1,82 @@
 # Gemini Service - Complete AI assistant functionality
 
 import os
+import time
 import logging
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, Optional, List, Tuple, Iterator, Callable
 import requests
 import json
 from dotenv import load_dotenv
 from datetime import datetime
-from .rag_pipeline import rag_pipeline
+from config import Config
+from .http_client import PooledHTTPClient
+from .emotion_lexicon import emotion_scorer
+from .intent_classifier import intent_classifier
+from .response_cache import LRUCache, create_response_cache, make_cache_key, normalize_message
+from .rag_pipeline import GENERAL_NEED, rag_pipeline
+from utils.metrics import LatencyStats
 
 # Load environment variables from .env file
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Gemini has always reported these needs under their own names
+GEMINI_NEED_LABELS = {'shelter': 'housing', 'healthcare': 'health'}
+
 
 class GeminiService:
     """Service for interacting with Google Gemini API for complete AI assistant functionality"""
 
-    def __init__(self):
-        self.api_key = os.environ.get('GEMINI_API_KEY')
-        self.api_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent"
+    def __init__(self, api_key: Optional[str] = None, api_url: Optional[str] = None):
+        self.api_key = api_key or os.environ.get('GEMINI_API_KEY')
+        self.api_url = api_url or "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent"
+        self.stream_url = self.api_url.replace(
+            ':generateContent', ':streamGenerateContent')
+
+        # Shared keep-alive pool so repeated calls skip the TCP+TLS handshake
+        self.http = PooledHTTPClient(
+            pool_connections=Config.GEMINI_POOL_CONNECTIONS,
+            pool_maxsize=Config.GEMINI_POOL_MAXSIZE,
+            pool_block=Config.GEMINI_POOL_BLOCK,
+            keepalive=Config.GEMINI_KEEPALIVE)
+
+        # Bounded pool for running independent LLM calls side by side
+        self.executor = ThreadPoolExecutor(
+            max_workers=Config.CHAT_EXECUTOR_WORKERS, thread_name_prefix='gemini')
+
+        self.ttft_stats = LatencyStats()
+        self.stream_stats = LatencyStats()
+
+        # Completions keyed on normalized prompt + generation config
+        self.response_cache = create_response_cache(
+            backend=Config.RESPONSE_CACHE_BACKEND,
+            maxsize=Config.RESPONSE_CACHE_MAXSIZE,
+            ttl=Config.RESPONSE_CACHE_TTL,
+            redis_url=Config.REDIS_URL)
+
+        # Scores for short, frequently repeated messages ("thanks", "need a shelter")
+        self.emotion_memo = LRUCache(
+            maxsize=Config.EMOTION_MEMO_MAXSIZE, ttl=Config.EMOTION_MEMO_TTL)
 
         if not self.api_key:
             logger.warning("GEMINI_API_KEY not set in environment variables")
 
+    def get_http_stats(self) -> Dict[str, Any]:
+        """Connection pool counters (new vs reused connections)"""
+        return self.http.get_stats()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Response cache hit/miss/eviction counters"""
+        if self.response_cache is None:
+            return {'backend': 'none'}
+        return self.response_cache.get_stats()
+
+    def get_emotion_memo_stats(self) -> Dict[str, Any]:
+        """Emotion score memo hit/miss/eviction counters"""
+        return self.emotion_memo.get_stats()
+
     def _get_system_prompts(self, mode: str = "coach") -> Dict[str, str]:
         """Define system prompts for different modes and interaction styles"""
         if mode == "coach":
@@ -112,12 +164,9 @@ Formatting Focus:
 
     def _is_simple_greeting(self, message: str) -> bool:
         """Check if message is a simple greeting"""
-        greetings = ['hi', 'hello', 'hey', 'good morning',
-                     'good afternoon', 'good evening', 'sup', 'what\'s up']
-        message_clean = message.lower().strip()
-        return any(greeting in message_clean for greeting in greetings) and len(message_clean.split()) <= 3
+        return intent_classifier.classify(message).greeting
 
-    def get_support_response(self, message: str, context: Optional[Dict[str, Any]] = None, prompt_type: str = "empathetic_coach", mode: str = "coach", is_voice: bool = False, history: Optional[List[Any]] = None) -> str:
+    def get_support_response(self, message: str, context: Optional[Dict[str, Any]] = None, prompt_type: str = "empathetic_coach", mode: str = "coach", is_voice: bool = False, history: Optional[List[Any]] = None, emotion_scores: Optional[Dict[str, Any]] = None) -> str:
         """
         Generate a supportive response using Gemini API
 
@@ -128,53 +177,38 @@ Formatting Focus:
             mode: Either "coach" or "assistant"
             is_voice: Whether this is a voice input (affects response length)
             history: Optional list of previous Conversation objects
+            emotion_scores: Optional scores for the message; the reply is only cached
+                when these are given and not high urgency
 
         Returns:
             Gemini's response as a string
         """
+        return self._generate_support_response(message, context, prompt_type, mode, is_voice, history, lambda: emotion_scores)
+
+    def _generate_support_response(self, message: str, context: Optional[Dict[str, Any]], prompt_type: str, mode: str, is_voice: bool, history: Optional[List[Any]], scores_provider: Callable[[], Optional[Dict[str, Any]]]) -> str:
+        """
+        get_support_response body; scores_provider is only consulted before a
+        cache write, so concurrent callers can hand in scores still being computed
+        """
         try:
             if not self.api_key:
                 return self._fallback_response(message, prompt_type)
 
-            # Handle simple greetings naturally
-            if self._is_simple_greeting(message):
-                if prompt_type == "direct_assistant":
-                    return "Hello. What do you need help with?"
-                else:
-                    return "Hi there! I'm here to help you navigate resources and support. What can I assist you with today?"
-
-            # Get local resources via RAG pipeline
-            rag_context = ""
-            if context and context.get('location'):
-                needs = self._extract_needs_from_message(message, context)
-                rag_results = rag_pipeline.retrieve_resources(
-                    context.get('location'),
-                    needs,
-                    context.get('situation')
-                )
-                rag_context = rag_pipeline.format_resources_for_gemini(
-                    rag_results)
-                logger.info(
-                    f"RAG retrieved {rag_results.get('total_resources', 0)} resources")
-
-            # Build the enhanced system prompt
-            system_prompt = self._build_enhanced_system_prompt(
-                context, rag_context, prompt_type, mode)
-
-            # Format conversation history
-            history_str = ""
-            if history:
-                for conv in history:
-                    history_str += f"User: {conv.message}\n"
-                    history_str += f"Assistant: {conv.response}\n"
-
-            # Create the full prompt
-            full_prompt = f"{system_prompt}\n\nCONVERSATION HISTORY:\n{history_str}\n\nUser message: {message}"
-
-            # Use different token limits based on input type
-            max_tokens = 800 if is_voice else 2000
+            canned_response, full_prompt, max_tokens = self._prepare_support_prompt(
+                message, context, prompt_type, mode, is_voice, history)
+            if canned_response:
+                return canned_response
+
+            def cacheable(_: str) -> bool:
+                # Unknown urgency (scoring deferred or past its deadline) is
+                # never cached: the reply could be served to a crisis message
+                scores = scores_provider()
+                return scores is not None and not self._is_high_urgency(scores)
+
+            urgent = self._is_urgent_message(message)
             response = self._call_gemini_api(
-                full_prompt, max_tokens=max_tokens)
+                full_prompt, max_tokens=max_tokens, use_cache=not urgent,
+                store_filter=cacheable)
             if response:
                 logger.info("Successfully received response from Gemini API")
                 return response
@@ -185,6 +219,164 @@ Formatting Focus:
             logger.error(f"Unexpected error in Gemini service: {str(e)}")
             return self._fallback_response(message, prompt_type)
 
+    def stream_support_response(self, message: str, context: Optional[Dict[str, Any]] = None, prompt_type: str = "empathetic_coach", mode: str = "coach", is_voice: bool = False, history: Optional[List[Any]] = None) -> Iterator[str]:
+        """
+        Generate a supportive response as a stream of text chunks
+
+        Same arguments as get_support_response. Uses Gemini's streaming API so the
+        first tokens can be relayed before the completion is finished.
+
+        Yields:
+            Response text chunks in order
+
+        Raises:
+            requests.exceptions.RequestException: If the stream breaks off
+                after the first chunk
+        """
+        started = time.monotonic()
+        first_chunk = True
+        try:
+            if not self.api_key:
+                yield self._fallback_response(message, prompt_type)
+                return
+
+            canned_response, full_prompt, max_tokens = self._prepare_support_prompt(
+                message, context, prompt_type, mode, is_voice, history)
+            if canned_response:
+                yield canned_response
+                return
+
+            for chunk in self._stream_gemini_api(full_prompt, max_tokens=max_tokens):
+                if first_chunk:
+                    self.ttft_stats.record(time.monotonic() - started)
+                    first_chunk = False
+                yield chunk
+
+            if first_chunk:
+                yield self._fallback_response(message, prompt_type)
+            else:
+                self.stream_stats.record(time.monotonic() - started)
+
+        except Exception as e:
+            logger.error(f"Unexpected error streaming Gemini response: {str(e)}")
+            if not first_chunk:
+                # Part of the reply is already out; let the caller know it is cut short
+                raise
+            yield self._fallback_response(message, prompt_type)
+
+    def get_streaming_stats(self) -> Dict[str, Any]:
+        """Time-to-first-token and full stream duration"""
+        return {
+            'time_to_first_token': self.ttft_stats.snapshot(),
+            'stream_duration': self.stream_stats.snapshot()
+        }
+
+    def _prepare_support_prompt(self, message: str, context: Optional[Dict[str, Any]], prompt_type: str, mode: str, is_voice: bool, history: Optional[List[Any]]) -> Tuple[Optional[str], Optional[str], int]:
+        """
+        Build the full support prompt
+
+        Returns:
+            Tuple of (canned response for simple greetings or None, full prompt, max output tokens)
+        """
+        # Handle simple greetings naturally
+        if self._is_simple_greeting(message):
+            if prompt_type == "direct_assistant":
+                return "Hello. What do you need help with?", None, 0
+            else:
+                return "Hi there! I'm here to help you navigate resources and support. What can I assist you with today?", None, 0
+
+        # Get local resources via RAG pipeline
+        rag_context = ""
+        if context and context.get('location'):
+            needs = self._extract_needs_from_message(message, context)
+            rag_results = rag_pipeline.retrieve_resources(
+                context.get('location'),
+                needs,
+                context.get('situation'),
+                message=message
+            )
+            rag_context = rag_pipeline.format_resources_for_gemini(
+                rag_results)
+            logger.info(
+                f"RAG retrieved {rag_results.get('total_resources', 0)} resources")
+
+        # Build the enhanced system prompt
+        system_prompt = self._build_enhanced_system_prompt(
+            context, rag_context, prompt_type, mode)
+
+        # Format conversation history
+        history_str = ""
+        if history:
+            for conv in history:
+                history_str += f"User: {conv.message}\n"
+                history_str += f"Assistant: {conv.response}\n"
+
+        # Create the full prompt
+        full_prompt = f"{system_prompt}\n\nCONVERSATION HISTORY:\n{history_str}\n\nUser message: {message}"
+
+        # Use different token limits based on input type
+        max_tokens = 800 if is_voice else 2000
+        return None, full_prompt, max_tokens
+
+    def respond_with_emotion_scores(self, message: str, context: Optional[Dict[str, Any]] = None, prompt_type: str = "empathetic_coach", mode: str = "coach", is_voice: bool = False, history: Optional[List[Any]] = None, scoring_timeout: Optional[float] = None, response_timeout: Optional[float] = None) -> Tuple[str, Dict[str, float]]:
+        """
+        Score emotions and generate the support response concurrently
+
+        Both LLM calls are submitted to the bounded executor at once and joined
+        against per-call deadlines measured from submission.
+
+        Args:
+            message: User's input message
+            context: Optional context information (user situation, location, etc.)
+            prompt_type: Either "empathetic_coach" or "direct_assistant"
+            mode: Either "coach" or "assistant"
+            is_voice: Whether this is a voice input (affects response length)
+            history: Optional list of previous Conversation objects
+            scoring_timeout: Seconds to wait for emotion scores before using fallback scores
+            response_timeout: Seconds to wait for the support response before using the fallback response
+
+        Returns:
+            Tuple of (response text, emotion scores)
+        """
+        if scoring_timeout is None:
+            scoring_timeout = Config.EMOTION_SCORING_TIMEOUT
+        if response_timeout is None:
+            response_timeout = Config.SUPPORT_RESPONSE_TIMEOUT
+
+        started = time.monotonic()
+        scores_future = self.executor.submit(self.score_emotional_state, message)
+
+        def pending_scores() -> Optional[Dict[str, Any]]:
+            # Caching a reply waits for the scores, never past the scoring deadline
+            try:
+                return scores_future.result(
+                    timeout=max(0.0, started + scoring_timeout - time.monotonic()))
+            except FutureTimeoutError:
+                return None
+
+        response_future = self.executor.submit(
+            self._generate_support_response, message, context, prompt_type, mode, is_voice, history, pending_scores)
+
+        try:
+            response = response_future.result(
+                timeout=max(0.0, started + response_timeout - time.monotonic()))
+        except FutureTimeoutError:
+            logger.warning(
+                f"Support response missed its {response_timeout}s deadline")
+            response_future.cancel()
+            response = self._fallback_response(message, prompt_type)
+
+        try:
+            emotion_scores = scores_future.result(
+                timeout=max(0.0, started + scoring_timeout - time.monotonic()))
+        except FutureTimeoutError:
+            logger.warning(
+                f"Emotion scoring missed its {scoring_timeout}s deadline")
+            scores_future.cancel()
+            emotion_scores = self._fallback_emotion_scores()
+
+        return response, emotion_scores
+
     def _build_enhanced_system_prompt(self, context: Optional[Dict[str, Any]] = None, rag_context: str = "", prompt_type: str = "empathetic_coach", mode: str = "coach") -> str:
         """Build enhanced system prompt with RAG context, prompt type, and mode"""
         prompts = self._get_system_prompts(mode)
@@ -220,34 +412,17 @@ Formatting Focus:
 
     def _extract_needs_from_message(self, message: str, context: Optional[Dict[str, Any]] = None) -> List[str]:
         """Extract needs/categories from user message"""
-        message_lower = message.lower()
-        needs = []
-
-        # Basic keyword matching
-        if any(word in message_lower for word in ['food', 'hungry', 'eat', 'meal', 'grocery']):
-            needs.append('food')
-        if any(word in message_lower for word in ['housing', 'shelter', 'homeless', 'place to stay', 'rent']):
-            needs.append('housing')
-        if any(word in message_lower for word in ['health', 'medical', 'doctor', 'clinic', 'sick']):
-            needs.append('health')
-        if any(word in message_lower for word in ['job', 'work', 'employment', 'income']):
-            needs.append('employment')
-        if any(word in message_lower for word in ['mental', 'therapy', 'counseling', 'depression', 'anxiety']):
-            needs.append('mental_health')
-        if any(word in message_lower for word in ['legal', 'lawyer', 'immigration', 'eviction']):
-            needs.append('legal')
+        needs = [GEMINI_NEED_LABELS.get(need, need) for need in intent_classifier.classify(message).needs]
 
         # Default to general if no specific needs detected
         if not needs:
-            needs = ['general']
+            needs = [GENERAL_NEED]
 
         # Add context-based needs
         if context and context.get('needs'):
-            context_needs = context['needs'].lower()
-            if 'food' in context_needs and 'food' not in needs:
-                needs.append('food')
-            if 'housing' in context_needs and 'housing' not in needs:
-                needs.append('housing')
+            context_needs = (GEMINI_NEED_LABELS.get(need, need)
+                             for need in intent_classifier.classify(context['needs']).needs)
+            needs.extend(need for need in context_needs if need not in needs)
 
         return needs
 
@@ -269,7 +444,8 @@ Formatting Focus:
             prompt = self._build_journal_analysis_prompt(
                 journal_text, user_context)
 
-            response = self._call_gemini_api(prompt)
+            response = self._call_gemini_api(
+                prompt, store_filter=self._is_cacheable_analysis)
             if response:
                 return self._parse_journal_analysis(response, journal_text)
             else:
@@ -297,7 +473,9 @@ Formatting Focus:
             prompt = self._build_conversation_summary_prompt(
                 messages, user_context)
 
-            response = self._call_gemini_api(prompt)
+            # A summary of a conversation with crisis language is never cached
+            urgent = any(self._is_urgent_message(message.get('content', '')) for message in messages)
+            response = self._call_gemini_api(prompt, use_cache=not urgent)
             if response:
                 return self._parse_conversation_summary(response, messages)
             else:
@@ -318,14 +496,28 @@ Formatting Focus:
             Dictionary with emotion scores (0-1 scale)
         """
         try:
+            if Config.EMOTION_ENGINE == 'lexicon':
+                return emotion_scorer.score(text)
+
             if not self.api_key:
                 return self._fallback_emotion_scores()
 
+            memo_key = None
+            if len(text) <= Config.EMOTION_MEMO_MAX_CHARS:
+                memo_key = normalize_message(text)
+                memoized = self.emotion_memo.get(memo_key)
+                if memoized is not None:
+                    return dict(memoized)
+
             prompt = self._build_emotion_scoring_prompt(text)
 
-            response = self._call_gemini_api(prompt)
+            response = self._call_gemini_api(
+                prompt, store_filter=self._is_cacheable_analysis)
             if response:
-                return self._parse_emotion_scores(response)
+                scores = self._parse_emotion_scores(response)
+                if memo_key is not None and not scores.get('fallback') and not self._is_high_urgency(scores):
+                    self.emotion_memo.set(memo_key, dict(scores))
+                return scores
             else:
                 return self._fallback_emotion_scores()
 
@@ -333,33 +525,182 @@ Formatting Focus:
             logger.error(f"Error scoring emotional state: {str(e)}")
             return self._fallback_emotion_scores()
 
-    def _call_gemini_api(self, prompt: str, max_tokens: int = 1024) -> Optional[str]:
-        """Make API call to Gemini"""
+    def score_emotional_state_batch(self, texts: List[str]) -> List[Dict[str, float]]:
+        """
+        Score many texts with as few API calls as possible
+
+        Texts are packed into chunks of up to EMOTION_BATCH_SIZE items (and
+        EMOTION_BATCH_MAX_CHARS characters) and each chunk is scored by a single
+        prompt returning a JSON array. A chunk whose output can't be parsed -
+        typically because it was cut off at the token limit - is split in half
+        and retried; single leftovers fall back to score_emotional_state. If
+        the API itself fails (network error, timeout, non-200), that chunk and
+        every later one get fallback scores rather than being retried.
+
+        Args:
+            texts: Texts to analyze
+
+        Returns:
+            List of emotion score dictionaries, in input order
+        """
+        if Config.EMOTION_ENGINE == 'lexicon':
+            return emotion_scorer.score_batch(texts)
+
+        if not self.api_key:
+            return [self._fallback_emotion_scores() for _ in texts]
+
+        results: List[Optional[Dict[str, float]]] = [None] * len(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            if len(text) <= Config.EMOTION_MEMO_MAX_CHARS:
+                memoized = self.emotion_memo.get(normalize_message(text))
+                if memoized is not None:
+                    results[i] = dict(memoized)
+                    continue
+            pending.append(i)
+
+        chunks = []
+        chunk = []
+        chunk_chars = 0
+        for i in pending:
+            if chunk and (len(chunk) >= Config.EMOTION_BATCH_SIZE or chunk_chars + len(texts[i]) > Config.EMOTION_BATCH_MAX_CHARS):
+                chunks.append(chunk)
+                chunk, chunk_chars = [], 0
+            chunk.append(i)
+            chunk_chars += len(texts[i])
+        if chunk:
+            chunks.append(chunk)
+
+        api_available = True
+        for chunk in chunks:
+            if api_available:
+                api_available = self._score_batch_chunk(texts, chunk, results)
+            else:
+                for i in chunk:
+                    results[i] = self._fallback_emotion_scores()
+
+        return results
+
+    def _score_batch_chunk(self, texts: List[str], indices: List[int], results: List[Optional[Dict[str, float]]]) -> bool:
+        """
+        Score one packed chunk, splitting it when the response can't be parsed
+
+        Returns:
+            False if the API call itself failed and the chunk got fallback scores
+        """
+        if len(indices) == 1:
+            results[indices[0]] = self.score_emotional_state(texts[indices[0]])
+            return True
+
+        prompt = self._build_batch_emotion_scoring_prompt(
+            [texts[i] for i in indices])
+        # Roughly 60 output tokens per scored item plus JSON framing
+        max_tokens = min(8192, 200 + 60 * len(indices))
+        response = self._call_gemini_api(
+            prompt, max_tokens=max_tokens, use_cache=False)
+
+        if response is None:
+            # Splitting would only repeat the failing call, each waiting out the timeout
+            logger.warning(
+                f"Emotion batch of {len(indices)} failed; using fallback scores")
+            for i in indices:
+                results[i] = self._fallback_emotion_scores()
+            return False
+
+        parsed = self._parse_batch_emotion_scores(response, len(indices))
+        if parsed is None:
+            logger.info(
+                f"Splitting emotion batch of {len(indices)} after unusable response")
+            middle = len(indices) // 2
+            if self._score_batch_chunk(texts, indices[:middle], results):
+                return self._score_batch_chunk(texts, indices[middle:], results)
+            for i in indices[middle:]:
+                results[i] = self._fallback_emotion_scores()
+            return False
+
+        for i, scores in zip(indices, parsed):
+            results[i] = scores
+            text = texts[i]
+            if len(text) <= Config.EMOTION_MEMO_MAX_CHARS and not self._is_high_urgency(scores):
+                self.emotion_memo.set(normalize_message(text), dict(scores))
+        return True
+
+    def _build_payload(self, prompt: str, max_tokens: int) -> Dict[str, Any]:
+        """Build the generateContent request body"""
+        return {
+            "contents": [{
+                "parts": [{
+                    "text": prompt
+                }]
+            }],
+            "generationConfig": {
+                "temperature": 0.3,
+                "topK": 40,
+                "topP": 0.95,
+                "maxOutputTokens": max_tokens,
+            }
+        }
+
+    def _is_urgent_message(self, message: str) -> bool:
+        """Check a message for crisis language"""
+        return intent_classifier.classify(message).crisis
+
+    def _is_high_urgency(self, scores: Optional[Dict[str, Any]]) -> bool:
+        """Check emotion scores (or a journal analysis) for high urgency"""
+        if not scores:
+            return False
+        if scores.get('urgency_level') == 'high':
+            return True
+        scores = scores.get('emotion_scores', scores)
+        threshold = Config.CACHE_URGENCY_THRESHOLD
+        return any(isinstance(scores.get(key), (int, float)) and scores[key] >= threshold
+                   for key in ('distress', 'anxiety'))
+
+    def _is_cacheable_analysis(self, response: str) -> bool:
+        """Only cache well-formed JSON analyses that are not high urgency"""
+        try:
+            response_clean = response.strip()
+            if response_clean.startswith('```json'):
+                response_clean = response_clean[7:-3]
+            elif response_clean.startswith('```'):
+                response_clean = response_clean[3:-3]
+            analysis = json.loads(response_clean)
+        except json.JSONDecodeError:
+            return False
+        return isinstance(analysis, dict) and not self._is_high_urgency(analysis)
+
+    def _call_gemini_api(self, prompt: str, max_tokens: int = 1024, use_cache: bool = True, store_filter: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """
+        Make API call to Gemini
+
+        Args:
+            prompt: Full prompt text
+            max_tokens: Output token limit
+            use_cache: Whether the response cache may be read and written
+            store_filter: Optional check on the completion; returning False keeps it out of the cache
+        """
         try:
             headers = {
                 "Content-Type": "application/json"
             }
 
-            payload = {
-                "contents": [{
-                    "parts": [{
-                        "text": prompt
-                    }]
-                }],
-                "generationConfig": {
-                    "temperature": 0.3,
-                    "topK": 40,
-                    "topP": 0.95,
-                    "maxOutputTokens": max_tokens,
-                }
-            }
+            payload = self._build_payload(prompt, max_tokens)
+
+            cache_key = None
+            if use_cache and self.response_cache is not None:
+                cache_key = make_cache_key(
+                    prompt, payload['generationConfig'])
+                cached = self.response_cache.get(cache_key)
+                if cached is not None:
+                    logger.info("Serving Gemini response from cache")
+                    return cached
 
             url = f"{self.api_url}?key={self.api_key}"
 
             logger.info("Sending request to Gemini API...")
 
-            response = requests.post(
-                url, headers=headers, json=payload, timeout=30)
+            response = self.http.post(
+                url, headers=headers, json=payload, timeout=Config.GEMINI_TIMEOUT)
 
             if response.status_code == 200:
                 response_data = response.json()
@@ -367,6 +708,8 @@ Formatting Focus:
                     content = response_data['candidates'][0]['content']['parts'][0]['text']
                     logger.info(
                         "Successfully received response from Gemini API")
+                    if cache_key and (store_filter is None or store_filter(content)):
+                        self.response_cache.set(cache_key, content)
                     return content
                 else:
                     logger.error("No candidates in Gemini response")
@@ -383,6 +726,48 @@ Formatting Focus:
             logger.error(f"Unexpected error calling Gemini API: {str(e)}")
             return None
 
+    def _stream_gemini_api(self, prompt: str, max_tokens: int = 1024) -> Iterator[str]:
+        """
+        Stream text chunks from Gemini's server-sent events endpoint
+
+        Yields nothing if the request fails up front; a failure after the
+        first chunk is re-raised so a truncated reply isn't mistaken for a
+        complete one.
+        """
+        headers = {
+            "Content-Type": "application/json"
+        }
+        payload = self._build_payload(prompt, max_tokens)
+        url = f"{self.stream_url}?alt=sse&key={self.api_key}"
+
+        logger.info("Opening streaming request to Gemini API...")
+
+        streamed = False
+        try:
+            with self.http.post(url, headers=headers, json=payload, timeout=Config.GEMINI_TIMEOUT, stream=True) as response:
+                if response.status_code != 200:
+                    logger.error(
+                        f"Gemini streaming error: {response.status_code} - {response.text}")
+                    return
+
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith('data:'):
+                        continue
+                    try:
+                        event = json.loads(line[5:].strip())
+                        parts = event['candidates'][0]['content']['parts']
+                    except (json.JSONDecodeError, KeyError, IndexError):
+                        continue
+                    for part in parts:
+                        if part.get('text'):
+                            streamed = True
+                            yield part['text']
+
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Network error streaming from Gemini API: {str(e)}")
+            if streamed:
+                raise
+
     def _build_journal_analysis_prompt(self, journal_text: str, user_context: Optional[Dict[str, Any]] = None) -> str:
         """Build prompt for journal entry analysis"""
         prompt = f"""Analyze this journal entry and provide insights in JSON format:
@@ -450,6 +835,58 @@ Respond with:
     "overall_sentiment": "positive|neutral|negative"
 }}"""
 
+    def _build_batch_emotion_scoring_prompt(self, texts: List[str]) -> str:
+        """Build one prompt scoring several texts"""
+        items = json.dumps([{"id": i, "text": text}
+                            for i, text in enumerate(texts)], ensure_ascii=False)
+        return f"""Score the emotional content of each text on a 0-1 scale and respond with ONLY a valid JSON array:
+
+Texts: {items}
+
+Respond with one object per text, in the same order, each containing:
+{{
+    "id": <id of the text>,
+    "distress": 0.0-1.0,
+    "hope": 0.0-1.0,
+    "motivation": 0.0-1.0,
+    "anxiety": 0.0-1.0,
+    "positivity": 0.0-1.0,
+    "overall_sentiment": "positive|neutral|negative"
+}}"""
+
+    def _parse_batch_emotion_scores(self, response: str, expected: int) -> Optional[List[Dict[str, float]]]:
+        """Parse a batch scoring response; None if it is malformed or incomplete"""
+        try:
+            response_clean = response.strip()
+            if response_clean.startswith('```json'):
+                response_clean = response_clean[7:-3]
+            elif response_clean.startswith('```'):
+                response_clean = response_clean[3:-3]
+
+            items = json.loads(response_clean)
+        except json.JSONDecodeError:
+            return None
+
+        if not isinstance(items, list):
+            return None
+
+        by_id = {}
+        for item in items:
+            if isinstance(item, dict) and isinstance(item.get('id'), int):
+                by_id[item['id']] = item
+
+        results = []
+        for i in range(expected):
+            item = by_id.get(i)
+            if item is None:
+                return None
+            scores = {key: value for key, value in item.items() if key != 'id'}
+            for key, value in scores.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    scores[key] = max(0.0, min(1.0, float(value)))
+            results.append(scores)
+        return results
+
     def _parse_journal_analysis(self, response: str, original_text: str) -> Dict[str, Any]:
         """Parse journal analysis response"""
         try:
@@ -518,31 +955,24 @@ Respond with:
 
     def _fallback_analysis(self, journal_text: str) -> Dict[str, Any]:
         """Fallback analysis when Gemini is unavailable"""
-        # Simple keyword-based analysis
-        text_lower = journal_text.lower()
-
-        distress_words = ['sad', 'depressed', 'anxious', 'worried',
-                          'scared', 'hopeless', 'difficult', 'hard', 'struggle']
-        hope_words = ['better', 'hope', 'improve', 'positive',
-                      'good', 'happy', 'grateful', 'thankful']
-
-        distress_score = sum(
-            1 for word in distress_words if word in text_lower) / len(distress_words)
-        hope_score = sum(
-            1 for word in hope_words if word in text_lower) / len(hope_words)
+        # Local lexicon-based scoring
+        scores = emotion_scorer.score(journal_text)
+        distress = scores['distress']
+        urgency_level = "high" if distress >= Config.CACHE_URGENCY_THRESHOLD else (
+            "medium" if distress >= 0.5 else "low")
 
         return {
             "emotion_scores": {
-                "distress": min(distress_score, 1.0),
-                "hope": min(hope_score, 1.0),
-                "motivation": 0.5,
-                "anxiety": min(distress_score * 0.8, 1.0),
-                "positivity": min(hope_score * 1.2, 1.0)
+                "distress": distress,
+                "hope": scores['hope'],
+                "motivation": scores['motivation'],
+                "anxiety": scores['anxiety'],
+                "positivity": scores['positivity']
             },
             "key_themes": ["personal reflection"],
             "insights": "Journal entry reflects personal thoughts and experiences",
             "suggestions": "Continue journaling to track your emotional journey",
-            "urgency_level": "low",
+            "urgency_level": urgency_level,
             "timestamp": datetime.now().isoformat(),
             "original_text_length": len(journal_text),
             "fallback": True
@@ -579,9 +1009,24 @@ Respond with:
 gemini_service = GeminiService()
 
 
-def get_support_response(message: str, context: Optional[Dict[str, Any]] = None, prompt_type: str = "empathetic_coach", mode: str = "coach", is_voice: bool = False, history: Optional[List[Any]] = None) -> str:
+def score_emotional_state_batch(texts: List[str]) -> List[Dict[str, float]]:
+    """Main function to score many texts with batched API calls"""
+    return gemini_service.score_emotional_state_batch(texts)
+
+
+def get_support_response(message: str, context: Optional[Dict[str, Any]] = None, prompt_type: str = "empathetic_coach", mode: str = "coach", is_voice: bool = False, history: Optional[List[Any]] = None, emotion_scores: Optional[Dict[str, Any]] = None) -> str:
     """Main function to get support responses"""
-    return gemini_service.get_support_response(message, context, prompt_type, mode, is_voice, history)
+    return gemini_service.get_support_response(message, context, prompt_type, mode, is_voice, history, emotion_scores)
+
+
+def stream_support_response(message: str, context: Optional[Dict[str, Any]] = None, prompt_type: str = "empathetic_coach", mode: str = "coach", is_voice: bool = False, history: Optional[List[Any]] = None) -> Iterator[str]:
+    """Main function to stream support responses chunk by chunk"""
+    return gemini_service.stream_support_response(message, context, prompt_type, mode, is_voice, history)
+
+
+def respond_with_emotion_scores(message: str, context: Optional[Dict[str, Any]] = None, prompt_type: str = "empathetic_coach", mode: str = "coach", is_voice: bool = False, history: Optional[List[Any]] = None) -> Tuple[str, Dict[str, float]]:
+    """Main function to get a support response and emotion scores concurrently"""
+    return gemini_service.respond_with_emotion_scores(message, context, prompt_type, mode, is_voice, history)
 
 
 def analyze_journal_entry(journal_text: str, user_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
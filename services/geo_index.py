@@ -0,0 +1,117 @@
+# Geospatial index - k-nearest resource lookup from a user's location
+
+import heapq
+import math
+from typing import List, Optional, Tuple
+from .gazetteer import gazetteer
+
+EARTH_RADIUS_MILES = 3958.8
+
+
+def haversine_miles(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in miles"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+
+
+def geocode(location: str) -> Optional[Tuple[float, float]]:
+    """Resolve free-text location to (lat, lon) via the offline gazetteer"""
+    place = gazetteer.resolve(location)
+    return (place.lat, place.lon) if place else None
+
+
+class GeoIndex:
+    """
+    KD-tree over (lat, lon) points for k-nearest-neighbour queries
+
+    Points are stored as 3-d positions on a sphere of Earth's radius. Straight
+    chord length grows monotonically with great-circle distance, so a plain
+    Euclidean KD-tree gives exact nearest neighbours; returned distances are
+    haversine miles.
+    """
+
+    def __init__(self, points: List[Tuple[float, float]], ids: Optional[List[int]] = None):
+        """
+        Args:
+            points: (lat, lon) pairs
+            ids: Caller IDs for each point, defaulting to their positions
+        """
+        self.points = points
+        self.ids = ids if ids is not None else list(range(len(points)))
+        self._xyz = [self._project(lat, lon) for lat, lon in points]
+        # Node layout: (point position, axis, left child, right child)
+        self._root = self._build(list(range(len(points))), 0)
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    @staticmethod
+    def _project(lat: float, lon: float) -> Tuple[float, float, float]:
+        phi, lam = math.radians(lat), math.radians(lon)
+        return (EARTH_RADIUS_MILES * math.cos(phi) * math.cos(lam),
+                EARTH_RADIUS_MILES * math.cos(phi) * math.sin(lam),
+                EARTH_RADIUS_MILES * math.sin(phi))
+
+    def _build(self, positions: List[int], depth: int):
+        if not positions:
+            return None
+        axis = depth % 3
+        positions.sort(key=lambda p: self._xyz[p][axis])
+        middle = len(positions) // 2
+        return (positions[middle], axis,
+                self._build(positions[:middle], depth + 1),
+                self._build(positions[middle + 1:], depth + 1))
+
+    def nearest(self, lat: float, lon: float, k: int = 5,
+                max_distance_miles: Optional[float] = None) -> List[Tuple[float, int]]:
+        """
+        The k points closest to (lat, lon)
+
+        Args:
+            lat, lon: Query location
+            k: Number of neighbours
+            max_distance_miles: Optional search radius
+
+        Returns:
+            (distance in miles, id) pairs, closest first
+        """
+        if not self._root or k <= 0:
+            return []
+
+        query = self._project(lat, lon)
+        # Max-heap of (-chord length², position) holding the best k so far
+        best: List[Tuple[float, int]] = []
+        if max_distance_miles is not None:
+            chord = 2 * EARTH_RADIUS_MILES * math.sin(
+                min(max_distance_miles / (2 * EARTH_RADIUS_MILES), math.pi / 2))
+            limit_sq = chord * chord
+        else:
+            limit_sq = math.inf
+
+        def visit(node):
+            position, axis, left, right = node
+            point = self._xyz[position]
+            dist_sq = ((point[0] - query[0]) ** 2 + (point[1] - query[1]) ** 2
+                       + (point[2] - query[2]) ** 2)
+            if dist_sq <= limit_sq:
+                if len(best) < k:
+                    heapq.heappush(best, (-dist_sq, position))
+                elif dist_sq < -best[0][0]:
+                    heapq.heapreplace(best, (-dist_sq, position))
+
+            delta = query[axis] - point[axis]
+            near, far = (left, right) if delta < 0 else (right, left)
+            if near:
+                visit(near)
+            bound = limit_sq if len(best) < k else min(limit_sq, -best[0][0])
+            if far and delta * delta <= bound:
+                visit(far)
+
+        visit(self._root)
+
+        results = [(haversine_miles(lat, lon, *self.points[position]), self.ids[position])
+                   for _, position in best]
+        return sorted(results)
@@ -0,0 +1,108 @@
+# Pooled HTTP client - keep-alive connections shared across API calls
+
+import logging
+import socket
+import threading
+from typing import Dict, Any
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter that enables TCP keep-alive on every pooled socket"""
+
+    def __init__(self, keepalive: bool = True, **kwargs):
+        self.keepalive = keepalive
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        if self.keepalive:
+            from urllib3.connection import HTTPConnection
+            pool_kwargs['socket_options'] = HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            ]
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+
+class PooledHTTPClient:
+    """Thread-safe HTTP client backed by a pooled, keep-alive requests.Session"""
+
+    def __init__(self, pool_connections: int = 4, pool_maxsize: int = 10, pool_block: bool = False, keepalive: bool = True):
+        """
+        Args:
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum open connections kept per host
+            pool_block: Block when a host's pool is exhausted instead of opening extra connections
+            keepalive: Send keep-alive headers and enable TCP keep-alive
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keepalive = keepalive
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+
+        self.session = requests.Session()
+        self.adapter = _KeepAliveAdapter(
+            keepalive=keepalive,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block)
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        if keepalive:
+            self.session.headers['Connection'] = 'keep-alive'
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """POST through the shared pool, counting requests and failures"""
+        try:
+            response = self.session.post(url, **kwargs)
+        except requests.exceptions.RequestException:
+            with self._lock:
+                self._errors += 1
+            raise
+        with self._lock:
+            self._requests += 1
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Connection reuse counters aggregated over every host pool"""
+        new_connections = 0
+        pooled_requests = 0
+        hosts = 0
+
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            hosts += 1
+            new_connections += pool.num_connections
+            pooled_requests += pool.num_requests
+
+        with self._lock:
+            total_requests = self._requests
+            errors = self._errors
+
+        reused = max(0, pooled_requests - new_connections)
+        return {
+            'requests': total_requests,
+            'errors': errors,
+            'new_connections': new_connections,
+            'reused_connections': reused,
+            'reuse_ratio': round(reused / pooled_requests, 3) if pooled_requests else 0.0,
+            'hosts': hosts,
+            'pool_connections': self.pool_connections,
+            'pool_maxsize': self.pool_maxsize,
+            'pool_block': self.pool_block,
+            'keepalive': self.keepalive
+        }
+
+    def close(self):
+        """Close every pooled connection"""
+        self.session.close()
+
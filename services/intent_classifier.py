@@ -0,0 +1,183 @@
+# Intent classifier - needs, greetings and crisis language in one regex pass
+
+import re
+from collections import namedtuple
+from typing import Dict, List, Iterable, Optional, Tuple
+
+# Need label -> terms. Terms match from the start of a word, so "meal" also
+# finds "meals" but "eat" no longer fires inside "great" or "rent" inside
+# "parent". Terms in WHOLE_WORD_TERMS must match a whole word.
+NEED_TERMS = {
+    'food': ['food', 'hungry', 'eat', 'meal', 'grocer'],
+    'shelter': ['shelter', 'housing', 'homeless', 'place to stay', 'rent', 'sleep', 'bed', 'beds'],
+    'healthcare': ['health', 'medical', 'doctor', 'clinic', 'sick'],
+    'mental_health': ['mental', 'therapy', 'counseling', 'depression', 'anxiety'],
+    'employment': ['job', 'work', 'works', 'working', 'employment', 'career', 'income'],
+    'legal': ['legal', 'lawyer', 'immigration', 'evict']
+}
+
+# Resource category each need is served from (legal aid has no catalogue yet)
+RESOURCE_CATEGORIES = {
+    'food': 'food',
+    'shelter': 'shelter',
+    'healthcare': 'healthcare',
+    'mental_health': 'healthcare',
+    'employment': 'employment'
+}
+
+# Greetings must match whole words: "hi" is not a greeting inside "this",
+# nor "sup" inside "support"
+GREETING_TERMS = ['hi', 'hello', 'hey', 'good morning', 'good afternoon',
+                  'good evening', 'sup', "what's up"]
+
+# Messages containing these are flagged for review and never answered from
+# (or stored in) the response cache
+CRISIS_TERMS = ['hurt', 'hurts', 'hurting', 'unsafe', 'no home', 'suicidal', 'kill myself',
+                'end it all', 'want to die', 'hopeless', 'nowhere to go']
+
+# Need and crisis terms that are also the start of unrelated words: "bed"
+# in "bedroom", "work" in "workout", "hurt" in "hurtful", "no home" in
+# "no homework". Their wanted inflections are listed as terms of their own.
+WHOLE_WORD_TERMS = frozenset(['bed', 'beds', 'work', 'works', 'working',
+                              'hurt', 'hurts', 'hurting', 'no home'])
+
+# A simple greeting is a greeting term in a message of at most this many words
+GREETING_MAX_WORDS = 3
+
+Intents = namedtuple('Intents', ['needs', 'greeting', 'crisis', 'crisis_terms'])
+
+_WORD_CHAR = re.compile(r'\w')
+_WORD_START = re.compile(r'(?<!\w)\w')
+
+
+def _contains_term_at_word_start(term: str, terms: Iterable[str]) -> bool:
+    """Whether another term begins at a word start inside this one"""
+    for match in _WORD_START.finditer(term, 1):
+        rest = term[match.start():]
+        if any(rest.startswith(other) or other.startswith(rest) for other in terms):
+            return True
+    return False
+
+
+def _trie_pattern(node: Dict) -> str:
+    """
+    Regex for a character trie, children before the end of a term
+
+    Sibling branches start with distinct characters, so the engine follows a
+    single path per position and the first match found is the longest term.
+    """
+    branches = [re.escape(char) + _trie_pattern(child)
+                for char, child in sorted(node.items()) if char != '']
+    if '' in node:
+        # A whole-word term needs a boundary after it; a prefix term does not
+        branches.append(node[''])
+    if len(branches) == 1:
+        return branches[0]
+    return '(?:' + '|'.join(branches) + ')'
+
+
+class IntentClassifier:
+    """
+    Finds every vocabulary term in a message with one compiled regex
+
+    All terms share one trie-shaped alternation anchored at word starts, so
+    one ``finditer`` sweep over the message reports the longest term
+    starting at each word. Shorter terms sharing that start (e.g. "health"
+    under "healthcare") are folded in ahead of time, and the pattern is
+    wrapped in a lookahead only when one term can begin inside another, so
+    no term is missed.
+    """
+
+    def __init__(self, need_terms: Dict[str, List[str]] = None,
+                 greeting_terms: Iterable[str] = None,
+                 crisis_terms: Iterable[str] = None,
+                 whole_word_terms: Iterable[str] = None):
+        need_terms = NEED_TERMS if need_terms is None else need_terms
+        greeting_terms = GREETING_TERMS if greeting_terms is None else greeting_terms
+        crisis_terms = CRISIS_TERMS if crisis_terms is None else crisis_terms
+        whole_word_terms = frozenset(term.lower() for term in (
+            WHOLE_WORD_TERMS if whole_word_terms is None else whole_word_terms))
+        self.need_order = list(need_terms)
+
+        # term -> (labels, whole_word)
+        terms: Dict[str, Tuple[set, bool]] = {}
+
+        def add(term: str, label: str, whole_word: bool):
+            labels, whole = terms.get(term.lower(), (set(), True))
+            labels.add(label)
+            terms[term.lower()] = (labels, whole and whole_word)
+
+        for need, words in need_terms.items():
+            for word in words:
+                add(word, 'need:' + need, word.lower() in whole_word_terms)
+        for word in greeting_terms:
+            add(word, 'greeting', True)
+        for word in crisis_terms:
+            add(word, 'crisis:' + word.lower(), word.lower() in whole_word_terms)
+
+        # Labels reported for a match: the term's own plus those of every
+        # shorter term the match also satisfies
+        self._labels: Dict[str, frozenset] = {}
+        for term in terms:
+            labels = set()
+            for other, (other_labels, whole_word) in terms.items():
+                if not term.startswith(other):
+                    continue
+                if whole_word and len(other) < len(term) and _WORD_CHAR.match(term[len(other)]):
+                    continue
+                labels |= other_labels
+            self._labels[term] = frozenset(labels)
+
+        trie: Dict = {}
+        for term, (_, whole_word) in terms.items():
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[''] = r'\b' if whole_word else ''
+        pattern = _trie_pattern(trie) if trie else None
+        if pattern and any(_WORD_START.search(term, 1) and _contains_term_at_word_start(term, terms)
+                           for term in terms):
+            # Some term starts inside another: match in a lookahead so the
+            # sweep does not step over it
+            self._pattern = re.compile(r'(?=(?<!\w)(' + pattern + '))')
+        elif pattern:
+            self._pattern = re.compile(r'(?<!\w)(' + pattern + ')')
+        else:
+            self._pattern = None
+
+    def matches(self, text: str) -> List[str]:
+        """Every term found in the text, in order of position"""
+        if not text or self._pattern is None:
+            return []
+        return [match.group(1) for match in self._pattern.finditer(text.lower())]
+
+    def classify(self, text: Optional[str]) -> Intents:
+        """
+        Needs, greeting and crisis flags for a message in one pass
+
+        Returns:
+            Intents with needs in vocabulary order, whether the message is a
+            simple greeting, whether it contains crisis language, and which
+            crisis terms matched
+        """
+        labels = set()
+        for term in self.matches(text):
+            labels |= self._labels[term]
+
+        needs = tuple(need for need in self.need_order if 'need:' + need in labels)
+        crisis_terms = tuple(sorted(label[7:] for label in labels if label.startswith('crisis:')))
+        # A crisis message is never answered as a simple greeting
+        greeting = 'greeting' in labels and not crisis_terms and len(text.split()) <= GREETING_MAX_WORDS
+        return Intents(needs, greeting, bool(crisis_terms), crisis_terms)
+
+    def resource_category(self, text: str, default: Optional[str] = 'food') -> Optional[str]:
+        """Resource category for the first need found in the text"""
+        for need in self.classify(text).needs:
+            category = RESOURCE_CATEGORIES.get(need)
+            if category:
+                return category
+        return default
+
+
+# Global classifier instance
+intent_classifier = IntentClassifier()
@@ -1,859 +1,113 @@
 # Custom RAG pipeline for nearby resources
 
+import heapq
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+import time
+from typing import Dict, List, Any, Optional, Tuple
 import json
 from datetime import datetime
+from config import Config
+from .gazetteer import gazetteer
+from .geo_index import geocode, haversine_miles
+from .intent_classifier import intent_classifier
+from .resource_loader import ResourceSnapshot, ResourceWatcher, build_resource_snapshot
+from utils.metrics import LatencyStats
 
 logger = logging.getLogger(__name__)
 
+# Retrieval stages timed for the admin metrics
+STAGES = ('normalize', 'lookup', 'rank', 'format')
+
+# Need sent when no specific need was recognised in the message
+GENERAL_NEED = 'general'
+
 
 class RAGPipeline:
     """RAG Pipeline for retrieving local resources based on user context"""
 
-    def __init__(self):
-        # In a real implementation, this would connect to external APIs
-        # For now, we'll use a comprehensive local database
-        self.resource_database = self._initialize_resource_database()
+    def __init__(self, source_path: str = None, store_path: str = None):
+        """
+        Args:
+            source_path: Editable JSON resource catalogue
+            store_path: Compiled SQLite store built from the catalogue
+        """
+        self.source_path = source_path or Config.RESOURCE_DATA_PATH
+        self.store_path = store_path or Config.RESOURCE_STORE_PATH
+        self.snapshot = build_resource_snapshot(
+            self.source_path, self.store_path, mmap_size=Config.RESOURCE_STORE_MMAP_SIZE,
+            ranking_cache_size=Config.RAG_RANKING_CACHE_SIZE,
+            embedding_dim=Config.RAG_EMBEDDING_DIM)
+        self.watcher: Optional[ResourceWatcher] = None
+
+        self.stage_stats = {stage: LatencyStats() for stage in STAGES}
+
+        self._reload_lock = threading.Lock()
+        self._reloads = 0
+        self._reload_failures = 0
+        self._last_reload_error = None
+
+    def reload(self) -> bool:
+        """
+        Rebuild the store and indexes from the data file and swap them in
+
+        The new snapshot is built completely before a single reference
+        assignment publishes it; calls already running keep the snapshot they
+        started with, and the old store closes once the last of them is done.
+        On failure the current snapshot stays in place.
 
-    def _initialize_resource_database(self) -> Dict[str, List[Dict]]:
-        """Initialize a comprehensive resource database"""
+        Returns:
+            True if a new snapshot was published
+        """
+        with self._reload_lock:
+            try:
+                snapshot = build_resource_snapshot(
+                    self.source_path, self.store_path, version=self.snapshot.version + 1,
+                    mmap_size=Config.RESOURCE_STORE_MMAP_SIZE,
+                    ranking_cache_size=Config.RAG_RANKING_CACHE_SIZE,
+                    embedding_dim=Config.RAG_EMBEDDING_DIM)
+            except Exception as e:
+                self._reload_failures += 1
+                self._last_reload_error = str(e)
+                logger.error(f"Resource reload failed, keeping current data: {str(e)}")
+                return False
+
+            self.snapshot = snapshot
+            self._reloads += 1
+            self._last_reload_error = None
+            logger.info(
+                f"Resource data reloaded: version {snapshot.version}, {len(snapshot.resource_index)} resources")
+            return True
+
+    def start_watcher(self, interval: float = None):
+        """Reload in the background whenever the data file changes"""
+        if self.watcher is None:
+            self.watcher = ResourceWatcher(
+                self.source_path, self.reload,
+                interval=interval if interval is not None else Config.RESOURCE_RELOAD_INTERVAL)
+            self.watcher.start()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current snapshot size plus reload counters"""
         return {
-            "san_francisco": {
-                "food": [
-                    {
-                        "name": "SF-Marin Food Bank",
-                        "address": "900 Pennsylvania Ave, San Francisco, CA 94107",
-                        "phone": "(415) 282-1900",
-                        "hours": "Mon-Fri 9am-5pm",
-                        "services": ["Food pantry", "Emergency food boxes"],
-                        "requirements": "No documentation required",
-                        "distance": 0.8
-                    },
-                    {
-                        "name": "Glide Memorial Church",
-                        "address": "330 Ellis Street, San Francisco, CA 94102",
-                        "phone": "(415) 674-6000",
-                        "hours": "Daily meals: 8am, 12pm, 4pm",
-                        "services": ["Free meals", "Food pantry"],
-                        "requirements": "None",
-                        "distance": 1.2
-                    },
-                    {
-                        "name": "St. Anthony's Dining Room",
-                        "address": "150 Golden Gate Ave, San Francisco, CA 94102",
-                        "phone": "(415) 592-2710",
-                        "hours": "Mon-Fri 11:30am-12:30pm",
-                        "services": ["Free lunch", "Groceries"],
-                        "requirements": "None",
-                        "distance": 1.0
-                    }
-                ],
-                "shelter": [
-                    {
-                        "name": "MSC South Shelter",
-                        "address": "525 5th Street, San Francisco, CA 94107",
-                        "phone": "(415) 597-7960",
-                        "hours": "24/7",
-                        "services": ["Emergency shelter", "Case management"],
-                        "requirements": "Walk-in services available",
-                        "beds_available": 45,
-                        "distance": 0.5
-                    },
-                    {
-                        "name": "Next Door Shelter",
-                        "address": "1001 Polk Street, San Francisco, CA 94109",
-                        "phone": "(415) 487-3300",
-                        "hours": "Intake: 4pm-1am",
-                        "services": ["Overnight shelter", "Meals", "Showers"],
-                        "requirements": "Check-in required",
-                        "beds_available": 32,
-                        "distance": 1.1
-                    },
-                    {
-                        "name": "Hamilton Family Center",
-                        "address": "260 Golden Gate Ave, San Francisco, CA 94102",
-                        "phone": "(415) 292-0870",
-                        "hours": "24/7",
-                        "services": ["Family shelter", "Childcare", "Job training"],
-                        "requirements": "Families with children",
-                        "beds_available": 18,
-                        "distance": 0.9
-                    }
-                ],
-                "healthcare": [
-                    {
-                        "name": "HealthRIGHT 360",
-                        "address": "1563 Mission Street, San Francisco, CA 94103",
-                        "phone": "(415) 762-3700",
-                        "hours": "Mon-Fri 8am-5pm",
-                        "services": ["Primary care", "Mental health", "Substance abuse"],
-                        "requirements": "Sliding scale fees",
-                        "distance": 0.7
-                    },
-                    {
-                        "name": "SF City Clinic",
-                        "address": "356 7th Street, San Francisco, CA 94103",
-                        "phone": "(415) 487-5500",
-                        "hours": "Mon-Thu 8am-4pm, Fri 8am-12pm",
-                        "services": ["STD testing", "HIV testing", "Vaccinations"],
-                        "requirements": "Free services",
-                        "distance": 0.6
-                    }
-                ],
-                "employment": [
-                    {
-                        "name": "SF Works Career Center",
-                        "address": "801 Turk Street, San Francisco, CA 94102",
-                        "phone": "(415) 701-4848",
-                        "hours": "Mon-Fri 9am-5pm",
-                        "services": ["Job placement", "Resume help", "Skills training"],
-                        "requirements": "None",
-                        "distance": 1.3
-                    }
-                ]
-            },
-            "oakland": {
-                "food": [
-                    {
-                        "name": "Alameda County Community Food Bank",
-                        "address": "7900 Edgewater Dr, Oakland, CA 94621",
-                        "phone": "(510) 635-3663",
-                        "hours": "Mon-Fri 9am-4pm",
-                        "services": ["Food pantry", "Mobile food pantry"],
-                        "requirements": "No documentation required",
-                        "distance": 2.1
-                    }
-                ],
-                "shelter": [
-                    {
-                        "name": "Henry Robinson Multi Service Center",
-                        "address": "3801 Martin Luther King Jr Way, Oakland, CA 94609",
-                        "phone": "(510) 597-5085",
-                        "hours": "24/7",
-                        "services": ["Emergency shelter", "Transitional housing"],
-                        "requirements": "Intake assessment required",
-                        "beds_available": 67,
-                        "distance": 1.8
-                    },
-                    {
-                        "name": "Covenant House California - Oakland",
-                        "address": "1695 Depot Rd, Oakland, CA",
-                        "phone": "510-829-8224",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 25,
-                        "distance": None
-                    },
-                    {
-                        "name": "Henry Robinson Center",
-                        "address": "1026 Mission Blvd, Oakland, CA",
-                        "phone": "510-266-2724",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 137,
-                        "distance": None
-                    },
-                    {
-                        "name": "The Holland",
-                        "address": "2419 Castro St, Oakland, CA",
-                        "phone": "510-785-9245",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 90,
-                        "distance": None
-                    },
-                    {
-                        "name": "Oakland Elizabeth House",
-                        "address": "3371 Depot Rd, Oakland, CA",
-                        "phone": "510-863-8125",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 26,
-                        "distance": None
-                    },
-                    {
-                        "name": "East Oakland Community Project",
-                        "address": "9941 University Ave, Oakland, CA",
-                        "phone": "510-990-4919",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 18,
-                        "distance": None
-                    },
-                    {
-                        "name": "St. Mary's Center - Closer to Home",
-                        "address": "4835 Broadway, Oakland, CA",
-                        "phone": "510-478-1593",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 8,
-                        "distance": None
-                    },
-                    {
-                        "name": "St. Mary's Center - Presentation House",
-                        "address": "8931 Ashby Ave, Oakland, CA",
-                        "phone": "510-465-5451",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 8,
-                        "distance": None
-                    },
-                    {
-                        "name": "St. Mary's Center - Friendly Manor",
-                        "address": "362 Shattuck Ave, Oakland, CA",
-                        "phone": "510-546-1983",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 8,
-                        "distance": None
-                    },
-                    {
-                        "name": "Salvation Army Oakland Garden Center",
-                        "address": "5801 Depot Rd, Oakland, CA",
-                        "phone": "510-842-5596",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 45,
-                        "distance": None
-                    },
-                    {
-                        "name": "Operation Dignity Veterans Housing",
-                        "address": "1267 Castro St, Oakland, CA",
-                        "phone": "510-516-8732",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 32,
-                        "distance": None
-                    },
-                    {
-                        "name": "BOSS Oakland Emergency Shelter",
-                        "address": "4715 Telegraph Ave, Oakland, CA",
-                        "phone": "510-910-3574",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 28,
-                        "distance": None
-                    },
-                    {
-                        "name": "Matilda Cleveland Transitional Housing",
-                        "address": "216 Mission Blvd, Oakland, CA",
-                        "phone": "510-560-3421",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 35,
-                        "distance": None
-                    },
-                    {
-                        "name": "Building Futures Women's Center",
-                        "address": "7354 International Blvd, Oakland, CA",
-                        "phone": "510-859-4263",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 22,
-                        "distance": None
-                    },
-                    {
-                        "name": "Family Front Door",
-                        "address": "6488 Ashby Ave, Oakland, CA",
-                        "phone": "510-944-2006",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 15,
-                        "distance": None
-                    },
-                    {
-                        "name": "Oakland Winter Relief Center",
-                        "address": "3607 Shattuck Ave, Oakland, CA",
-                        "phone": "510-393-1870",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 50,
-                        "distance": None
-                    },
-                    {
-                        "name": "Centro Legal de la Raza Housing",
-                        "address": "5956 Castro St, Oakland, CA",
-                        "phone": "510-468-8245",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 12,
-                        "distance": None
-                    },
-                    {
-                        "name": "Davis Street Family Resource Center",
-                        "address": "8236 Mission Blvd, Oakland, CA",
-                        "phone": "510-951-2562",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 18,
-                        "distance": None
-                    },
-                    {
-                        "name": "Women's Daytime Drop-in Oakland",
-                        "address": "9821 Thornton Ave, Oakland, CA",
-                        "phone": "510-623-9396",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 20,
-                        "distance": None
-                    },
-                    {
-                        "name": "Crossroads Emergency Housing",
-                        "address": "7411 University Ave, Oakland, CA",
-                        "phone": "510-872-9069",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 125,
-                        "distance": None
-                    },
-                    {
-                        "name": "Alameda Family Services Shelter",
-                        "address": "6136 Telegraph Ave, Oakland, CA",
-                        "phone": "510-554-6176",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 16,
-                        "distance": None
-                    },
-                    {
-                        "name": "Bay Area Rescue Mission Oakland",
-                        "address": "9731 Center St, Oakland, CA",
-                        "phone": "510-751-8445",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 60,
-                        "distance": None
-                    },
-                    {
-                        "name": "Safe Haven Transitional Housing",
-                        "address": "478 International Blvd, Oakland, CA",
-                        "phone": "510-843-4933",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 24,
-                        "distance": None
-                    },
-                    {
-                        "name": "Unity Council Emergency Housing",
-                        "address": "6207 University Ave, Oakland, CA",
-                        "phone": "510-402-7664",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 14,
-                        "distance": None
-                    },
-                    {
-                        "name": "Aurora Housing Program",
-                        "address": "8293 Depot Rd, Oakland, CA",
-                        "phone": "510-908-9834",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 30,
-                        "distance": None
-                    },
-                    {
-                        "name": "Oakland Interfaith Housing",
-                        "address": "170 International Blvd, Oakland, CA",
-                        "phone": "510-696-7083",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 22,
-                        "distance": None
-                    },
-                    {
-                        "name": "Emergency Food & Shelter Oakland",
-                        "address": "2788 Center St, Oakland, CA",
-                        "phone": "510-612-3823",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 40,
-                        "distance": None
-                    },
-                    {
-                        "name": "New Hope Housing Services",
-                        "address": "6799 Telegraph Ave, Oakland, CA",
-                        "phone": "510-959-8409",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 18,
-                        "distance": None
-                    },
-                    {
-                        "name": "Community Housing Partnership",
-                        "address": "485 San Pablo Ave, Oakland, CA",
-                        "phone": "510-633-1274",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 35,
-                        "distance": None
-                    },
-                    {
-                        "name": "Friendship Bench Emergency Shelter",
-                        "address": "2088 San Pablo Ave, Oakland, CA",
-                        "phone": "510-825-5347",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 25,
-                        "distance": None
-                    },
-                    {
-                        "name": "PATH Oakland Emergency Housing",
-                        "address": "2062 San Pablo Ave, Oakland, CA",
-                        "phone": "510-816-7250",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 20,
-                        "distance": None
-                    },
-                    {
-                        "name": "Transitional Age Youth Program",
-                        "address": "4108 International Blvd, Oakland, CA",
-                        "phone": "510-386-5898",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 16,
-                        "distance": None
-                    },
-                    {
-                        "name": "OCCUR Emergency Shelter",
-                        "address": "7090 Ashby Ave, Oakland, CA",
-                        "phone": "510-244-8082",
-                        "hours": None,
-                        "services": [],
-                        "requirements": None,
-                        "beds_available": 28,
-                        "distance": None
-                    }
-                ],
-                "healthcare": [
-                    {
-                        "name": "Louisa Abada",
-                        "address": "1727 Martin Luther King Jr Way, Oakland, CA 94612-1327",
-                        "phone": "510-893-9230",
-                        "services": [
-                            "Mental health assessment",
-                            "Social services coordination"
-                        ],
-                        "requirements": "17 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Zena Abdallah",
-                        "address": "8601 MacArthur Blvd, Oakland, CA 94605-4037",
-                        "phone": "510-844-5369",
-                        "services": [
-                            "Trauma therapy"
-                        ],
-                        "requirements": "4 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Rachel Adams",
-                        "address": "2633 E 27th St, Oakland, CA 94601-1912",
-                        "phone": "510-536-8111",
-                        "services": [
-                            "Substance abuse counseling",
-                            "Trauma therapy"
-                        ],
-                        "requirements": "5 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Neal Adams",
-                        "address": "5751 Adeline St, Oakland, CA 94608-2815",
-                        "phone": "510-467-4250",
-                        "services": [
-                            "Grief counseling"
-                        ],
-                        "requirements": "12 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Bruce Adams",
-                        "address": "1005 Atlantic Ave, Alameda, CA 94501-1148",
-                        "phone": "415-474-7310",
-                        "services": [
-                            "Trauma therapy"
-                        ],
-                        "requirements": "6 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Katherine Adamson",
-                        "address": "15200 Foothill Blvd, San Leandro, CA 94578-1013",
-                        "phone": "510-352-9690",
-                        "services": [
-                            "LGBTQ+ affirming therapy"
-                        ],
-                        "requirements": "14 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Shaina Adelstein",
-                        "address": "5555 Ascot Dr, Oakland, CA 94611-3001",
-                        "phone": "510-879-2110",
-                        "services": [
-                            "ADHD therapy"
-                        ],
-                        "requirements": "2 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Omar Bocobo",
-                        "address": "2579 San Pablo Ave, Oakland, CA 94612",
-                        "phone": "510-844-7896",
-                        "services": [
-                            "Domestic violence counseling",
-                            "Trauma therapy"
-                        ],
-                        "requirements": "22 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Catherine Ho",
-                        "address": "268 Grand Ave, Oakland, CA 94610",
-                        "phone": "510-555-7382",
-                        "services": [
-                            "Bilingual services"
-                        ],
-                        "requirements": "5 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Amina Samake",
-                        "address": "270 Grand Ave, Oakland, CA 94610",
-                        "phone": "510-926-4751",
-                        "services": [
-                            "Child and adolescent therapy",
-                            "Multicultural counseling",
-                            "Mental health assessment"
-                        ],
-                        "requirements": "14 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Emily Pellegrino",
-                        "address": "2501 Harrison St, Oakland, CA 94612",
-                        "phone": "510-892-3456",
-                        "services": [
-                            "Case management",
-                            "Trauma therapy"
-                        ],
-                        "requirements": "11 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Pamela Lozoff",
-                        "address": "2501 Harrison St, Oakland, CA 94612",
-                        "phone": "510-789-2341",
-                        "services": [
-                            "Art therapy",
-                            "Mental health assessment"
-                        ],
-                        "requirements": "6 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Elizabeth Cary",
-                        "address": "298 Grand Ave Ste 100, Oakland, CA 94610",
-                        "phone": "510-567-8901",
-                        "services": [
-                            "CBT (Cognitive Behavioral Therapy)",
-                            "LGBTQ+ affirming therapy",
-                            "Group therapy"
-                        ],
-                        "requirements": "16 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Tara Montgomery",
-                        "address": "1011 Union St, Oakland, CA 94607",
-                        "phone": "510-234-5678",
-                        "services": [
-                            "CBT (Cognitive Behavioral Therapy)",
-                            "Family therapy",
-                            "Play therapy"
-                        ],
-                        "requirements": "22 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Marisol Enos",
-                        "address": "1011 Union St, Oakland, CA 94607",
-                        "phone": "510-876-5432",
-                        "services": [
-                            "EMDR therapy",
-                            "Art therapy",
-                            "Trauma therapy"
-                        ],
-                        "requirements": "18 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Stacy Daniels",
-                        "address": "1011 Union St, Oakland, CA 94607",
-                        "phone": "510-345-6789",
-                        "services": [
-                            "ADHD therapy",
-                            "Crisis intervention",
-                            "Individual therapy"
-                        ],
-                        "requirements": "19 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Yolanda Olloway-Smith",
-                        "address": "1011 Union St, Oakland, CA 94607",
-                        "phone": "510-987-6543",
-                        "services": [
-                            "Couples therapy",
-                            "ADHD therapy"
-                        ],
-                        "requirements": "5 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Astraea Bella",
-                        "address": "3600 Broadway, Oakland, CA 94611",
-                        "phone": "510-555-0142",
-                        "services": [
-                            "Individual therapy"
-                        ],
-                        "requirements": "4 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Brie Robertori",
-                        "address": "1926 E 19th St, Oakland, CA 94606",
-                        "phone": "510-555-0143",
-                        "services": [
-                            "Substance abuse counseling"
-                        ],
-                        "requirements": "13 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Cameron Murphey",
-                        "address": "5750 College Ave, Oakland, CA 94618",
-                        "phone": "510-555-0144",
-                        "services": [
-                            "Group therapy"
-                        ],
-                        "requirements": "8 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Jennifer Martinez",
-                        "address": "4314 Piedmont Ave, Oakland, CA 94611",
-                        "phone": "510-652-8901",
-                        "services": [
-                            "Group therapy",
-                            "DBT (Dialectical Behavior Therapy)"
-                        ],
-                        "requirements": "15 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Robert Kim",
-                        "address": "2579 San Pablo Ave, Oakland, CA 94612",
-                        "phone": "510-789-2345",
-                        "services": [
-                            "Domestic violence counseling",
-                            "EMDR therapy"
-                        ],
-                        "requirements": "4 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Maria Rodriguez",
-                        "address": "1515 Fruitvale Ave, Oakland, CA 94601",
-                        "phone": "510-345-6789",
-                        "services": [
-                            "EMDR therapy",
-                            "Behavioral therapy"
-                        ],
-                        "requirements": "16 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "David Thompson",
-                        "address": "3001 International Blvd, Oakland, CA 94601",
-                        "phone": "510-567-8901",
-                        "services": [
-                            "Multicultural counseling"
-                        ],
-                        "requirements": "8 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Lisa Chen",
-                        "address": "747 52nd Street, Oakland, CA 94609",
-                        "phone": "510-234-5678",
-                        "services": [
-                            "EMDR therapy"
-                        ],
-                        "requirements": "19 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "James Wilson",
-                        "address": "1266 14th St, Oakland, CA 94607",
-                        "phone": "510-345-6789",
-                        "services": [
-                            "Crisis intervention"
-                        ],
-                        "requirements": "9 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Amy Johnson",
-                        "address": "8521 A St, Oakland, CA 94621",
-                        "phone": "510-456-7890",
-                        "services": [
-                            "Domestic violence counseling"
-                        ],
-                        "requirements": "16 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Carlos Morales",
-                        "address": "3750 Brown Ave, Oakland, CA 94619",
-                        "phone": "510-567-8901",
-                        "services": [
-                            "Group therapy",
-                            "Mental health assessment",
-                            "Art therapy"
-                        ],
-                        "requirements": "19 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Diana Lee",
-                        "address": "2607 Myrtle St, Oakland, CA 94607",
-                        "phone": "510-678-9012",
-                        "services": [
-                            "Social services coordination",
-                            "Domestic violence counseling"
-                        ],
-                        "requirements": "2 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Kevin Brown",
-                        "address": "8755 Fontaine St, Oakland, CA 94605",
-                        "phone": "510-789-0123",
-                        "services": [
-                            "EMDR therapy",
-                            "Multicultural counseling"
-                        ],
-                        "requirements": "25 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Angela Davis",
-                        "address": "1023 MacArthur Blvd, Oakland, CA 94610",
-                        "phone": "510-890-1234",
-                        "services": [
-                            "Depression and anxiety"
-                        ],
-                        "requirements": "17 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Michelle Garcia",
-                        "address": "12250 Skyline Blvd, Oakland, CA 94619",
-                        "phone": "510-901-2345",
-                        "services": [
-                            "Domestic violence counseling",
-                            "Individual therapy"
-                        ],
-                        "requirements": "7 years experience",
-                        "distance": None
-                    }
-                ]
-            },
-            "berkeley": {
-                "healthcare": [
-                    {
-                        "name": "Patrick Conlin",
-                        "address": "2901 Hillegass Ave # 2, Berkeley, CA 94705-2211",
-                        "phone": "510-841-7321",
-                        "services": [
-                            "LGBTQ+ affirming therapy",
-                            "Crisis intervention"
-                        ],
-                        "requirements": "16 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Katrina Rose Serrano",
-                        "address": "2105 Martin Luther King Jr Way, Berkeley, CA 94704-1108",
-                        "phone": "510-926-6677",
-                        "services": [
-                            "Family therapy"
-                        ],
-                        "requirements": "11 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Judith Ann Izzo",
-                        "address": "2640 Martin Luther King Jr Way, Berkeley, CA 94704-3238",
-                        "phone": "510-981-5290",
-                        "services": [
-                            "Child and adolescent therapy",
-                            "Individual therapy",
-                            "DBT (Dialectical Behavior Therapy)"
-                        ],
-                        "requirements": "19 years experience",
-                        "distance": None
-                    },
-                    {
-                        "name": "Julianna Dickey",
-                        "address": "2107 Spaulding Ave, Berkeley, CA 94703-1420",
-                        "phone": "510-845-5197",
-                        "services": [
-                            "Trauma therapy"
-                        ],
-                        "requirements": "4 years experience",
-                        "distance": None
-                    }
-                ]
-            }
+            **self.snapshot.get_stats(),
+            'reloads': self._reloads,
+            'reload_failures': self._reload_failures,
+            'last_reload_error': self._last_reload_error,
+            'watching': self.watcher is not None,
+            'stages': {stage: stats.snapshot() for stage, stats in self.stage_stats.items()}
         }
 
-    def retrieve_resources(self, location: str, needs: List[str], situation: str = None) -> Dict[str, Any]:
+    @property
+    def resource_index(self):
+        return self.snapshot.resource_index
+
+    @property
+    def store(self):
+        return self.snapshot.store
+
+    def retrieve_resources(self, location: str, needs: List[str], situation: str = None,
+                           k: int = None, message: str = None) -> Dict[str, Any]:
         """
         Retrieve relevant resources based on user location and needs
 
@@ -861,36 +115,47 @@ class RAGPipeline:
             location: User's location (city, zip, etc.)
             needs: List of needs (food, shelter, healthcare, etc.)
             situation: User's current situation for context
+            k: Resources to return per need (default RAG_TOP_K)
+            message: The user's message; semantic and hybrid modes classify
+                and score it rather than the need labels
 
         Returns:
             Dictionary of relevant resources with confidence scores
         """
+        k = k or Config.RAG_TOP_K
+        # One snapshot for the whole call, even if a reload lands meanwhile
+        snapshot = self.snapshot
         try:
+            started = time.perf_counter()
+            coordinates = geocode(location)
+            if coordinates is not None:
+                self.stage_stats['normalize'].record(time.perf_counter() - started)
+                return self._retrieve_nearest(snapshot, location, coordinates, needs, situation, k, message)
+
             # Normalize location
             normalized_location = self._normalize_location(location)
+            self.stage_stats['normalize'].record(time.perf_counter() - started)
 
-            # Get resources for the location
-            location_resources = self.resource_database.get(
-                normalized_location, {})
-
-            if not location_resources:
+            if normalized_location not in snapshot.resource_index.facets['region']:
                 return self._get_fallback_resources(location)
 
             # Filter resources based on needs
             relevant_resources = {}
             confidence_scores = {}
+            flags = self._situation_flags(situation)
 
             for need in needs:
-                need_type = self._map_need_to_category(need)
-                if need_type in location_resources:
-                    resources = location_resources[need_type]
-                    # Sort by distance and availability
-                    sorted_resources = self._rank_resources(
-                        resources, situation)
-                    # Top 3
-                    relevant_resources[need_type] = sorted_resources[:3]
-                    confidence_scores[need_type] = self._calculate_confidence(
-                        sorted_resources)
+                need_type = self._resolve_category(snapshot, need, message)
+                if need_type is None:
+                    continue
+                key = ('region', normalized_location, need_type, flags, k)
+                ranked = snapshot.ranking_cache.get(key)
+                if ranked is None:
+                    ranked = self._rank_region(
+                        snapshot, normalized_location, need_type, situation, k)
+                    snapshot.ranking_cache.set(key, ranked)
+                if ranked[0]:
+                    relevant_resources[need_type], confidence_scores[need_type] = ranked
 
             return {
                 "location": location,
@@ -905,85 +170,360 @@ class RAGPipeline:
             logger.error(f"Error in RAG pipeline: {str(e)}")
             return self._get_fallback_resources(location)
 
+    def _retrieve_nearest(self, snapshot: ResourceSnapshot, location: str, coordinates, needs: List[str],
+                          situation: str = None, k: int = 3, message: str = None) -> Dict[str, Any]:
+        """
+        Retrieve the best nearby resources per need
+
+        Hybrid mode, and any need no category could be found for, ranks by
+        fused BM25 + vector relevance to the message (or the need itself);
+        otherwise the closest resources of the category are reranked by the
+        usual heuristics.
+        """
+        lat, lon = coordinates
+        relevant_resources = {}
+        confidence_scores = {}
+        flags = self._situation_flags(situation)
+        # Region of the single closest match labels the result
+        closest = None
+
+        for need in needs:
+            need_type = self._resolve_category(snapshot, need, message)
+            if need_type in relevant_resources:
+                continue
+
+            # Geocoding maps locations onto a finite set of gazetteer points
+            if Config.RAG_RETRIEVAL_MODE == 'hybrid' or need_type is None:
+                text = message or need
+                query = f"{text} {situation}" if situation else text
+                key = ('hybrid', query.lower(), lat, lon, need_type, flags, k)
+                ranked = snapshot.ranking_cache.get(key)
+                if ranked is None:
+                    ranked = self._rank_hybrid(
+                        snapshot, query, lat, lon, need_type, situation, k)
+                    snapshot.ranking_cache.set(key, ranked)
+            else:
+                key = ('near', lat, lon, need_type, flags, k)
+                ranked = snapshot.ranking_cache.get(key)
+                if ranked is None:
+                    ranked = self._rank_nearest(
+                        snapshot, lat, lon, need_type, situation, k)
+                    snapshot.ranking_cache.set(key, ranked)
+
+            top, confidence, nearest = ranked
+            if not top:
+                continue
+            if need_type is None:
+                # Best matches across every category, each under its own
+                for resource in top:
+                    relevant_resources.setdefault(resource["category"], []).append(resource)
+                    confidence_scores.setdefault(resource["category"], confidence)
+            else:
+                relevant_resources[need_type] = top
+                confidence_scores[need_type] = confidence
+            if closest is None or nearest[0] < closest[0]:
+                closest = nearest
+
+        if not relevant_resources:
+            return self._get_fallback_resources(location)
+
+        return {
+            "location": location,
+            "normalized_location": closest[1],
+            "coordinates": {"lat": lat, "lon": lon},
+            "resources": relevant_resources,
+            "confidence_scores": confidence_scores,
+            "total_resources": sum(len(r) for r in relevant_resources.values()),
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def _rank_hybrid(self, snapshot: ResourceSnapshot, query: str, lat: float, lon: float,
+                     need_type: Optional[str], situation: str = None,
+                     k: int = 3) -> Tuple[List[Dict], float, Optional[Tuple[float, str]]]:
+        """
+        Top k resources for a free-text need within a category, or within
+        every category when need_type is None
+
+        Candidates are the best BM25 matches plus the nearest resources, both
+        found through indexes rather than a catalogue scan. Vector similarity
+        is computed for those candidates only and fused with normalized BM25;
+        the fused relevance is then added to the _score_resource heuristics.
+        """
+        started = time.perf_counter()
+        pool = Config.RAG_HYBRID_CANDIDATES
+        lexical = dict((record_id, score) for score, record_id in
+                       snapshot.resource_index.bm25(query, category=need_type, limit=pool))
+        if need_type is None:
+            geo_indexes = list(snapshot.geo_indexes.values())
+        else:
+            geo_indexes = [snapshot.geo_indexes[need_type]] if need_type in snapshot.geo_indexes else []
+        nearby = heapq.nsmallest(pool, (
+            hit for geo_index in geo_indexes
+            for hit in geo_index.nearest(lat, lon, k=pool, max_distance_miles=Config.RAG_MAX_DISTANCE_MILES)))
+
+        candidates = list(lexical)
+        candidates.extend(record_id for _, record_id in nearby if record_id not in lexical)
+        if not candidates:
+            self.stage_stats['lookup'].record(time.perf_counter() - started)
+            return [], 0.0, None
+
+        resources = []
+        for record_id in candidates:
+            resource = snapshot.resource_index.record(record_id)
+            if resource.get("lat") is not None and resource.get("lon") is not None:
+                resource["distance"] = round(haversine_miles(lat, lon, resource["lat"], resource["lon"]), 1)
+            resources.append(resource)
+        self.stage_stats['lookup'].record(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        max_lexical = max(lexical.values(), default=0.0) or 1.0
+        similarities = snapshot.vector_index.similarities(query, candidates)
+        alpha = Config.RAG_HYBRID_ALPHA
+        family, emergency = self._situation_flags(situation)
+
+        scored = []
+        for position, record_id in enumerate(candidates):
+            fused = alpha * lexical.get(record_id, 0.0) / max_lexical + \
+                (1 - alpha) * max(0.0, float(similarities[position]))
+            heuristic = self._score_resource(resources[position], family, emergency)
+            scored.append((heuristic + Config.RAG_HYBRID_WEIGHT * fused, fused, position))
+
+        best = heapq.nlargest(k, scored, key=lambda item: item[0])
+        top = [{**resources[position],
+                "category": snapshot.resource_index.record_categories[candidates[position]],
+                "relevance_score": round(score, 3), "match_score": round(fused, 3)}
+               for score, fused, position in best]
+        confidence = self._confidence_from_scores([score for score, _, _ in scored])
+        self.stage_stats['rank'].record(time.perf_counter() - started)
+        if not best:
+            return top, confidence, None
+
+        record_id = candidates[best[0][2]]
+        closest = (resources[best[0][2]].get("distance") or 0.0, snapshot.resource_index.record_regions[record_id])
+        return top, confidence, closest
+
+    def _rank_nearest(self, snapshot: ResourceSnapshot, lat: float, lon: float, need_type: str,
+                      situation: str = None, k: int = 3) -> Tuple[List[Dict], float, Optional[Tuple[float, str]]]:
+        """Top k nearby resources, their confidence and the closest (distance, region)"""
+        geo_index = snapshot.geo_indexes.get(need_type)
+        if geo_index is None:
+            return [], 0.0, None
+
+        started = time.perf_counter()
+        nearest = geo_index.nearest(
+            lat, lon, k=max(k, Config.RAG_NEAREST_K), max_distance_miles=Config.RAG_MAX_DISTANCE_MILES)
+        resources = [{**snapshot.resource_index.record(record_id), "distance": round(distance, 1)}
+                     for distance, record_id in nearest]
+        self.stage_stats['lookup'].record(time.perf_counter() - started)
+        if not nearest:
+            return [], 0.0, None
+
+        top, confidence = self._select_top(resources, situation, k)
+        distance, record_id = nearest[0]
+        return top, confidence, (distance, snapshot.resource_index.record_regions[record_id])
+
+    def _rank_region(self, snapshot: ResourceSnapshot, region: str, need_type: str,
+                     situation: str = None, k: int = 3) -> Tuple[List[Dict], float]:
+        """Top k resources of a category within a region, and their confidence"""
+        started = time.perf_counter()
+        record_ids = snapshot.resource_index.facet_ids(region, need_type)
+        resources = [snapshot.resource_index.record(record_id)
+                     for record_id in record_ids]
+        self.stage_stats['lookup'].record(time.perf_counter() - started)
+        if not resources:
+            return [], 0.0
+
+        return self._select_top(resources, situation, k)
+
+    def _select_top(self, resources: List[Dict], situation: str = None, k: int = 3) -> Tuple[List[Dict], float]:
+        """Heap-select the k best resources; confidence still covers every candidate"""
+        started = time.perf_counter()
+        family, emergency = self._situation_flags(situation)
+        scores = [self._score_resource(resource, family, emergency)
+                  for resource in resources]
+        # Same order as a stable descending sort, without sorting everything
+        best = heapq.nlargest(k, range(len(resources)), key=scores.__getitem__)
+        top = [{**resources[i], "relevance_score": scores[i]} for i in best]
+        confidence = self._confidence_from_scores(scores)
+        self.stage_stats['rank'].record(time.perf_counter() - started)
+        return top, confidence
+
+    def search_resources(self, query: str, location: str = None, category: str = None, limit: int = 10) -> Dict[str, Any]:
+        """
+        Free-text resource search over the inverted index
+
+        Args:
+            query: Free text, e.g. "24/7 family shelter no documentation"
+            location: Optional location to restrict results to
+            category: Optional need or category to restrict results to
+            limit: Maximum number of results
+
+        Returns:
+            Dictionary with the matching resources
+        """
+        region = None
+        if location:
+            region = self._normalize_location(location)
+            if region == "unknown":
+                region = None
+        if category:
+            category = self._map_need_to_category(category)
+
+        results = self.snapshot.resource_index.search(
+            query, region=region, category=category, limit=limit)
+
+        return {
+            "query": query,
+            "normalized_location": region,
+            "category": category,
+            "resources": results,
+            "total_resources": len(results),
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def semantic_search(self, query: str, location: str = None, k: int = 10) -> Dict[str, Any]:
+        """
+        Resources most similar to free text in embedding space
+
+        Args:
+            query: Free text, e.g. "somewhere to sleep tonight with my kids"
+            location: Optional location to restrict results to
+            k: Maximum number of results
+
+        Returns:
+            Dictionary with the matching resources and their similarity
+        """
+        snapshot = self.snapshot
+        region = None
+        candidates = None
+        if location:
+            region = self._normalize_location(location)
+            if region == "unknown":
+                region = None
+            else:
+                candidates = snapshot.resource_index.facet_ids(region, None)
+
+        hits = snapshot.vector_index.search(query, k, candidates)
+        results = [{**snapshot.resource_index.record(record_id),
+                    "region": snapshot.resource_index.record_regions[record_id],
+                    "category": snapshot.resource_index.record_categories[record_id],
+                    "similarity": round(score, 4)}
+                   for score, record_id in hits]
+
+        return {
+            "query": query,
+            "normalized_location": region,
+            "resources": results,
+            "total_resources": len(results),
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def hybrid_search(self, query: str, location: str, situation: str = None, k: int = 10) -> Dict[str, Any]:
+        """
+        Resources for a free-text need near a location, by fused BM25 + vector
+        relevance reranked with the distance/beds/requirements heuristics
+
+        Falls back to semantic_search when the location cannot be geocoded.
+        """
+        snapshot = self.snapshot
+        coordinates = geocode(location) if location else None
+        if coordinates is None:
+            return self.semantic_search(query, location, k)
+
+        category, score = snapshot.vector_index.classify(query)
+        if not category or score < Config.RAG_SEMANTIC_MIN_SCORE:
+            category = self._map_need_to_category(query)
+        results, _, closest = self._rank_hybrid(
+            snapshot, query, coordinates[0], coordinates[1], category, situation, k)
+
+        return {
+            "query": query,
+            "category": category,
+            "normalized_location": closest[1] if closest else None,
+            "resources": results,
+            "total_resources": len(results),
+            "timestamp": datetime.now().isoformat()
+        }
+
     def _normalize_location(self, location: str) -> str:
         """Normalize location string to match database keys"""
         if not location:
             return "unknown"
 
-        location_lower = location.lower()
+        # Berkeley and the other East Bay places map to the oakland region
+        place = gazetteer.resolve(location)
+        return place.region if place else "unknown"
 
-        if "san francisco" in location_lower or "sf" in location_lower:
-            return "san_francisco"
-        elif "oakland" in location_lower:
-            return "oakland"
-        elif "berkeley" in location_lower:
-            return "oakland"  # Use Oakland resources for Berkeley
-        else:
-            return "unknown"
+    def _resolve_category(self, snapshot: ResourceSnapshot, need: str, message: str = None) -> Optional[str]:
+        """
+        Category for a need, by vector similarity in semantic and hybrid modes
+
+        There the placeholder need GENERAL_NEED, which the services send when
+        the keyword lists find nothing, is resolved from the message itself.
+        If no category is similar enough, None asks for the best matches to
+        the message across every category rather than a guessed one.
+        """
+        if Config.RAG_RETRIEVAL_MODE in ('semantic', 'hybrid'):
+            text = message if need == GENERAL_NEED else need
+            if text:
+                category, score = snapshot.vector_index.classify(text)
+                if category and score >= Config.RAG_SEMANTIC_MIN_SCORE:
+                    return category
+            if need == GENERAL_NEED:
+                return None
+        return self._map_need_to_category(need)
 
     def _map_need_to_category(self, need: str) -> str:
         """Map user needs to resource categories"""
-        need_lower = need.lower()
-
-        if any(word in need_lower for word in ["food", "hungry", "meal", "eat"]):
-            return "food"
-        elif any(word in need_lower for word in ["shelter", "housing", "sleep", "bed"]):
-            return "shelter"
-        elif any(word in need_lower for word in ["health", "medical", "doctor", "clinic"]):
-            return "healthcare"
-        elif any(word in need_lower for word in ["job", "work", "employment", "career"]):
-            return "employment"
-        else:
-            return "food"  # Default to food assistance
-
-    def _rank_resources(self, resources: List[Dict], situation: str = None) -> List[Dict]:
-        """Rank resources based on relevance and availability"""
-        scored_resources = []
-
-        for resource in resources:
-            score = 0
-
-            # Distance score (closer is better)
-            distance = resource.get("distance")
-            if distance is not None:
-                score += max(0, 5 - distance)
-
-            # Availability score
-            if "beds_available" in resource:
-                beds = resource["beds_available"]
-                if beds > 20:
-                    score += 3
-                elif beds > 10:
-                    score += 2
-                elif beds > 0:
-                    score += 1
-
-            # Situational relevance
-            if situation:
-                if "family" in situation.lower() and "family" in resource.get("services", []):
-                    score += 2
-                if "emergency" in situation.lower() and "24/7" in resource.get("hours", ""):
-                    score += 2
-
-            # Requirements score (fewer requirements is better)
-            requirements = resource.get("requirements", "")
-            if "none" in requirements.lower() or "no documentation" in requirements.lower():
+        # Default to food assistance
+        return intent_classifier.resource_category(need, default="food")
+
+    def _situation_flags(self, situation: str = None) -> Tuple[bool, bool]:
+        """The (family, emergency) features of a situation that ranking uses"""
+        situation_lower = situation.lower() if situation else ""
+        return "family" in situation_lower, "emergency" in situation_lower
+
+    def _score_resource(self, resource: Dict, family: bool = False, emergency: bool = False) -> float:
+        """Relevance score from distance, availability, situation and requirements"""
+        score = 0
+
+        # Distance score (closer is better)
+        distance = resource.get("distance")
+        if distance is not None:
+            score += max(0, 5 - distance)
+
+        # Availability score
+        beds = resource.get("beds_available")
+        if beds is not None:
+            if beds > 20:
+                score += 3
+            elif beds > 10:
                 score += 2
+            elif beds > 0:
+                score += 1
 
-            scored_resources.append({**resource, "relevance_score": score})
+        # Situational relevance
+        if family and "family" in (resource.get("services") or []):
+            score += 2
+        if emergency and "24/7" in (resource.get("hours") or ""):
+            score += 2
 
-        return sorted(scored_resources, key=lambda x: x["relevance_score"], reverse=True)
+        # Requirements score (fewer requirements is better)
+        requirements = resource.get("requirements") or ""
+        if "none" in requirements.lower() or "no documentation" in requirements.lower():
+            score += 2
 
-    def _calculate_confidence(self, resources: List[Dict]) -> float:
-        """Calculate confidence score for resource recommendations"""
-        if not resources:
+        return score
+
+    def _confidence_from_scores(self, scores: List[float]) -> float:
+        """Confidence from the relevance scores of every candidate"""
+        if not scores:
             return 0.0
 
         # Base confidence on number of resources and their scores
-        avg_score = sum(r.get("relevance_score", 0)
-                        for r in resources) / len(resources)
+        avg_score = sum(scores) / len(scores)
         # Max confidence with 3+ resources
-        resource_count_factor = min(len(resources) / 3.0, 1.0)
+        resource_count_factor = min(len(scores) / 3.0, 1.0)
 
         return min(avg_score * resource_count_factor / 10.0, 1.0)
 
@@ -1016,6 +556,12 @@ class RAGPipeline:
 
     def format_resources_for_claude(self, rag_results: Dict[str, Any]) -> str:
         """Format RAG results for Claude context"""
+        started = time.perf_counter()
+        formatted = self._format_resources(rag_results)
+        self.stage_stats['format'].record(time.perf_counter() - started)
+        return formatted
+
+    def _format_resources(self, rag_results: Dict[str, Any]) -> str:
         if not rag_results.get("resources"):
             return "No specific local resources found. Recommend calling 211 for local assistance."
 
@@ -1043,6 +589,22 @@ class RAGPipeline:
 rag_pipeline = RAGPipeline()
 
 
-def get_local_resources(location: str, needs: List[str], situation: str = None) -> Dict[str, Any]:
+def get_local_resources(location: str, needs: List[str], situation: str = None, k: int = None,
+                        message: str = None) -> Dict[str, Any]:
     """Main function to get local resources via RAG pipeline"""
-    return rag_pipeline.retrieve_resources(location, needs, situation)
+    return rag_pipeline.retrieve_resources(location, needs, situation, k, message)
+
+
+def search_local_resources(query: str, location: str = None, category: str = None, limit: int = 10) -> Dict[str, Any]:
+    """Main function to search local resources by free text"""
+    return rag_pipeline.search_resources(query, location, category, limit)
+
+
+def semantic_search_local_resources(query: str, location: str = None, k: int = 10) -> Dict[str, Any]:
+    """Main function to search local resources by embedding similarity"""
+    return rag_pipeline.semantic_search(query, location, k)
+
+
+def hybrid_search_local_resources(query: str, location: str, situation: str = None, k: int = 10) -> Dict[str, Any]:
+    """Main function to search local resources by fused lexical and embedding relevance"""
+    return rag_pipeline.hybrid_search(query, location, situation, k)
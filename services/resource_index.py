@@ -0,0 +1,239 @@
+# Inverted index over the RAG resource database
+
+import heapq
+import logging
+import math
+import re
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Keeps schedule tokens like "24/7" intact
+_TOKEN = re.compile(r'[a-z0-9]+(?:/[a-z0-9]+)*')
+
+STOPWORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'i', 'in',
+    'is', 'it', 'me', 'my', 'of', 'on', 'or', 'the', 'to', 'with'
+])
+
+# Resource fields whose text is indexed
+INDEXED_FIELDS = ('name', 'services', 'requirements', 'hours')
+
+# Okapi BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split and lightly stem text into index terms"""
+    terms = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 4 and token.endswith('ies'):
+            token = token[:-3] + 'y'
+        elif len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+
+class ResourceIndex:
+    """
+    Term and facet posting lists over resources, keyed by compact integer IDs
+
+    Resources get sequential IDs. Posting lists are sorted ``array('I')`` of
+    those IDs, so a list of 10k entries costs 40KB rather than a list of
+    Python ints. When built over a ResourceStore the index holds no resource
+    bodies at all and fetches result rows from the store.
+    """
+
+    def __init__(self, resource_database: Optional[Dict[str, Dict[str, List[Dict]]]] = None,
+                 store: Optional[Any] = None):
+        """
+        Args:
+            resource_database: {region: {category: [resource, ...]}}
+            store: ResourceStore to index instead of an in-memory database
+        """
+        self.store = store
+        self._records: List[Dict[str, Any]] = []
+        self.record_regions: List[str] = []
+        self.record_categories: List[str] = []
+        self.postings: Dict[str, array] = {}
+        # Term frequencies, parallel to each posting list, and token counts
+        self.term_freqs: Dict[str, array] = {}
+        self.doc_lengths = array('I')
+        self._total_length = 0
+        self.facets: Dict[str, Dict[str, array]] = {'region': {}, 'category': {}}
+
+        if store is not None:
+            for _, region, category, resource in store.iter_rows():
+                self._add(resource, region, category)
+        else:
+            for region, categories in (resource_database or {}).items():
+                for category, resources in categories.items():
+                    for resource in resources:
+                        self._records.append(resource)
+                        self._add(resource, region, category)
+
+        logger.info(
+            f"Resource index built: {len(self)} resources, {len(self.postings)} terms")
+
+    def __len__(self) -> int:
+        return len(self.record_regions)
+
+    def record(self, record_id: int) -> Dict[str, Any]:
+        """The resource with the given ID"""
+        if self.store is not None:
+            return self.store.get(record_id)
+        return self._records[record_id]
+
+    def _add(self, resource: Dict[str, Any], region: str, category: str):
+        record_id = len(self.record_regions)
+        self.record_regions.append(region)
+        self.record_categories.append(category)
+
+        terms = Counter(tokenize(category))
+        for field in INDEXED_FIELDS:
+            for text in self._field_texts(resource.get(field)):
+                terms.update(tokenize(text))
+        length = sum(terms.values())
+        self.doc_lengths.append(length)
+        self._total_length += length
+
+        # IDs are assigned in increasing order, so appends keep lists sorted
+        for term, count in terms.items():
+            self.postings.setdefault(term, array('I')).append(record_id)
+            self.term_freqs.setdefault(term, array('H')).append(min(count, 0xFFFF))
+        self.facets['region'].setdefault(region, array('I')).append(record_id)
+        self.facets['category'].setdefault(category, array('I')).append(record_id)
+
+    @staticmethod
+    def _field_texts(value: Any) -> Iterable[str]:
+        if not value:
+            return ()
+        if isinstance(value, str):
+            return (value,)
+        return (str(item) for item in value)
+
+    def facet_ids(self, region: Optional[str], category: Optional[str]) -> List[int]:
+        """IDs matching every given facet, in index order"""
+        ids = self.facets['region'].get(region, ()) if region is not None \
+            else self.facets['category'].get(category, ())
+        if region is not None and category is not None:
+            ids = [record_id for record_id in ids
+                   if self.record_categories[record_id] == category]
+        return list(ids)
+
+    def search(self, query: str = '', region: Optional[str] = None, category: Optional[str] = None,
+               limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Free-text and faceted lookup
+
+        Resources are ranked by how many distinct query terms they match;
+        region and category act as filters. An empty query lists the facet
+        matches in index order.
+
+        Args:
+            query: Free text, e.g. "24/7 family shelter no documentation"
+            region: Optional region key, e.g. "oakland"
+            category: Optional category key, e.g. "shelter"
+            limit: Maximum number of results
+
+        Returns:
+            Resource copies annotated with region, category and match_score
+        """
+        terms = set(tokenize(query)) if query else set()
+
+        if not terms:
+            if region is None and category is None:
+                return []
+            return [self._result(record_id, 0)
+                    for record_id in self.facet_ids(region, category)[:limit]]
+
+        postings = [self.postings[term] for term in terms if term in self.postings]
+        matches: Dict[int, int] = {}
+
+        if region is not None or category is not None:
+            candidates = self.facet_ids(region, category)
+        else:
+            candidates = None
+
+        if candidates is not None and len(candidates) < sum(len(ids) for ids in postings):
+            # Narrow facet: probe each candidate in the sorted posting lists
+            for record_id in candidates:
+                count = 0
+                for ids in postings:
+                    position = bisect_left(ids, record_id)
+                    if position < len(ids) and ids[position] == record_id:
+                        count += 1
+                if count:
+                    matches[record_id] = count
+        else:
+            for ids in postings:
+                for record_id in ids:
+                    matches[record_id] = matches.get(record_id, 0) + 1
+            if candidates is not None:
+                allowed = set(candidates)
+                matches = {record_id: count for record_id, count in matches.items()
+                           if record_id in allowed}
+
+        ranked = sorted(matches.items(), key=lambda item: (-item[1], item[0]))
+        return [self._result(record_id, count) for record_id, count in ranked[:limit]]
+
+    def bm25(self, query: str, category: Optional[str] = None, limit: int = 50) -> List[Tuple[float, int]]:
+        """
+        Okapi BM25 scores for resources containing at least one query term
+
+        Only the query terms' posting lists are read, so the cost follows how
+        common the terms are rather than the catalogue size.
+
+        Args:
+            query: Free text
+            category: Optional category filter
+            limit: Maximum number of results
+
+        Returns:
+            (score, id) pairs, best first
+        """
+        count = len(self)
+        if not count:
+            return []
+        average_length = self._total_length / count or 1.0
+        categories = self.record_categories
+
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            ids = self.postings.get(term)
+            if ids is None:
+                continue
+            idf = math.log(1 + (count - len(ids) + 0.5) / (len(ids) + 0.5))
+            for record_id, freq in zip(ids, self.term_freqs[term]):
+                if category is not None and categories[record_id] != category:
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[record_id] / average_length)
+                scores[record_id] = scores.get(record_id, 0.0) + idf * freq * (BM25_K1 + 1) / (freq + norm)
+
+        return heapq.nlargest(limit, ((score, record_id) for record_id, score in scores.items()),
+                              key=lambda item: (item[0], -item[1]))
+
+    def _result(self, record_id: int, match_score: int) -> Dict[str, Any]:
+        return {
+            **self.record(record_id),
+            'region': self.record_regions[record_id],
+            'category': self.record_categories[record_id],
+            'match_score': match_score
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Index size figures"""
+        return {
+            'resources': len(self),
+            'terms': len(self.postings),
+            'postings': sum(len(ids) for ids in self.postings.values()),
+            'regions': sorted(self.facets['region']),
+            'categories': sorted(self.facets['category'])
+        }
@@ -0,0 +1,136 @@
+# Resource loader - immutable index snapshots and a data-file watcher
+
+import logging
+import os
+import threading
+import time
+import weakref
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Optional, Tuple
+from .geo_index import GeoIndex
+from .resource_index import ResourceIndex
+from .resource_store import ResourceStore, open_resource_store
+from .response_cache import LRUCache
+from .vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceSnapshot:
+    """
+    Everything retrieval reads, built together and replaced as a unit
+
+    Readers take one reference to a snapshot and use it for the whole call,
+    so a reload swapping in a new snapshot never mixes old and new data.
+    Ranked results memoized in ``ranking_cache`` belong to the snapshot and
+    are dropped with it. Cached lists are shared between requests and must
+    be treated as read-only. The store is closed once the snapshot is
+    garbage collected, i.e. after a reload replaced it and the last call
+    still reading it has finished.
+    """
+
+    def __init__(self, store: ResourceStore, resource_index: ResourceIndex,
+                 geo_indexes: Dict[str, GeoIndex], vector_index: VectorIndex,
+                 version: int, load_seconds: float, ranking_cache_size: int = 4096):
+        self.store = store
+        self.resource_index = resource_index
+        self.geo_indexes = geo_indexes
+        self.vector_index = vector_index
+        self.version = version
+        self.load_seconds = load_seconds
+        self.loaded_at = datetime.now()
+        # Entries only go stale through a reload, which replaces the snapshot
+        self.ranking_cache = LRUCache(maxsize=ranking_cache_size, ttl=None)
+        self._close_store = weakref.finalize(self, store.close)
+
+    def close(self):
+        """Close the store now instead of when the snapshot is collected"""
+        self._close_store()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'version': self.version,
+            'loaded_at': self.loaded_at.isoformat(),
+            'load_ms': round(self.load_seconds * 1000, 2),
+            'store_bytes': self.store.get_stats()['size_bytes'],
+            'ranking_cache': self.ranking_cache.get_stats(),
+            'vector_index': self.vector_index.get_stats(),
+            **self.resource_index.get_stats()
+        }
+
+
+def _build_geo_indexes(store: ResourceStore) -> Dict[str, GeoIndex]:
+    """One spatial index per category, keyed by resource IDs"""
+    points: Dict[str, List[Tuple[float, float]]] = {}
+    ids: Dict[str, List[int]] = {}
+    for record_id, category, lat, lon in store.iter_points():
+        points.setdefault(category, []).append((lat, lon))
+        ids.setdefault(category, []).append(record_id)
+    return {category: GeoIndex(points[category], ids[category]) for category in points}
+
+
+def build_resource_snapshot(source_path: str, store_path: str, version: int = 1,
+                            mmap_size: int = 64 * 1024 * 1024,
+                            ranking_cache_size: int = 4096,
+                            embedding_dim: int = 512) -> ResourceSnapshot:
+    """Compile (if stale) and open the store, then build every index over it"""
+    started = time.perf_counter()
+    store = open_resource_store(source_path, store_path, mmap_size=mmap_size)
+    resource_index = ResourceIndex(store=store)
+    geo_indexes = _build_geo_indexes(store)
+    vector_index = VectorIndex.build(store.iter_rows(), dim=embedding_dim)
+    return ResourceSnapshot(store, resource_index, geo_indexes, vector_index, version,
+                            time.perf_counter() - started, ranking_cache_size)
+
+
+class ResourceWatcher:
+    """Polls a data file (or every file in a directory) and reports changes"""
+
+    def __init__(self, path: str, on_change: Callable[[], Any], interval: float = 5.0):
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._signature = self._current_signature()
+
+    def _current_signature(self) -> Tuple:
+        """(name, mtime_ns, size) of every watched file"""
+        try:
+            if os.path.isdir(self.path):
+                entries = sorted(os.scandir(self.path), key=lambda e: e.name)
+                return tuple((e.name, e.stat().st_mtime_ns, e.stat().st_size)
+                             for e in entries if e.is_file())
+            stat = os.stat(self.path)
+            return ((self.path, stat.st_mtime_ns, stat.st_size),)
+        except OSError:
+            return ()
+
+    def check(self) -> bool:
+        """Run on_change if the watched files changed since the last check"""
+        signature = self._current_signature()
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        self.on_change()
+        return True
+
+    def start(self):
+        if self._thread:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name='resource-watcher', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Resource watcher check failed: {str(e)}")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,175 @@
+# Resource store - compiled, memory-mapped SQLite copy of the resource catalogue
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import Dict, List, Any, Iterator, Tuple
+from urllib.parse import quote
+from .geo_index import geocode
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE resources (
+    id INTEGER PRIMARY KEY,
+    region TEXT NOT NULL,
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    lat REAL,
+    lon REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX ix_resources_region_category ON resources (region, category);
+"""
+
+
+def _source_files(source_path: str) -> List[str]:
+    """The catalogue file, or every *.json file in a catalogue directory"""
+    if os.path.isdir(source_path):
+        return sorted(os.path.join(source_path, name) for name in os.listdir(source_path)
+                      if name.endswith('.json'))
+    return [source_path]
+
+
+def source_mtime(source_path: str) -> float:
+    """
+    Last modification time of the catalogue
+
+    For a directory this is the newest of its *.json files and the directory
+    itself, so adding or removing a file also counts as a change.
+    """
+    mtimes = [os.path.getmtime(path) for path in _source_files(source_path)]
+    if os.path.isdir(source_path):
+        mtimes.append(os.path.getmtime(source_path))
+    return max(mtimes)
+
+
+def load_resource_source(source_path: str) -> Dict[str, Dict[str, List[Dict]]]:
+    """
+    Read the editable JSON catalogue: {region: {category: [resource, ...]}}
+
+    source_path may be a single file or a directory of them; files are
+    merged in name order, concatenating the lists of a shared region and
+    category.
+    """
+    resource_database: Dict[str, Dict[str, List[Dict]]] = {}
+    for path in _source_files(source_path):
+        with open(path, encoding='utf-8') as f:
+            for region, categories in json.load(f).items():
+                merged = resource_database.setdefault(region, {})
+                for category, resources in categories.items():
+                    merged.setdefault(category, []).extend(resources)
+    return resource_database
+
+
+def compile_resource_store(source_path: str, db_path: str) -> int:
+    """
+    Compile the JSON catalogue into a SQLite store
+
+    Resources without coordinates are geocoded from their address, falling
+    back to their region's centroid. The file is written beside the target
+    and renamed into place, so readers never see a partial store.
+
+    Returns:
+        Number of resources written
+    """
+    resource_database = load_resource_source(source_path)
+    directory = os.path.dirname(os.path.abspath(db_path))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.db.tmp')
+    os.close(fd)
+    count = 0
+    try:
+        conn = sqlite3.connect(tmp_path)
+        conn.executescript(SCHEMA)
+        for region, categories in resource_database.items():
+            region_point = geocode(region.replace('_', ' '))
+            for category, resources in categories.items():
+                for resource in resources:
+                    if resource.get('lat') is None or resource.get('lon') is None:
+                        point = geocode(resource.get('address', '')) or region_point
+                        if point:
+                            resource = {**resource, 'lat': point[0], 'lon': point[1]}
+                    conn.execute(
+                        "INSERT INTO resources (id, region, category, name, lat, lon, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (count, region, category, resource['name'], resource.get('lat'),
+                         resource.get('lon'), json.dumps(resource, ensure_ascii=False)))
+                    count += 1
+        conn.commit()
+        conn.close()
+        os.replace(tmp_path, db_path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+    logger.info(f"Compiled {count} resources into {db_path}")
+    return count
+
+
+class ResourceStore:
+    """
+    Read-only view of a compiled store
+
+    The file is opened immutable with SQLite's mmap I/O, so every worker
+    process reads the same page-cache pages instead of holding its own copy
+    of the catalogue as Python objects.
+    """
+
+    def __init__(self, db_path: str, mmap_size: int = 64 * 1024 * 1024):
+        self.db_path = db_path
+        self.mmap_size = mmap_size
+        self._lock = threading.Lock()
+        uri = f"file:{quote(os.path.abspath(db_path))}?mode=ro&immutable=1"
+        self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self._conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+        self._count = self._conn.execute(
+            "SELECT COUNT(*) FROM resources").fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def iter_rows(self) -> Iterator[Tuple[int, str, str, Dict[str, Any]]]:
+        """(id, region, category, resource) for every resource, in ID order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, region, category, data FROM resources ORDER BY id").fetchall()
+        for record_id, region, category, data in rows:
+            yield record_id, region, category, json.loads(data)
+
+    def iter_points(self) -> Iterator[Tuple[int, str, float, float]]:
+        """(id, category, lat, lon) for every resource with coordinates"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, category, lat, lon FROM resources WHERE lat IS NOT NULL AND lon IS NOT NULL ORDER BY id").fetchall()
+        return iter(rows)
+
+    def get(self, record_id: int) -> Dict[str, Any]:
+        """One resource by ID"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM resources WHERE id = ?", (record_id,)).fetchone()
+        if row is None:
+            raise KeyError(record_id)
+        return json.loads(row[0])
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'path': self.db_path,
+            'resources': self._count,
+            'size_bytes': os.path.getsize(self.db_path),
+            'mmap_size': self.mmap_size
+        }
+
+    def close(self):
+        self._conn.close()
+
+
+def open_resource_store(source_path: str, db_path: str, mmap_size: int = 64 * 1024 * 1024) -> ResourceStore:
+    """Open the compiled store, recompiling it first if the JSON source is newer"""
+    if not os.path.exists(db_path) or os.path.getmtime(db_path) < source_mtime(source_path):
+        compile_resource_store(source_path, db_path)
+    return ResourceStore(db_path, mmap_size=mmap_size)
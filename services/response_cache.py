@@ -0,0 +1,199 @@
+# Response cache - reuse LLM completions for identical prompts
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+_PUNCTUATION = re.compile(r'[^\w\s]+')
+
+
+def make_cache_key(prompt: str, generation_config: Dict[str, Any]) -> str:
+    """Hash a whitespace-normalized prompt together with its generation config"""
+    normalized = _WHITESPACE.sub(' ', prompt).strip()
+    digest = hashlib.sha256()
+    digest.update(normalized.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(json.dumps(generation_config, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def normalize_message(text: str) -> str:
+    """Fold case, punctuation and whitespace so trivially different messages match"""
+    return _WHITESPACE.sub(' ', _PUNCTUATION.sub('', text.lower())).strip()
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with per-entry TTL and a size bound"""
+
+    backend = 'memory'
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 3600):
+        """
+        Args:
+            maxsize: Entry bound
+            ttl: Entry lifetime in seconds, or None to keep entries until evicted
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': self.backend,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+
+class RedisCache:
+    """Shared cache backed by Redis; expiry and eviction are left to the server"""
+
+    backend = 'redis'
+
+    def __init__(self, client: Any, ttl: float = 3600, prefix: str = 'gemini:response:'):
+        """
+        Args:
+            client: Redis-compatible client exposing get/set(ex=)/delete
+            ttl: Entry lifetime in seconds
+            prefix: Key namespace inside the shared Redis database
+        """
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = self.client.get(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Redis cache read failed: {str(e)}")
+            with self._lock:
+                self.errors += 1
+                self.misses += 1
+            return None
+
+        with self._lock:
+            if raw is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key: str, value: Any):
+        try:
+            self.client.set(self.prefix + key, json.dumps(value),
+                            ex=max(1, int(self.ttl)))
+        except Exception as e:
+            logger.warning(f"Redis cache write failed: {str(e)}")
+            with self._lock:
+                self.errors += 1
+
+    def delete(self, key: str):
+        try:
+            self.client.delete(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Redis cache delete failed: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': self.backend,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+                'errors': self.errors
+            }
+
+
+def create_response_cache(backend: str = 'memory', maxsize: int = 1024, ttl: float = 3600, redis_url: Optional[str] = None):
+    """
+    Build the configured response cache
+
+    Args:
+        backend: "memory", "redis" or "none"
+        maxsize: Entry bound for the in-process cache
+        ttl: Entry lifetime in seconds
+        redis_url: Connection URL for the redis backend
+
+    Returns:
+        A cache instance, or None when caching is disabled
+    """
+    backend = (backend or 'memory').lower()
+    if backend == 'none':
+        return None
+
+    if backend == 'redis':
+        try:
+            import redis
+            client = redis.Redis.from_url(redis_url)
+            client.ping()
+            return RedisCache(client, ttl=ttl)
+        except ImportError:
+            logger.warning(
+                "redis package not installed, using in-process response cache")
+        except Exception as e:
+            logger.warning(
+                f"Redis unavailable ({str(e)}), using in-process response cache")
+
+    return LRUCache(maxsize=maxsize, ttl=ttl)
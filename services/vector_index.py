@@ -0,0 +1,179 @@
+# Vector index - hashed n-gram embeddings and brute-force top-k search
+
+import logging
+import zlib
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+import numpy as np
+
+from .resource_index import INDEXED_FIELDS, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Vocabulary folded into every resource of a category, so plain-language
+# needs ("somewhere to sleep tonight") land near the right resources
+CATEGORY_TERMS = {
+    'food': "food meal meals eat eating hungry starving groceries pantry lunch dinner breakfast nutrition",
+    'shelter': "shelter housing bed beds sleep place to stay homeless overnight evicted rent roof",
+    'healthcare': "health healthcare medical doctor dentist dental clinic therapy therapist counseling mental sick medication",
+    'employment': "job jobs work employment career hiring resume training income"
+}
+
+
+class HashingEmbedder:
+    """
+    Embeds text as a signed feature-hashed bag of words and character n-grams
+
+    Needs no model download and no vocabulary: every word contributes itself
+    plus its 3-5 character n-grams (with word-boundary markers), hashed into
+    ``dim`` buckets. Vectors are L2-normalized, so a dot product is the
+    cosine similarity.
+    """
+
+    def __init__(self, dim: int = 512, ngram_range: Tuple[int, int] = (3, 5)):
+        self.dim = dim
+        self.ngram_range = ngram_range
+
+    def _features(self, text: str) -> Iterable[Tuple[str, float]]:
+        low, high = self.ngram_range
+        for word in tokenize(text):
+            yield 'w:' + word, 1.0
+            marked = f'<{word}>'
+            for n in range(low, high + 1):
+                for start in range(len(marked) - n + 1):
+                    yield marked[start:start + n], 0.5
+
+    def embed(self, text: str) -> np.ndarray:
+        """Unit-length float32 vector for one text"""
+        buckets, weights = [], []
+        for feature, weight in self._features(text):
+            h = zlib.crc32(feature.encode('utf-8'))
+            buckets.append(h % self.dim)
+            # The top hash bit picks a sign so collisions tend to cancel
+            weights.append(weight if h & 0x80000000 else -weight)
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        if buckets:
+            np.add.at(vector, buckets, weights)
+            norm = np.linalg.norm(vector)
+            if norm:
+                vector /= norm
+        return vector
+
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        """(len(texts), dim) matrix of unit vectors"""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            matrix[row] = self.embed(text)
+        return matrix
+
+
+def resource_text(resource: Dict[str, Any], category: str) -> str:
+    """The text embedded for a resource"""
+    parts = [category, CATEGORY_TERMS.get(category, '')]
+    for field in INDEXED_FIELDS:
+        value = resource.get(field)
+        if isinstance(value, str):
+            parts.append(value)
+        elif value:
+            parts.extend(str(item) for item in value)
+    return ' '.join(parts)
+
+
+class VectorIndex:
+    """
+    Dense float32 matrix of resource embeddings searched by one matrix-vector
+    product (BLAS/SIMD) plus ``argpartition`` top-k selection
+    """
+
+    def __init__(self, embedder: HashingEmbedder, vectors: np.ndarray, categories: List[str]):
+        """
+        Args:
+            embedder: Embedder used for the vectors and for queries
+            vectors: (n, dim) unit vectors, row i for resource ID i
+            categories: Category of each row
+        """
+        self.embedder = embedder
+        self.vectors = vectors
+        self.categories = categories
+
+        # Unit centroid per category; voting over raw hits would favour
+        # whichever category simply has the most resources
+        self.category_names = sorted(set(categories))
+        centroids = np.zeros((len(self.category_names), embedder.dim), dtype=np.float32)
+        if categories:
+            labels = np.array(categories)
+            for row, category in enumerate(self.category_names):
+                centroid = vectors[labels == category].mean(axis=0)
+                norm = np.linalg.norm(centroid)
+                centroids[row] = centroid / norm if norm else centroid
+        self.centroids = centroids
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[int, str, str, Dict[str, Any]]], dim: int = 512) -> 'VectorIndex':
+        """Embed (id, region, category, resource) rows given in ID order"""
+        embedder = HashingEmbedder(dim)
+        texts, categories = [], []
+        for _, _, category, resource in rows:
+            texts.append(resource_text(resource, category))
+            categories.append(category)
+        return cls(embedder, embedder.embed_batch(texts), categories)
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def search(self, query: str, k: int = 10, candidates: Optional[Iterable[int]] = None) -> List[Tuple[float, int]]:
+        """
+        Most similar resources to a free-text query
+
+        Args:
+            query: Free text
+            k: Number of results
+            candidates: Optional resource IDs to restrict the search to
+
+        Returns:
+            (cosine similarity, id) pairs, best first
+        """
+        if not len(self) or k <= 0:
+            return []
+
+        if candidates is not None:
+            ids = np.fromiter(candidates, dtype=np.int64)
+            if not len(ids):
+                return []
+            scores = self.similarities(query, ids)
+        else:
+            ids = None
+            scores = self.vectors @ self.embedder.embed(query)
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        if ids is not None:
+            return [(float(scores[i]), int(ids[i])) for i in top]
+        return [(float(scores[i]), int(i)) for i in top]
+
+    def similarities(self, query: str, ids: Iterable[int]) -> np.ndarray:
+        """Cosine similarity of the query to each given resource ID"""
+        rows = ids if isinstance(ids, np.ndarray) else np.fromiter(ids, dtype=np.int64)
+        return self.vectors[rows] @ self.embedder.embed(query)
+
+    def classify(self, query: str) -> Tuple[Optional[str], float]:
+        """
+        Category whose centroid is most similar to the query
+
+        Returns:
+            (category, similarity), or (None, 0.0) for an empty index
+        """
+        if not self.category_names:
+            return None, 0.0
+        scores = self.centroids @ self.embedder.embed(query)
+        best = int(np.argmax(scores))
+        return self.category_names[best], float(scores[best])
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'vectors': len(self),
+            'dim': self.embedder.dim,
+            'bytes': int(self.vectors.nbytes)
+        }
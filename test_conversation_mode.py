@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for the indexed chat mode and prompt type columns
+"""
+
+import os
+import sqlite3
+import tempfile
+from models.user import db, User
+from models.conversation import Conversation, backfill_conversation_settings, settings_from_context
+from models.schema import ensure_schema
+from testing_helpers import capture_statements, explain, make_app
+
+
+def test_mode_stored_at_write_time():
+    """send_message records the mode and prompt type it answered with"""
+    print("🧪 Testing write-time mode...")
+    app = make_app()
+    client = app.test_client()
+    first = client.post('/api/chat/message', json={
+        'message': 'hello', 'mode': 'assistant', 'prompt_type': 'direct_assistant'}).get_json()
+    client.post('/api/chat/message', json={'message': 'hi again', 'user_id': first['user_id']})
+
+    with app.app_context():
+        stored = [(c.mode, c.prompt_type) for c in Conversation.query.order_by(Conversation.id)]
+    print(f"   Stored: {stored}")
+    assert stored == [('assistant', 'direct_assistant'), ('coach', 'empathetic_coach')]
+
+    modes = [c['mode'] for c in client.get('/admin/api/conversations').get_json()['conversations']]
+    assert modes == ['coach', 'assistant']
+    print("✅ Write-time mode test passed")
+
+
+def test_settings_from_context():
+    """Older contexts keep the mode at the top level or in user_context"""
+    print("\n🧪 Testing context extraction...")
+    assert settings_from_context({'mode': 'coach'}) == ('coach', None)
+    assert settings_from_context({'mode': 'coach', 'user_context': {'mode': 'assistant'}}) == ('assistant', None)
+    assert settings_from_context('{"user_context": {"prompt_type": "direct_assistant"}}') == (None, 'direct_assistant')
+    assert settings_from_context({'emotion_analysis': None}) == (None, None)
+    assert settings_from_context('not json') == (None, None)
+    assert settings_from_context(None) == (None, None)
+    print("✅ Context extraction test passed")
+
+
+def test_dashboard_mode_counts_are_one_indexed_group_by():
+    """Coach vs assistant usage is a GROUP BY over the mode index"""
+    print("\n🧪 Testing dashboard mode breakdown...")
+    app = make_app()
+    with app.app_context():
+        user = User(name="Mode Test")
+        db.session.add(user)
+        db.session.flush()
+        db.session.add_all(Conversation(user_id=user.id, message=f"m{i}", mode=mode, context={'n': i})
+                           for i, mode in enumerate(['coach'] * 7 + ['assistant'] * 4 + [None] * 2))
+        db.session.commit()
+
+    responses = []
+    statements = capture_statements(app, lambda: responses.append(app.test_client().get('/admin/')))
+    response = responses[0]
+    assert response.status_code == 200
+
+    grouped = [(s, p) for s, p in statements if 'GROUP BY conversations.mode' in s]
+    assert len(grouped) == 1
+    plan = ' '.join(explain(app, *grouped[0]))
+    print(f"   Plan: {plan}")
+    assert 'ix_conversations_mode' in plan and 'TEMP B-TREE' not in plan
+    assert not any('GROUP BY conversations.context' in s for s, _ in statements)
+
+    page = response.get_data(as_text=True)
+    assert 'const coachConversations = 7;' in page
+    assert 'const assistantConversations = 6;' in page
+    print("✅ Dashboard mode breakdown test passed")
+
+
+def test_legacy_database_migrated_and_backfilled():
+    """Existing databases gain the columns, filled from the stored context"""
+    print("\n🧪 Testing schema upgrade and mode backfill...")
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    try:
+        legacy = sqlite3.connect(path)
+        legacy.executescript("""
+            CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR(100), location VARCHAR(200),
+                                situation TEXT, needs TEXT, created_at DATETIME, updated_at DATETIME);
+            CREATE TABLE conversations (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, message TEXT NOT NULL,
+                                        response TEXT, message_type VARCHAR(20), created_at DATETIME, context JSON);
+            INSERT INTO users (id, name) VALUES (1, 'Legacy');
+        """)
+        legacy.executemany("INSERT INTO conversations (user_id, message, context) VALUES (1, 'hi', ?)", [
+            ('{"mode": "coach"}',),
+            ('{"user_context": {"mode": "assistant", "prompt_type": "direct_assistant"}}',),
+            ('{"emotion_status": "complete"}',),
+            (None,)
+        ] * 2)
+        legacy.commit()
+        legacy.close()
+
+        app = make_app(f'sqlite:///{path}')
+        with app.app_context():
+            added = ensure_schema()
+            print(f"   Added: {added}")
+            assert {'conversations.mode', 'conversations.prompt_type', 'ix_conversations_mode'} <= set(added)
+
+            assert backfill_conversation_settings(batch_size=3) == 4
+            rows = [(c.mode, c.prompt_type) for c in Conversation.query.order_by(Conversation.id).limit(4)]
+            assert rows == [('coach', None), ('assistant', 'direct_assistant'), (None, None), (None, None)]
+
+            response = app.test_client().post('/admin/api/conversations/backfill-modes')
+            assert response.get_json() == {'success': True, 'updated': 0}
+            db.engine.dispose()
+    finally:
+        os.remove(path)
+    print("✅ Schema upgrade and mode backfill test passed")
+
+
+if __name__ == "__main__":
+    print("Starting Conversation Mode Tests...\n")
+    test_mode_stored_at_write_time()
+    test_settings_from_context()
+    test_dashboard_mode_counts_are_one_indexed_group_by()
+    test_legacy_database_migrated_and_backfilled()
+    print("\n🎉 All conversation mode tests passed!")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test script for deferred emotion analysis and the emotion polling endpoint
+"""
+
+import json
+import threading
+import time
+import requests
+from sqlalchemy import event
+import routes.chat as chat_routes
+from models.user import db
+from models.conversation import Conversation
+from routes.chat import _store_emotion_scores
+from services.background import BackgroundWorker
+from testing_helpers import make_app
+
+
+def send_deferred(client, message: str) -> dict:
+    return client.post('/api/chat/message', json={'message': message, 'deferred_analysis': True}).get_json()
+
+
+def test_deferred_scores_arrive_via_polling():
+    """The reply comes back pending; the worker fills in the scores"""
+    print("🧪 Testing deferred emotion analysis...")
+    app = make_app()
+    client = app.test_client()
+    data = send_deferred(client, "I feel anxious about tomorrow")
+    assert data['emotion_status'] == 'pending' and data['emotion_analysis'] is None
+
+    chat_routes.emotion_worker.join()
+    polled = client.get(f"/api/chat/message/{data['conversation_id']}/emotion").get_json()
+    print(f"   Polled: {polled['status']}")
+    assert polled['status'] == 'complete'
+    assert set(polled['emotion_analysis']) >= {'distress', 'hope', 'anxiety'}
+    assert client.get('/api/chat/message/999/emotion').status_code == 404
+    print("✅ Deferred analysis test passed")
+
+
+def saturated_worker():
+    """A worker whose one thread and one queue slot are both taken"""
+    release = threading.Event()
+    busy = BackgroundWorker('emotion-test', workers=1, maxsize=1)
+    busy.submit(release.wait)
+    while busy.get_stats()['queued']:
+        time.sleep(0.01)  # Wait for the worker to pick up the blocking job
+    busy.submit(release.wait)
+    return busy, release
+
+
+def stream_events(client, message: str) -> list:
+    """(event, data) pairs from /api/chat/message/stream"""
+    body = client.post('/api/chat/message/stream', json={'message': message}).get_data(as_text=True)
+    events = []
+    for frame in body.strip().split('\n\n'):
+        name, data = frame.split('\n', 1)
+        events.append((name[len('event: '):], json.loads(data[len('data: '):])))
+    return events
+
+
+def test_saturated_queue_scores_inline():
+    """When the worker queue is full the message is scored before replying"""
+    print("\n🧪 Testing saturated queue fallback...")
+    app = make_app()
+    client = app.test_client()
+    busy, release = saturated_worker()
+
+    original = chat_routes.emotion_worker
+    chat_routes.emotion_worker = busy
+    try:
+        data = send_deferred(client, "I feel hopeful")
+    finally:
+        chat_routes.emotion_worker = original
+        release.set()
+    assert busy.get_stats()['rejected'] == 1
+    assert data['emotion_status'] == 'complete' and data['emotion_analysis']
+
+    polled = client.get(f"/api/chat/message/{data['conversation_id']}/emotion").get_json()
+    assert polled['status'] == 'complete' and polled['emotion_analysis'] == data['emotion_analysis']
+    print("✅ Saturated queue test passed")
+
+
+def test_stream_with_saturated_queue_scores_inline():
+    """A streamed reply never leaves its row pending when the queue is full"""
+    print("\n🧪 Testing streamed reply with a saturated queue...")
+    app = make_app()
+    client = app.test_client()
+    busy, release = saturated_worker()
+
+    original = chat_routes.emotion_worker
+    chat_routes.emotion_worker = busy
+    try:
+        events = stream_events(client, "I feel hopeful")
+    finally:
+        chat_routes.emotion_worker = original
+        release.set()
+    name, done = events[-1]
+    assert name == 'done'
+    assert done['emotion_status'] == 'complete' and done['emotion_analysis']
+
+    polled = client.get(f"/api/chat/message/{done['conversation_id']}/emotion").get_json()
+    assert polled['status'] == 'complete' and polled['emotion_analysis'] == done['emotion_analysis']
+    print("✅ Streamed saturated queue test passed")
+
+
+def test_interrupted_stream_is_not_saved():
+    """A reply cut off mid-stream ends with 'error' and no saved conversation"""
+    print("\n🧪 Testing interrupted stream...")
+    app = make_app()
+    client = app.test_client()
+
+    def broken_stream(*args):
+        yield 'Here are '
+        raise requests.exceptions.ConnectionError("Connection broken")
+
+    original = chat_routes.stream_support_response
+    chat_routes.stream_support_response = broken_stream
+    try:
+        events = stream_events(client, "I need a job")
+    finally:
+        chat_routes.stream_support_response = original
+    print(f"   Events: {[name for name, _ in events]}")
+    assert [name for name, _ in events] == ['start', 'token', 'error']
+    with app.app_context():
+        assert Conversation.query.count() == 0
+    print("✅ Interrupted stream test passed")
+
+
+def test_failed_job_marks_row_failed():
+    """A job that cannot save its scores leaves the row 'failed', not 'pending'"""
+    print("\n🧪 Testing failed emotion job...")
+    app = make_app()
+    client = app.test_client()
+    with app.app_context():
+        conversation = Conversation(user_id=1, message="hello", context={'emotion_status': 'pending'})
+        db.session.add(conversation)
+        db.session.commit()
+        conversation_id = conversation.id
+
+    failures = []
+
+    def fail_first_save(mapper, connection, target):
+        if not failures:
+            failures.append(target.id)
+            raise RuntimeError("database is locked")
+
+    event.listen(Conversation, 'before_update', fail_first_save)
+    try:
+        _store_emotion_scores(app, conversation_id, "hello")
+        assert False, "expected the job to re-raise"
+    except RuntimeError:
+        pass
+    finally:
+        event.remove(Conversation, 'before_update', fail_first_save)
+
+    polled = client.get(f'/api/chat/message/{conversation_id}/emotion').get_json()
+    print(f"   Polled: {polled}")
+    assert polled['status'] == 'failed' and polled['emotion_analysis'] is None
+
+    # A conversation deleted before scoring finished is skipped quietly
+    _store_emotion_scores(app, 999, "hello")
+    print("✅ Failed job test passed")
+
+
+if __name__ == "__main__":
+    print("Starting Deferred Emotion Tests...\n")
+    test_deferred_scores_arrive_via_polling()
+    test_saturated_queue_scores_inline()
+    test_stream_with_saturated_queue_scores_inline()
+    test_interrupted_stream_is_not_saved()
+    test_failed_job_marks_row_failed()
+    print("\n🎉 All deferred emotion tests passed!")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script for the local lexicon emotion scoring engine
+"""
+
+from config import Config
+from services.emotion_lexicon import emotion_scorer, DIMENSIONS
+from services.gemini_service import GeminiService
+
+
+def test_score_shape():
+    """Lexicon scores use the same keys as Gemini emotion scores"""
+    print("🧪 Testing lexicon score shape...")
+    scores = emotion_scorer.score("I feel hopeless and scared")
+    for dimension in DIMENSIONS:
+        assert 0.0 <= scores[dimension] <= 1.0
+    assert scores['overall_sentiment'] == 'negative'
+    print(f"   Scores: {scores}")
+    print("✅ Score shape test passed")
+
+
+def test_negation():
+    """Negators reverse the polarity of the words that follow"""
+    print("\n🧪 Testing negation handling...")
+    happy = emotion_scorer.score("I am happy")
+    not_happy = emotion_scorer.score("I am not happy")
+    assert happy['positivity'] > 0.5 > not_happy['positivity']
+
+    hopeless = emotion_scorer.score("I feel hopeless")
+    not_hopeless = emotion_scorer.score("I am not hopeless")
+    assert not_hopeless['distress'] < hopeless['distress']
+    print("✅ Negation test passed")
+
+
+def test_batch_matches_single():
+    """Batch scoring gives the same result as scoring one message at a time"""
+    print("\n🧪 Testing batch scoring...")
+    texts = ["thanks", "", "not so bad", "I'm very worried about rent", "no"]
+    assert emotion_scorer.score_batch(texts) == [emotion_scorer.score(t) for t in texts]
+    print("✅ Batch scoring test passed")
+
+
+def test_engine_selection():
+    """EMOTION_ENGINE=lexicon scores locally without an API key"""
+    print("\n🧪 Testing engine selection...")
+    original = Config.EMOTION_ENGINE
+    Config.EMOTION_ENGINE = 'lexicon'
+    try:
+        scores = GeminiService(api_key=None).score_emotional_state("I am so grateful")
+        assert scores['source'] == 'lexicon'
+        assert scores['overall_sentiment'] == 'positive'
+    finally:
+        Config.EMOTION_ENGINE = original
+    print("✅ Engine selection test passed")
+
+
+if __name__ == "__main__":
+    print("Starting Emotion Lexicon Tests...\n")
+    test_score_shape()
+    test_negation()
+    test_batch_matches_single()
+    test_engine_selection()
+    print("\n🎉 All emotion lexicon tests passed!")
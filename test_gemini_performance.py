@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Test script for Gemini service performance features (pooling, concurrency, streaming)
+Runs against a local stand-in for the Gemini endpoint - no API key needed
+"""
+
+import json
+import time
+import threading
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config import Config
+from services.gemini_service import GeminiService
+
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    """Minimal generateContent stand-in speaking keep-alive HTTP/1.1"""
+    protocol_version = 'HTTP/1.1'
+    reply_text = '{"distress": 0.2, "hope": 0.7, "motivation": 0.6, "anxiety": 0.3, "positivity": 0.7, "overall_sentiment": "positive"}'
+    delays = {}
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length))
+        self.server.requests_seen.append(payload)
+        prompt = payload['contents'][0]['parts'][0]['text']
+        for marker, delay in self.delays.items():
+            if marker in prompt:
+                time.sleep(delay)
+        body = json.dumps({
+            'candidates': [{'content': {'parts': [{'text': self.reply_for(prompt)}]}}]
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def reply_for(self, prompt):
+        return self.reply_text
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_gemini(handler=FakeGeminiHandler):
+    """Start a local fake Gemini server and return (server, service)"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.requests_seen = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1beta/models/test:generateContent"
+    return server, GeminiService(api_key='test-key', api_url=url)
+
+
+def test_connection_reuse():
+    """Sequential calls should share one keep-alive connection"""
+    print("🧪 Testing pooled HTTP client connection reuse...")
+    server, service = start_fake_gemini()
+    try:
+        for _ in range(5):
+            assert service._call_gemini_api("Hello", use_cache=False) is not None
+
+        stats = service.get_http_stats()
+        print(f"   Stats: {stats}")
+        assert stats['requests'] == 5
+        assert stats['new_connections'] == 1
+        assert stats['reused_connections'] == 4
+        print("✅ Connection reuse test passed")
+    finally:
+        service.http.close()
+        server.shutdown()
+
+
+def test_concurrent_calls_bounded_by_pool():
+    """Concurrent calls never open more connections than the pool allows"""
+    print("\n🧪 Testing concurrent calls against the pool...")
+    server, service = start_fake_gemini()
+    try:
+        threads = [threading.Thread(target=service._call_gemini_api, args=("Hi",), kwargs={"use_cache": False})
+                   for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = service.get_http_stats()
+        print(f"   Stats: {stats}")
+        assert stats['requests'] == 20
+        assert stats['errors'] == 0
+        assert stats['new_connections'] + stats['reused_connections'] == 20
+        print("✅ Concurrent pool test passed")
+    finally:
+        service.http.close()
+        server.shutdown()
+
+
+class SlowScoringHandler(FakeGeminiHandler):
+    """Emotion-scoring prompts take longer than the scoring deadline"""
+    delays = {'Score the emotional content': 1.0, 'User message:': 0.3}
+
+
+class SlowBothHandler(FakeGeminiHandler):
+    """Both LLM calls take the same noticeable time"""
+    delays = {'Score the emotional content': 0.3, 'User message:': 0.3}
+
+
+def test_concurrent_scoring_and_response():
+    """Emotion scoring and the support reply run side by side"""
+    print("\n🧪 Testing concurrent scoring + response...")
+    server, service = start_fake_gemini(SlowBothHandler)
+    try:
+        started = time.monotonic()
+        response, scores = service.respond_with_emotion_scores(
+            "I lost my job and need advice", {'name': 'Test'})
+        elapsed = time.monotonic() - started
+        print(f"   Elapsed: {elapsed:.2f}s")
+        assert response
+        assert 'fallback' not in scores
+        assert elapsed < 0.55
+        print("✅ Concurrent execution test passed")
+    finally:
+        service.http.close()
+        server.shutdown()
+
+
+def test_scoring_deadline_falls_back():
+    """Scoring that misses its deadline degrades to fallback scores"""
+    print("\n🧪 Testing emotion scoring deadline...")
+    server, service = start_fake_gemini(SlowScoringHandler)
+    try:
+        response, scores = service.respond_with_emotion_scores(
+            "I lost my job and need advice", {'name': 'Test'}, scoring_timeout=0.5)
+        assert response
+        assert scores == service._fallback_emotion_scores()
+        print("✅ Scoring deadline test passed")
+    finally:
+        service.http.close()
+        server.shutdown()
+
+
+def support_requests(server) -> int:
+    """Support-reply calls the fake server has answered"""
+    return sum('User message:' in payload['contents'][0]['parts'][0]['text']
+               for payload in server.requests_seen)
+
+
+def test_reply_cached_only_with_known_scores():
+    """Replies are cached only once the message is known not to be urgent"""
+    print("\n🧪 Testing reply caching without scores...")
+    server, service = start_fake_gemini()
+    try:
+        # Deferred analysis: no scores when the reply is generated
+        for _ in range(2):
+            assert service.get_support_response("How do I renew my bus pass?", {'name': 'Test'})
+        assert support_requests(server) == 2
+
+        calm = {'distress': 0.1, 'anxiety': 0.1}
+        for _ in range(2):
+            assert service.get_support_response("How do I renew my library card?", {'name': 'Test'},
+                                                emotion_scores=calm)
+        assert support_requests(server) == 3
+        print("✅ Reply caching test passed")
+    finally:
+        service.http.close()
+        server.shutdown()
+
+
+def test_reply_not_cached_after_scoring_deadline():
+    """A reply whose scores missed their deadline is not cached"""
+    print("\n🧪 Testing reply caching after a scoring timeout...")
+    server, service = start_fake_gemini(SlowScoringHandler)
+    try:
+        for _ in range(2):
+            response, scores = service.respond_with_emotion_scores(
+                "Where can I get a warm coat?", {'name': 'Test'}, scoring_timeout=0.5)
+            assert response and scores == service._fallback_emotion_scores()
+        print(f"   Support calls: {support_requests(server)}")
+        assert support_requests(server) == 2
+        print("✅ Scoring timeout caching test passed")
+    finally:
+        service.http.close()
+        server.shutdown()
+
+
+class FakeStreamingHandler(FakeGeminiHandler):
+    """streamGenerateContent stand-in emitting one SSE frame per chunk"""
+    chunks = ['Here ', 'are some ', 'next steps.']
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.server.requests_seen.append(json.loads(self.rfile.read(length)))
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        for chunk in self.chunks:
+            event = {'candidates': [{'content': {'parts': [{'text': chunk}]}}]}
+            self.wfile.write(f"data: {json.dumps(event)}\r\n\r\n".encode())
+            self.wfile.flush()
+        self.close_connection = True
+
+
+def test_streaming_response():
+    """Streaming relays chunks in order and records time-to-first-token"""
+    print("\n🧪 Testing streaming support response...")
+    server, service = start_fake_gemini(FakeStreamingHandler)
+    try:
+        chunks = list(service.stream_support_response(
+            "I lost my job and need advice", {'name': 'Test'}))
+        print(f"   Chunks: {chunks}")
+        assert chunks == FakeStreamingHandler.chunks
+        assert service.get_streaming_stats()['time_to_first_token']['count'] == 1
+        print("✅ Streaming test passed")
+    finally:
+        service.http.close()
+        server.shutdown()
+
+
+class BrokenStreamingHandler(FakeGeminiHandler):
+    """Sends one chunked SSE frame, then drops the connection mid-chunk"""
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.server.requests_seen.append(json.loads(self.rfile.read(length)))
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        event = {'candidates': [{'content': {'parts': [{'text': 'Here '}]}}]}
+        frame = f"data: {json.dumps(event)}\r\n\r\n".encode()
+        self.wfile.write(f"{len(frame):x}\r\n".encode() + frame + b"\r\n")
+        self.wfile.write(b"400\r\ndata: {")
+        self.wfile.flush()
+        self.close_connection = True
+
+
+def test_broken_stream_is_not_reported_complete():
+    """A stream cut off after the first chunk raises instead of ending quietly"""
+    print("\n🧪 Testing interrupted streaming response...")
+    server, service = start_fake_gemini(BrokenStreamingHandler)
+    chunks = []
+    try:
+        for chunk in service.stream_support_response("I lost my job and need advice", {'name': 'Test'}):
+            chunks.append(chunk)
+        assert False, "expected the interrupted stream to raise"
+    except requests.exceptions.RequestException as e:
+        print(f"   Raised {type(e).__name__} after {chunks}")
+        assert chunks == ['Here ']
+    finally:
+        service.http.close()
+        server.shutdown()
+    print("✅ Interrupted streaming test passed")
+
+
+class BatchScoringHandler(FakeGeminiHandler):
+    """Answers packed scoring prompts, truncating output past max_items"""
+    max_items = 4
+
+    def reply_for(self, prompt):
+        if 'Texts: ' not in prompt:
+            return self.reply_text
+        items = json.loads(prompt.split('Texts: ', 1)[1].split('\n', 1)[0])
+        scores = [{'id': item['id'], 'distress': 0.2, 'hope': 0.6, 'motivation': 0.5,
+                   'anxiety': 0.3, 'positivity': 0.6, 'overall_sentiment': 'neutral'}
+                  for item in items]
+        reply = json.dumps(scores)
+        if len(items) > self.max_items:
+            reply = reply[:len(reply) // 2]
+        return reply
+
+
+def test_batch_scoring_packs_and_splits():
+    """Batches share API calls and split in half when output is cut off"""
+    print("\n🧪 Testing batched emotion scoring...")
+    server, service = start_fake_gemini(BatchScoringHandler)
+    try:
+        texts = [f"Message number {i} about finding work" for i in range(8)]
+        scores = service.score_emotional_state_batch(texts)
+        print(f"   API calls: {len(server.requests_seen)}")
+        assert len(scores) == 8
+        assert all(s['hope'] == 0.6 for s in scores)
+        # One truncated call of 8, then two calls of 4
+        assert len(server.requests_seen) == 3
+
+        again = service.score_emotional_state_batch(texts[:2] + ["A brand new message"])
+        assert again[:2] == scores[:2]
+        assert len(server.requests_seen) == 4
+        print("✅ Batch scoring test passed")
+    finally:
+        service.http.close()
+        server.shutdown()
+
+
+class FailingBatchHandler(FakeGeminiHandler):
+    """Gemini outage: every packed scoring prompt gets a 503"""
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.server.requests_seen.append(json.loads(self.rfile.read(length)))
+        body = b'{"error": "unavailable"}'
+        self.send_response(503)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_batch_scoring_outage_is_not_split():
+    """A failed API call falls back at once instead of splitting and retrying"""
+    print("\n🧪 Testing batched scoring during an outage...")
+    server, service = start_fake_gemini(FailingBatchHandler)
+    try:
+        # Three chunks of EMOTION_BATCH_SIZE; only the first reaches the API
+        texts = [f"Message number {i} about rent" for i in range(Config.EMOTION_BATCH_SIZE * 3)]
+        scores = service.score_emotional_state_batch(texts)
+        print(f"   API calls: {len(server.requests_seen)}")
+        assert len(server.requests_seen) == 1
+        assert scores == [service._fallback_emotion_scores()] * len(texts)
+        print("✅ Batch outage test passed")
+    finally:
+        service.http.close()
+        server.shutdown()
+
+
+def test_support_prompt_resources_follow_the_message():
+    """Semantic and hybrid modes retrieve for the message, not the 'general' placeholder"""
+    print("\n🧪 Testing RAG resources in the support prompt...")
+    server, service = start_fake_gemini()
+    original = Config.RAG_RETRIEVAL_MODE
+    message = "somewhere to crash tonight with my kids"
+    try:
+        assert service._extract_needs_from_message(message) == ['general']
+        for mode in ('semantic', 'hybrid'):
+            Config.RAG_RETRIEVAL_MODE = mode
+            service.get_support_response(message, {'location': '94612'})
+            prompt = server.requests_seen[-1]['contents'][0]['parts'][0]['text']
+            print(f"   {mode}: shelter={'BOSS Oakland Emergency Shelter' in prompt}, food={'Food Bank' in prompt}")
+            assert 'BOSS Oakland Emergency Shelter' in prompt
+            assert 'Food Bank' not in prompt
+        print("✅ Support prompt resources test passed")
+    finally:
+        Config.RAG_RETRIEVAL_MODE = original
+        service.http.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    print("Starting Gemini Performance Tests...\n")
+    test_connection_reuse()
+    test_concurrent_calls_bounded_by_pool()
+    test_concurrent_scoring_and_response()
+    test_scoring_deadline_falls_back()
+    test_reply_cached_only_with_known_scores()
+    test_reply_not_cached_after_scoring_deadline()
+    test_streaming_response()
+    test_broken_stream_is_not_reported_complete()
+    test_batch_scoring_packs_and_splits()
+    test_batch_scoring_outage_is_not_split()
+    test_support_prompt_resources_follow_the_message()
+    print("\n🎉 All Gemini performance tests passed!")
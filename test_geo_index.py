@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for the geospatial nearest-resource index
+"""
+
+import random
+from services.geo_index import GeoIndex, geocode, haversine_miles
+from services.rag_pipeline import rag_pipeline
+
+
+def test_haversine_and_geocode():
+    """Known city distance and ZIP-over-city precedence"""
+    print("🧪 Testing haversine and geocoding...")
+    sf, oakland = geocode("San Francisco"), geocode("Oakland, CA")
+    distance = haversine_miles(*sf, *oakland)
+    print(f"   SF to Oakland: {distance:.1f} miles")
+    assert 7 < distance < 10
+    assert geocode("Oakland 94704") == geocode("94704")
+    assert geocode("somewhere unknown") is None
+    print("✅ Haversine and geocode test passed")
+
+
+def test_kd_tree_matches_brute_force():
+    """k-nearest answers agree with an exhaustive scan"""
+    print("\n🧪 Testing KD-tree against brute force...")
+    rng = random.Random(7)
+    points = [(37.5 + rng.random(), -122.6 + rng.random()) for _ in range(2000)]
+    index = GeoIndex(points)
+
+    for _ in range(50):
+        lat, lon = 37.5 + rng.random(), -122.6 + rng.random()
+        expected = sorted((haversine_miles(lat, lon, *p), i) for i, p in enumerate(points))[:5]
+        got = index.nearest(lat, lon, k=5)
+        assert [i for _, i in got] == [i for _, i in expected]
+
+    radius = index.nearest(37.9, -122.1, k=50, max_distance_miles=2)
+    assert all(distance <= 2 for distance, _ in radius)
+    print("✅ KD-tree test passed")
+
+
+def test_pipeline_uses_real_distances():
+    """Retrieval computes distances from the user's location"""
+    print("\n🧪 Testing nearest-resource retrieval...")
+    near_downtown = rag_pipeline.retrieve_resources("94612", ["shelter"])
+    near_sf = rag_pipeline.retrieve_resources("San Francisco 94102", ["shelter"])
+    oakland_top = near_downtown['resources']['shelter']
+    sf_top = near_sf['resources']['shelter']
+    print(f"   Oakland: {[r['name'] for r in oakland_top]}")
+    print(f"   SF: {[r['name'] for r in sf_top]}")
+    assert near_downtown['normalized_location'] == 'oakland'
+    assert near_sf['normalized_location'] == 'san_francisco'
+    assert all(r['distance'] is not None for r in oakland_top + sf_top)
+    assert near_downtown['coordinates']['lat'] == geocode("94612")[0]
+    print("✅ Pipeline test passed")
+
+
+def test_ranking_memoized_per_place_and_flags():
+    """Same place, category and situation flags reuse one ranked list"""
+    print("\n🧪 Testing ranking memo...")
+    cache = rag_pipeline.snapshot.ranking_cache
+    before = cache.get_stats()
+    first = rag_pipeline.retrieve_resources("94607", ["shelter"], "family emergency")
+    second = rag_pipeline.retrieve_resources("West Oakland 94607", ["housing"], "Emergency with my family")
+    other = rag_pipeline.retrieve_resources("94607", ["shelter"], "")
+    after = cache.get_stats()
+    print(f"   Cache: {after}")
+    assert second['resources']['shelter'] is first['resources']['shelter']
+    assert other['resources']['shelter'] is not first['resources']['shelter']
+    assert after['hits'] - before['hits'] >= 1
+    print("✅ Ranking memo test passed")
+
+
+def test_top_k_selection_matches_full_sort():
+    """Heap selection returns the same resources as sorting everything"""
+    print("\n🧪 Testing top-k selection...")
+    index = rag_pipeline.resource_index
+    shelters = [index.record(i) for i in index.facet_ids('oakland', 'shelter')]
+    scores = [rag_pipeline._score_resource(shelter, emergency=True) for shelter in shelters]
+    ranked = sorted(({**shelter, "relevance_score": score} for shelter, score in zip(shelters, scores)),
+                    key=lambda r: r["relevance_score"], reverse=True)
+    for k in (1, 3, 10):
+        top, confidence = rag_pipeline._select_top(shelters, "emergency", k)
+        assert top == ranked[:k]
+        assert confidence == rag_pipeline._confidence_from_scores(scores)
+
+    results = rag_pipeline.retrieve_resources("94612", ["shelter"], k=5)
+    assert len(results['resources']['shelter']) == 5
+    rag_pipeline.format_resources_for_gemini(results)
+    stages = rag_pipeline.get_stats()['stages']
+    print(f"   Stages: {stages}")
+    assert all(stages[stage]['count'] > 0 for stage in ('normalize', 'lookup', 'rank', 'format'))
+    print("✅ Top-k test passed")
+
+
+if __name__ == "__main__":
+    print("Starting Geo Index Tests...\n")
+    test_haversine_and_geocode()
+    test_kd_tree_matches_brute_force()
+    test_pipeline_uses_real_distances()
+    test_ranking_memoized_per_place_and_flags()
+    test_top_k_selection_matches_full_sort()
+    print("\n🎉 All geo index tests passed!")
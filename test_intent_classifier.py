@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared needs/greeting/crisis intent classifier
+"""
+
+from services.claude_service import ClaudeService
+from services.gemini_service import GeminiService
+from services.intent_classifier import IntentClassifier, intent_classifier
+from services.rag_pipeline import rag_pipeline
+
+
+def test_needs_greetings_and_crisis_in_one_pass():
+    """One classify call reports every intent in the message"""
+    print("🧪 Testing intent classification...")
+    intents = intent_classifier.classify(
+        "Hey, I lost my job and need a place to stay and some mental health support. I feel hopeless")
+    print(f"   {intents}")
+    assert intents.needs == ('shelter', 'healthcare', 'mental_health', 'employment')
+    assert intents.crisis and intents.crisis_terms == ('hopeless',)
+    assert not intents.greeting  # too long to be a simple greeting
+
+    assert intent_classifier.classify("hey there").greeting
+    assert intent_classifier.classify("Good morning!").greeting
+    # Short crisis messages are never treated as small talk
+    intents = intent_classifier.classify("hey i'm hopeless")
+    assert intents.crisis and not intents.greeting
+    assert intent_classifier.classify(None) == ((), False, False, ())
+    print("✅ Classification test passed")
+
+
+def test_terms_match_at_word_starts():
+    """Substring false positives of the old scans are gone"""
+    print("\n🧪 Testing word-start matching...")
+    assert not intent_classifier.classify("I need support").greeting
+    assert not intent_classifier.classify("this is it").greeting
+    assert intent_classifier.classify("my parent is great").needs == ()
+    assert intent_classifier.classify("free meals and groceries").needs == ('food',)
+    assert intent_classifier.classify("she keeps hurting me").crisis
+    print("✅ Word-start matching test passed")
+
+
+def test_whole_word_terms_ignore_longer_words():
+    """Short terms that start unrelated words only match on their own"""
+    print("\n🧪 Testing whole-word terms...")
+    for text in ("my bedroom is cold", "going to a workout class", "that was hurtful",
+                 "no homework tonight", "what a great day", "my parent helps",
+                 "thanks for the support"):
+        intents = intent_classifier.classify(text)
+        assert intents == ((), False, False, ()), f"{text!r} -> {intents}"
+
+    assert intent_classifier.classify("I need a bed").needs == ('shelter',)
+    assert intent_classifier.classify("two beds for tonight").needs == ('shelter',)
+    assert intent_classifier.classify("I can't find work").needs == ('employment',)
+    assert intent_classifier.classify("working two shifts").needs == ('employment',)
+    assert intent_classifier.classify("he hurts me").crisis_terms == ('hurts',)
+    assert intent_classifier.classify("I got hurt").crisis_terms == ('hurt',)
+    assert intent_classifier.classify("I have no home").crisis
+    print("✅ Whole-word terms test passed")
+
+
+def test_overlapping_terms_all_reported():
+    """A longer term does not hide a shorter one sharing its start"""
+    print("\n🧪 Testing overlapping terms...")
+    classifier = IntentClassifier(need_terms={'a': ['health'], 'b': ['healthcare'], 'c': ['care']},
+                                  greeting_terms=['hi'], crisis_terms=[])
+    assert classifier.classify("healthcare").needs == ('a', 'b')
+    assert classifier.classify("hi, healthcare").greeting
+    assert classifier.matches("health healthcare") == ['health', 'healthcare']
+    print("✅ Overlapping terms test passed")
+
+
+def test_services_share_the_classifier():
+    """Gemini, Claude and RAG agree on needs from the same vocabulary"""
+    print("\n🧪 Testing service integration...")
+    message = "we got evicted and my kids are hungry"
+    context = {'needs': 'employment'}
+    gemini_needs = GeminiService(api_key='test')._extract_needs_from_message(message, context)
+    claude_needs = ClaudeService()._extract_needs_from_message(message, context)
+    print(f"   Gemini: {gemini_needs}, Claude: {claude_needs}")
+    assert gemini_needs == claude_needs == ['food', 'legal', 'employment']
+    # Gemini keeps reporting its own labels for shelter and healthcare
+    message = "need a place to stay and a doctor"
+    assert GeminiService(api_key='test')._extract_needs_from_message(message, {'needs': 'housing'}) == ['housing', 'health']
+    assert ClaudeService()._extract_needs_from_message(message) == ['shelter', 'healthcare']
+    assert GeminiService(api_key='test')._extract_needs_from_message("hello there") == ['general']
+    assert ClaudeService()._extract_needs_from_message("hello there") == ['general']
+
+    assert rag_pipeline._map_need_to_category("somewhere to sleep tonight") == 'shelter'
+    assert rag_pipeline._map_need_to_category("counseling") == 'healthcare'
+    assert rag_pipeline._map_need_to_category("general") == 'food'
+    assert GeminiService(api_key='test')._is_urgent_message("I want to die")
+    assert GeminiService(api_key='test')._prepare_support_prompt(
+        "hey i'm hopeless", None, "empathetic_coach", "coach", False, None)[0] is None
+    print("✅ Service integration test passed")
+
+
+if __name__ == "__main__":
+    print("Starting Intent Classifier Tests...\n")
+    test_needs_greetings_and_crisis_in_one_pass()
+    test_terms_match_at_word_starts()
+    test_whole_word_terms_ignore_longer_words()
+    test_overlapping_terms_all_reported()
+    test_services_share_the_classifier()
+    print("\n🎉 All intent classifier tests passed!")
@@ -108,11 +108,24 @@ def test_flask_shell_commands():
             print(f"❌ Error in Flask shell test: {str(e)}")
 
 
+def test_upgrade_db_command():
+    """Schema upgrade and backfills run as a CLI step, not at import"""
+    print("\n🧪 Testing upgrade-db command...")
+    result = app.test_cli_runner().invoke(args=['upgrade-db'])
+    print(f"   {result.output.strip()}")
+    assert result.exit_code == 0
+    assert 'Schema: up to date' in result.output
+    assert 'Backfilled crisis flags for 0 conversations' in result.output
+    assert 'Stats counters: in sync' in result.output
+    print("✅ upgrade-db command test passed")
+
+
 if __name__ == "__main__":
     print("Starting Model Tests...\n")
 
     success = test_models()
     test_flask_shell_commands()
+    test_upgrade_db_command()
 
     if success:
         print("\n🎉 All tests passed! Database models are working correctly.")
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Test script for keyset pagination and the admin and chat user listings
+"""
+
+import tracemalloc
+from datetime import datetime, timedelta
+from flask import Flask
+from models.user import db, User
+from models.conversation import Conversation
+from testing_helpers import capture_statements, count_queries, explain, make_app
+from utils.pagination import decode_cursor, encode_cursor, page_size
+
+START = datetime(2024, 1, 1)
+
+
+def make_user_app(users: int) -> Flask:
+    app = make_app()
+    with app.app_context():
+        for u in range(users):
+            # Pairs of users share a timestamp so the id tie-breaker matters
+            user = User(name=f"User {u}", created_at=START + timedelta(hours=u // 2))
+            db.session.add(user)
+            db.session.flush()
+            db.session.add_all(
+                Conversation(user_id=user.id, message=f"message {i}",
+                             created_at=START + timedelta(days=1, hours=u, minutes=i))
+                for i in range(u % 4))
+        db.session.commit()
+    return app
+
+
+def test_cursor_round_trip():
+    """Cursors are opaque, URL-safe and reject garbage"""
+    print("🧪 Testing cursor encoding...")
+    created_at = datetime(2024, 5, 6, 7, 8, 9, 123456)
+    cursor = encode_cursor(created_at, 42)
+    assert all(c.isalnum() or c in '-_' for c in cursor)
+    assert decode_cursor(cursor) == (created_at, 42)
+    for bad in ('not-a-cursor', encode_cursor(None, 1)[:-3], '!!!'):
+        try:
+            decode_cursor(bad)
+            assert False, f"accepted {bad!r}"
+        except ValueError:
+            pass
+    assert page_size(None) == 50 and page_size(0) == 1 and page_size(10_000) == 200
+    print("✅ Cursor test passed")
+
+
+def test_api_users_pages_cover_everyone_once():
+    """Walking next_cursor visits every user once, newest first"""
+    print("\n🧪 Testing admin users pagination...")
+    app = make_user_app(users=25)
+    client = app.test_client()
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        url = '/admin/api/users?limit=4' + (f'&cursor={cursor}' if cursor else '')
+        data = client.get(url).get_json()
+        seen.extend(data['users'])
+        pages += 1
+        cursor = data['next_cursor']
+        if not cursor:
+            break
+
+    print(f"   {len(seen)} users over {pages} pages")
+    assert pages == 7
+    assert [u['id'] for u in seen] == list(range(25, 0, -1))
+    by_id = {u['id']: u for u in seen}
+    assert by_id[4]['conversation_count'] == 3
+    assert by_id[4]['last_active'] == (START + timedelta(days=1, hours=3, minutes=2)).isoformat()
+    assert by_id[5]['conversation_count'] == 0
+
+    assert client.get('/admin/api/users?cursor=garbage').status_code == 400
+    print("✅ Admin users pagination test passed")
+
+
+def test_api_users_query_count_is_constant():
+    """One grouped query per page, whatever the number of users"""
+    print("\n🧪 Testing admin users query count...")
+    small, large = make_user_app(users=5), make_user_app(users=120)
+    small_count = count_queries(small, lambda: small.test_client().get('/admin/api/users?limit=200'))
+    large_count = count_queries(large, lambda: large.test_client().get('/admin/api/users?limit=200'))
+    print(f"   5 users: {small_count} queries, 120 users: {large_count} queries")
+    assert small_count == large_count == 1
+    print("✅ Query count test passed")
+
+
+def make_bulk_app(users: int, conversations_per_user: int = 2) -> Flask:
+    """Many users inserted with executemany, for streaming tests"""
+    app = make_user_app(users=0)
+    with app.app_context():
+        db.session.execute(User.__table__.insert(), [
+            {'id': u, 'name': f"User {u}", 'created_at': START + timedelta(seconds=u)}
+            for u in range(1, users + 1)])
+        db.session.execute(Conversation.__table__.insert(), [
+            {'user_id': u, 'message': 'hello', 'is_flagged': False,
+             'created_at': START + timedelta(seconds=u, milliseconds=i)}
+            for u in range(1, users + 1) for i in range(conversations_per_user)])
+        db.session.commit()
+    return app
+
+
+def stream_peak(app: Flask, url: str):
+    """(bytes out, last 200 characters, peak traced bytes) consuming a streamed response chunk by chunk"""
+    client = app.test_client()
+    tracemalloc.start()
+    try:
+        response = client.get(url, buffered=False)
+        size = 0
+        tail = ''
+        for chunk in response.response:
+            text = chunk.decode('utf-8') if isinstance(chunk, bytes) else chunk
+            size += len(text)
+            tail = (tail + text)[-200:]
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return size, tail, peak
+
+
+def test_chat_users_counts_without_loading_conversations():
+    """Counts come from a subquery; no Conversation rows are loaded"""
+    print("\n🧪 Testing /api/chat/users counts...")
+    app = make_user_app(users=9)
+    client = app.test_client()
+    data = client.get('/api/chat/users').get_json()
+    assert data['total_users'] == 9 and data['next_cursor'] is None
+    assert [u['conversation_count'] for u in data['users']] == [u % 4 for u in range(9)]
+
+    page = client.get('/api/chat/users?limit=4').get_json()
+    assert [u['id'] for u in page['users']] == [1, 2, 3, 4] and page['next_cursor']
+    rest = client.get(f"/api/chat/users?limit=100&cursor={page['next_cursor']}").get_json()
+    assert [u['id'] for u in rest['users']] == [5, 6, 7, 8, 9] and rest['next_cursor'] is None
+    assert client.get('/api/chat/users?cursor=garbage').status_code == 400
+
+    bulk = make_bulk_app(users=2000)
+    queries = count_queries(bulk, lambda: bulk.test_client().get('/api/chat/users').get_data())
+    print(f"   2000 users: {queries} queries")
+    assert queries == 4  # ceil(2000 / 500) batches, counts included
+    print("✅ /api/chat/users count test passed")
+
+
+def test_chat_users_streams_in_flat_memory():
+    """Peak memory does not grow with the number of users"""
+    print("\n🧪 Testing /api/chat/users streaming memory...")
+    small, large = make_bulk_app(users=2000), make_bulk_app(users=20000)
+    small_size, _, small_peak = stream_peak(small, '/api/chat/users')
+    large_size, tail, large_peak = stream_peak(large, '/api/chat/users')
+    print(f"   2k users: {small_size:,} bytes out, peak {small_peak / 1e6:.2f} MB")
+    print(f"   20k users: {large_size:,} bytes out, peak {large_peak / 1e6:.2f} MB")
+    assert tail.endswith('"total_users": 20000, "next_cursor": null}')
+    assert large_size > 9 * small_size
+    assert large_peak < 2 * small_peak
+    print("✅ Streaming memory test passed")
+
+
+def walk(client, url: str, key: str):
+    """Every page of a cursor-paginated endpoint"""
+    pages, cursor = [], None
+    while True:
+        separator = '&' if '?' in url else '?'
+        data = client.get(url + (f'{separator}cursor={cursor}' if cursor else '')).get_json()
+        pages.append(data[key])
+        cursor = data['next_cursor']
+        if not cursor:
+            return pages
+
+
+def test_history_endpoints_page_through_everything():
+    """History, summaries and the admin listing expose every row via cursors"""
+    print("\n🧪 Testing history pagination...")
+    app = make_user_app(users=0)
+    with app.app_context():
+        user = User(name="Long history")
+        db.session.add(user)
+        db.session.flush()
+        # 75 conversations, with pairs sharing a timestamp
+        db.session.add_all(Conversation(user_id=user.id, message=f"m{i}", response="ok",
+                                        created_at=START + timedelta(minutes=i // 2))
+                           for i in range(75))
+        db.session.commit()
+        user_id = user.id
+    client = app.test_client()
+
+    pages = walk(client, f'/api/chat/history/{user_id}', 'history')
+    print(f"   history pages: {[len(p) for p in pages]}")
+    assert [len(p) for p in pages] == [20, 20, 20, 15]
+    # Each page is chronological; pages go back in time
+    assert [c['message'] for c in pages[0]] == [f"m{i}" for i in range(55, 75)]
+    assert [c['message'] for page in reversed(pages) for c in page] == [f"m{i}" for i in range(75)]
+
+    pages = walk(client, '/admin/api/conversations?limit=30', 'conversations')
+    assert [len(p) for p in pages] == [30, 30, 15]
+    assert len({c['id'] for page in pages for c in page}) == 75
+
+    first = client.get(f'/api/chat/summarize/{user_id}').get_json()
+    assert first['conversation_count'] == 10 and first['next_cursor']
+    older = client.get(f"/api/chat/summarize/{user_id}?cursor={first['next_cursor']}").get_json()
+    assert older['conversation_count'] == 10
+
+    for url in (f'/api/chat/history/{user_id}', '/admin/api/conversations', f'/api/chat/summarize/{user_id}'):
+        assert client.get(url + '?cursor=garbage').status_code == 400
+    print("✅ History pagination test passed")
+
+
+def test_rows_without_timestamps_are_not_skipped():
+    """Cursors taken from (or past) NULL created_at rows still reach every row"""
+    print("\n🧪 Testing pages across NULL timestamps...")
+    app = make_user_app(users=0)
+    with app.app_context():
+        # Legacy rows written before created_at was set
+        db.session.execute(User.__table__.insert(), [
+            {'id': u, 'name': f"User {u}", 'created_at': None if u in (1, 3) else START + timedelta(hours=u)}
+            for u in range(1, 6)])
+        db.session.execute(Conversation.__table__.insert(), [
+            {'id': i, 'user_id': 1, 'message': f"m{i}", 'is_flagged': False,
+             'created_at': None if i % 2 else START + timedelta(minutes=i)}
+            for i in range(1, 8)])
+        db.session.commit()
+    client = app.test_client()
+
+    pages = walk(client, '/api/chat/users?limit=1', 'users')
+    print(f"   /api/chat/users: {[u['id'] for page in pages for u in page]}")
+    assert [u['id'] for page in pages for u in page] == [1, 3, 2, 4, 5]
+    pages = walk(client, '/admin/api/users?limit=1', 'users')
+    assert [u['id'] for page in pages for u in page] == [5, 4, 2, 3, 1]
+
+    pages = walk(client, '/admin/api/conversations?limit=2', 'conversations')
+    assert [c['id'] for page in pages for c in page] == [6, 4, 2, 7, 5, 3, 1]
+    pages = walk(client, '/api/chat/history/1?limit=3', 'history')
+    assert sorted(c['id'] for page in pages for c in page) == list(range(1, 8))
+    print("✅ NULL timestamp pagination test passed")
+
+
+def test_deep_pages_seek_instead_of_offset():
+    """A page far back is an index range seek, not an OFFSET walk"""
+    print("\n🧪 Testing deep page query plan...")
+    app = make_bulk_app(users=1, conversations_per_user=5000)
+    cursor = encode_cursor(START + timedelta(seconds=1, milliseconds=100), 101)
+    responses = []
+    statements = capture_statements(
+        app, lambda: responses.append(app.test_client().get(f'/api/chat/history/1?cursor={cursor}')))
+    data = responses[0].get_json()
+    plan = ' '.join(explain(app, *statements[-1]))
+    print(f"   {plan}")
+    assert 'ix_conversations_user_id_created_at (user_id=? AND created_at<?)' in plan
+    assert [c['id'] for c in data['history']][-1] == 100
+    print("✅ Deep page test passed")
+
+
+if __name__ == "__main__":
+    print("Starting Pagination Tests...\n")
+    test_cursor_round_trip()
+    test_api_users_pages_cover_everyone_once()
+    test_api_users_query_count_is_constant()
+    test_chat_users_counts_without_loading_conversations()
+    test_chat_users_streams_in_flat_memory()
+    test_history_endpoints_page_through_everything()
+    test_rows_without_timestamps_are_not_skipped()
+    test_deep_pages_seek_instead_of_offset()
+    print("\n🎉 All pagination tests passed!")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for conversation query plans: hot endpoints must use indexes
+
+Runs each endpoint against a seeded in-memory database, captures every
+SELECT it issues, and checks SQLite's EXPLAIN QUERY PLAN for it.
+"""
+
+from datetime import datetime, timedelta
+from flask import Flask
+from models.user import db, User
+from models.conversation import Conversation
+from routes.chat import _get_user_and_history
+from testing_helpers import make_app, query_plans, statement_plans
+
+USERS = 20
+CONVERSATIONS_PER_USER = 30
+
+
+def make_seeded_app() -> Flask:
+    app = make_app()
+    with app.app_context():
+        start = datetime(2024, 1, 1)
+        for u in range(USERS):
+            user = User(name=f"User {u}", created_at=start + timedelta(hours=u))
+            db.session.add(user)
+            db.session.flush()
+            db.session.add_all(
+                Conversation(user_id=user.id, message=f"message {i}", response="ok",
+                             created_at=start + timedelta(hours=u, minutes=i))
+                for i in range(CONVERSATIONS_PER_USER))
+        db.session.commit()
+    return app
+
+
+def assert_indexed(name: str, plans):
+    assert plans, f"{name}: no conversation queries captured"
+    for statement, plan in plans:
+        for line in plan:
+            # "SCAN conversations USING [COVERING] INDEX ..." walks an index;
+            # a bare "SCAN conversations" reads the whole table
+            assert not (line.startswith('SCAN conversations') and 'USING' not in line), \
+                f"{name}: full table scan\n{statement}\n{plan}"
+            if 'conversations.created_at' in statement.split('ORDER BY')[-1]:
+                assert 'USE TEMP B-TREE FOR ORDER BY' not in line, \
+                    f"{name}: sort not served by an index\n{statement}\n{plan}"
+    print(f"   {name}: {len(plans)} queries indexed")
+
+
+def test_chat_endpoints_use_indexes():
+    """History, summaries and the user list seek by (user_id, created_at)"""
+    print("🧪 Testing chat endpoint query plans...")
+    app = make_seeded_app()
+    client = app.test_client()
+
+    def history_for_send_message():
+        with app.test_request_context():
+            _get_user_and_history(3, {})
+
+    assert_indexed('send_message history', query_plans(app, history_for_send_message))
+    assert_indexed('get_chat_history', query_plans(app, lambda: client.get('/api/chat/history/3')))
+    assert_indexed('summarize', query_plans(app, lambda: client.get('/api/chat/summarize/3')))
+    assert_indexed('get_users', query_plans(app, lambda: client.get('/api/chat/users').get_data()))
+    print("✅ Chat endpoint query plan test passed")
+
+
+def test_admin_endpoints_use_indexes():
+    """Admin listings and detail views avoid conversation table scans"""
+    print("\n🧪 Testing admin endpoint query plans...")
+    app = make_seeded_app()
+    client = app.test_client()
+
+    assert_indexed('api_users', query_plans(app, lambda: client.get('/admin/api/users')))
+    assert_indexed('api_user_detail', query_plans(app, lambda: client.get('/admin/api/user/5')))
+    assert_indexed('api_conversations', query_plans(app, lambda: client.get('/admin/api/conversations')))
+    assert_indexed('api_conversations flagged',
+                   query_plans(app, lambda: client.get('/admin/api/conversations?flagged=true')))
+    assert_indexed('api_conversation_detail',
+                   query_plans(app, lambda: client.get('/admin/api/conversation/40')))
+
+    # Stats come from the counters table: no conversation queries at all,
+    # and one primary-key lookup
+    assert query_plans(app, lambda: client.get('/admin/api/stats')) == []
+    lookups = statement_plans(app, lambda: client.get('/admin/api/stats'))
+    assert len(lookups) == 1, lookups
+    assert lookups[0][1] == ['SEARCH stats_counters USING INDEX sqlite_autoindex_stats_counters_1 (name=?)'], lookups
+    print("✅ Admin endpoint query plan test passed")
+
+
+def test_declared_indexes():
+    """The composite and created_at indexes exist on a fresh database"""
+    print("\n🧪 Testing declared indexes...")
+    app = make_seeded_app()
+    with app.app_context():
+        inspector = db.inspect(db.engine)
+        conversation_indexes = {i['name']: i['column_names'] for i in inspector.get_indexes('conversations')}
+        user_indexes = {i['name']: i['column_names'] for i in inspector.get_indexes('users')}
+    print(f"   conversations: {conversation_indexes}")
+    assert conversation_indexes['ix_conversations_user_id_created_at'] == ['user_id', 'created_at']
+    assert conversation_indexes['ix_conversations_created_at'] == ['created_at']
+    assert user_indexes['ix_users_created_at'] == ['created_at']
+    print("✅ Declared index test passed")
+
+
+if __name__ == "__main__":
+    print("Starting Query Plan Tests...\n")
+    test_chat_endpoints_use_indexes()
+    test_admin_endpoints_use_indexes()
+    test_declared_indexes()
+    print("\n🎉 All query plan tests passed!")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for the inverted resource index behind RAG free-text search
+"""
+
+import time
+from services.resource_index import ResourceIndex, tokenize
+from config import Config
+from services.rag_pipeline import rag_pipeline
+from services.resource_store import load_resource_source
+from testing_helpers import make_app
+
+
+def test_tokenize_keeps_schedule_tokens():
+    """24/7 survives tokenization and plurals fold to their stem"""
+    print("🧪 Testing tokenizer...")
+    assert tokenize("24/7 Family Shelters, no documentation") == [
+        '24/7', 'family', 'shelter', 'no', 'documentation']
+    assert tokenize("Families") == ['family']
+    print("✅ Tokenizer test passed")
+
+
+def test_free_text_and_facets():
+    """Multi-term queries rank by matched terms and respect facet filters"""
+    print("\n🧪 Testing free-text and faceted search...")
+    index = rag_pipeline.resource_index
+    results = index.search("24/7 family shelter no documentation", limit=5)
+    print(f"   Top result: {results[0]['name']} ({results[0]['match_score']})")
+    assert results
+    assert results[0]['match_score'] >= results[-1]['match_score']
+    assert results[0]['category'] == 'shelter'
+
+    oakland_health = index.search("trauma therapy", region='oakland', category='healthcare')
+    assert oakland_health
+    assert all(r['region'] == 'oakland' and r['category'] == 'healthcare'
+               for r in oakland_health)
+
+    assert index.search("", region='berkeley', limit=100) == index.search(
+        "", region='berkeley', category='healthcare', limit=100)
+    assert index.search("zzzunknownterm") == []
+    print("✅ Search test passed")
+
+
+def test_lookup_stays_fast_at_scale():
+    """A few thousand resources still answer in well under a millisecond each"""
+    print("\n🧪 Testing lookup latency on a scaled-up database...")
+    database = {
+        f"region_{r}": {
+            category: [dict(resource, name=f"{resource['name']} #{r}") for resource in resources]
+            for category, resources in load_resource_source(Config.RESOURCE_DATA_PATH)['oakland'].items()
+        }
+        for r in range(100)
+    }
+    index = ResourceIndex(database)
+    assert index.get_stats()['resources'] > 5000
+
+    runs = 200
+    started = time.perf_counter()
+    for _ in range(runs):
+        index.search("24/7 emergency shelter", region='region_42', limit=10)
+    per_query_ms = (time.perf_counter() - started) / runs * 1000
+    print(f"   {per_query_ms:.3f} ms/query over {index.get_stats()['resources']} resources")
+    assert per_query_ms < 5
+    print("✅ Latency test passed")
+
+
+def test_search_limit_is_clamped():
+    """Zero or negative limits return one result, not a slice from the end"""
+    print("\n🧪 Testing search limit bounds...")
+    client = make_app().test_client()
+    for limit, expected in (('-3', 1), ('0', 1), ('500', 50)):
+        response = client.get(f'/api/chat/resources/search?q=shelter&limit={limit}')
+        assert response.status_code == 200
+        print(f"   limit={limit}: {response.get_json()['total_resources']} results")
+        assert response.get_json()['total_resources'] == min(expected, len(
+            rag_pipeline.resource_index.search('shelter', limit=1000)))
+
+    response = client.get('/api/chat/resources/search?q=shelter&location=Oakland&mode=hybrid&limit=0')
+    assert response.status_code == 200
+    assert len(response.get_json()['resources']) == 1
+    print("✅ Search limit test passed")
+
+
+if __name__ == "__main__":
+    print("Starting Resource Index Tests...\n")
+    test_tokenize_keeps_schedule_tokens()
+    test_free_text_and_facets()
+    test_lookup_stays_fast_at_scale()
+    test_search_limit_is_clamped()
+    print("\n🎉 All resource index tests passed!")
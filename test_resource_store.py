@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test script for the compiled, memory-mapped resource store
+"""
+
+import gc
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from services.rag_pipeline import RAGPipeline
+from services.resource_store import ResourceStore, compile_resource_store, open_resource_store
+
+CATALOGUE = {
+    "oakland": {
+        "shelter": [{
+            "name": "Test Shelter",
+            "address": "1 Test St, Oakland, CA 94612",
+            "phone": "(510) 000-0000",
+            "hours": "24/7",
+            "services": ["Emergency shelter"],
+            "requirements": "None",
+            "beds_available": 12,
+            "distance": None
+        }]
+    }
+}
+
+
+def _write_catalogue(directory, catalogue):
+    source = os.path.join(directory, 'resources.json')
+    with open(source, 'w') as f:
+        json.dump(catalogue, f)
+    return source
+
+
+def test_compile_and_read_only_open():
+    """Compiled rows round-trip, gain coordinates and cannot be written"""
+    print("🧪 Testing resource store compile...")
+    with tempfile.TemporaryDirectory() as directory:
+        source = _write_catalogue(directory, CATALOGUE)
+        db_path = os.path.join(directory, 'resources.db')
+        assert compile_resource_store(source, db_path) == 1
+
+        store = ResourceStore(db_path)
+        resource = store.get(0)
+        assert resource['name'] == "Test Shelter"
+        assert resource['lat'] and resource['lon']
+        assert [row[1:3] for row in store.iter_rows()] == [('oakland', 'shelter')]
+        try:
+            store._conn.execute("DELETE FROM resources")
+            assert False, "store should be read-only"
+        except sqlite3.OperationalError:
+            pass
+        print(f"   Stats: {store.get_stats()}")
+        store.close()
+    print("✅ Compile test passed")
+
+
+def test_stale_store_is_recompiled():
+    """Editing the JSON source is picked up on the next open"""
+    print("\n🧪 Testing recompilation of a stale store...")
+    with tempfile.TemporaryDirectory() as directory:
+        source = _write_catalogue(directory, CATALOGUE)
+        db_path = os.path.join(directory, 'resources.db')
+        open_resource_store(source, db_path).close()
+
+        time.sleep(0.01)
+        updated = json.loads(json.dumps(CATALOGUE))
+        updated['oakland']['shelter'][0]['beds_available'] = 3
+        _write_catalogue(directory, updated)
+        os.utime(source, (time.time() + 5, time.time() + 5))
+
+        pipeline = RAGPipeline(source_path=source, store_path=db_path)
+        results = pipeline.retrieve_resources("94612", ["shelter"])
+        assert results['resources']['shelter'][0]['beds_available'] == 3
+        pipeline.store.close()
+    print("✅ Recompile test passed")
+
+
+def test_hot_reload_swaps_snapshot():
+    """A watched edit publishes a new snapshot; readers keep the old one"""
+    print("\n🧪 Testing hot reload...")
+    with tempfile.TemporaryDirectory() as directory:
+        source = _write_catalogue(directory, CATALOGUE)
+        pipeline = RAGPipeline(source_path=source, store_path=os.path.join(directory, 'resources.db'))
+        old_snapshot = pipeline.snapshot
+        pipeline.start_watcher(interval=0.05)
+        try:
+            updated = json.loads(json.dumps(CATALOGUE))
+            updated['oakland']['shelter'].append(dict(updated['oakland']['shelter'][0], name="Second Shelter"))
+            _write_catalogue(directory, updated)
+            os.utime(source, (time.time() + 5, time.time() + 5))
+
+            deadline = time.monotonic() + 5
+            while pipeline.snapshot is old_snapshot and time.monotonic() < deadline:
+                time.sleep(0.05)
+
+            stats = pipeline.get_stats()
+            print(f"   Stats: {stats}")
+            assert stats['version'] == 2 and stats['resources'] == 2
+            assert stats['reloads'] == 1 and stats['load_ms'] > 0
+            assert len(old_snapshot.resource_index) == 1
+            assert old_snapshot.resource_index.record(0)['name'] == "Test Shelter"
+        finally:
+            pipeline.watcher.stop()
+    print("✅ Hot reload test passed")
+
+
+def test_failed_reload_keeps_current_data():
+    """A broken edit is reported and the previous snapshot keeps serving"""
+    print("\n🧪 Testing failed reload...")
+    with tempfile.TemporaryDirectory() as directory:
+        source = _write_catalogue(directory, CATALOGUE)
+        pipeline = RAGPipeline(source_path=source, store_path=os.path.join(directory, 'resources.db'))
+        with open(source, 'w') as f:
+            f.write('{ not json')
+        os.utime(source, (time.time() + 5, time.time() + 5))
+        assert pipeline.reload() is False
+        assert pipeline.get_stats()['reload_failures'] == 1
+        assert pipeline.retrieve_resources("94612", ["shelter"])['total_resources'] == 1
+    print("✅ Failed reload test passed")
+
+
+def test_directory_source_is_merged():
+    """A directory of JSON files compiles as one catalogue and tracks edits"""
+    print("\n🧪 Testing directory source...")
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, 'catalogue')
+        os.mkdir(source)
+        with open(os.path.join(source, 'a.json'), 'w') as f:
+            json.dump(CATALOGUE, f)
+        second = {"oakland": {"shelter": [dict(CATALOGUE['oakland']['shelter'][0], name="Second Shelter")]},
+                  "san_francisco": {"food": [dict(CATALOGUE['oakland']['shelter'][0], name="Test Pantry")]}}
+        with open(os.path.join(source, 'b.json'), 'w') as f:
+            json.dump(second, f)
+        with open(os.path.join(source, 'notes.txt'), 'w') as f:
+            f.write('ignored')
+
+        db_path = os.path.join(directory, 'resources.db')
+        store = open_resource_store(source, db_path)
+        assert [(row[1], row[2], row[3]['name']) for row in store.iter_rows()] == [
+            ('oakland', 'shelter', "Test Shelter"), ('oakland', 'shelter', "Second Shelter"),
+            ('san_francisco', 'food', "Test Pantry")]
+        store.close()
+
+        # Removing a file makes the store stale
+        os.remove(os.path.join(source, 'b.json'))
+        os.utime(source, (time.time() + 5, time.time() + 5))
+        store = open_resource_store(source, db_path)
+        assert len(store) == 1
+        store.close()
+    print("✅ Directory source test passed")
+
+
+def test_reload_closes_replaced_store():
+    """The replaced snapshot's store is closed once nothing reads it"""
+    print("\n🧪 Testing store release on reload...")
+    with tempfile.TemporaryDirectory() as directory:
+        source = _write_catalogue(directory, CATALOGUE)
+        pipeline = RAGPipeline(source_path=source, store_path=os.path.join(directory, 'resources.db'))
+        in_flight = pipeline.snapshot
+        old_store = in_flight.store
+        os.utime(source, (time.time() + 5, time.time() + 5))
+        assert pipeline.reload() is True
+
+        # A call still holding the old snapshot can keep reading it
+        assert in_flight.store.get(0)['name'] == "Test Shelter"
+        del in_flight
+        gc.collect()
+        try:
+            old_store.get(0)
+            assert False, "replaced store should be closed"
+        except sqlite3.ProgrammingError:
+            pass
+        assert pipeline.store.get(0)['name'] == "Test Shelter"
+        pipeline.snapshot.close()
+    print("✅ Store release test passed")
+
+
+if __name__ == "__main__":
+    print("Starting Resource Store Tests...\n")
+    test_compile_and_read_only_open()
+    test_stale_store_is_recompiled()
+    test_hot_reload_swaps_snapshot()
+    test_failed_reload_keeps_current_data()
+    test_directory_source_is_merged()
+    test_reload_closes_replaced_store()
+    print("\n🎉 All resource store tests passed!")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script for the Gemini response cache (in-process LRU and Redis backends)
+and the emotion score memo
+"""
+
+import time
+from services.response_cache import LRUCache, RedisCache, make_cache_key
+from test_gemini_performance import FakeGeminiHandler, start_fake_gemini
+
+
+class LocalRedis:
+    """In-memory stand-in for the redis client calls the cache makes"""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        value, expires_at = self.store.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.store[key]
+            return None
+        return value
+
+    def set(self, key, value, ex=None):
+        self.store[key] = (value.encode(), time.monotonic() + ex if ex else None)
+
+    def delete(self, key):
+        self.store.pop(key, None)
+
+
+class DistressedHandler(FakeGeminiHandler):
+    """Returns high-distress emotion scores"""
+    reply_text = '{"distress": 0.95, "hope": 0.1, "motivation": 0.2, "anxiety": 0.9, "positivity": 0.1, "overall_sentiment": "negative"}'
+
+
+def test_cache_key_normalization():
+    """Whitespace differences share a key; generation config does not"""
+    print("🧪 Testing cache key normalization...")
+    config = {'temperature': 0.3, 'maxOutputTokens': 1024}
+    assert make_cache_key("Hello   there\n", config) == make_cache_key("Hello there", config)
+    assert make_cache_key("Hello there", config) != make_cache_key(
+        "Hello there", {**config, 'maxOutputTokens': 800})
+    print("✅ Cache key test passed")
+
+
+def test_lru_eviction_and_ttl():
+    """The LRU drops least recently used entries and expires stale ones"""
+    print("\n🧪 Testing LRU eviction and TTL...")
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+    short = LRUCache(maxsize=2, ttl=0.05)
+    short.set('a', 1)
+    time.sleep(0.1)
+    assert short.get('a') is None
+
+    stats = cache.get_stats()
+    print(f"   Stats: {stats}")
+    assert stats['evictions'] == 1
+    assert stats['hits'] == 2 and stats['misses'] == 1
+    assert short.get_stats()['expirations'] == 1
+    print("✅ LRU test passed")
+
+
+def test_redis_backend():
+    """The shared backend round-trips values through the Redis client"""
+    print("\n🧪 Testing Redis backend with local stand-in...")
+    cache = RedisCache(LocalRedis(), ttl=60)
+    assert cache.get('missing') is None
+    cache.set('key', 'cached reply')
+    assert cache.get('key') == 'cached reply'
+    assert cache.get_stats()['hits'] == 1
+    print("✅ Redis backend test passed")
+
+
+def test_service_serves_repeat_prompts_from_cache():
+    """A repeated prompt costs one API call"""
+    print("\n🧪 Testing Gemini response cache hit path...")
+    server, service = start_fake_gemini()
+    try:
+        messages = [{'role': 'user', 'content': 'thanks'}]
+        first = service.summarize_conversation(messages)
+        second = service.summarize_conversation(messages)
+        assert 'fallback' not in first and 'fallback' not in second
+        assert len(server.requests_seen) == 1
+        assert service.get_cache_stats()['hits'] == 1
+        print("✅ Cache hit test passed")
+    finally:
+        service.http.close()
+        server.shutdown()
+
+
+def test_urgent_prompts_are_not_cached():
+    """Crisis messages and high-distress scores never enter the cache"""
+    print("\n🧪 Testing urgency bypass...")
+    server, service = start_fake_gemini(DistressedHandler)
+    try:
+        service.score_emotional_state("I feel like everything is falling apart")
+        service.score_emotional_state("I feel like everything is falling apart")
+        assert len(server.requests_seen) == 2
+
+        service.get_support_response("I feel hopeless tonight, please help", {'name': 'Test'})
+        service.get_support_response("I feel hopeless tonight, please help", {'name': 'Test'})
+        assert len(server.requests_seen) == 4
+
+        messages = [{'role': 'user', 'content': 'thanks'}, {'role': 'user', 'content': 'I want to die'}]
+        service.summarize_conversation(messages)
+        service.summarize_conversation(messages)
+        assert len(server.requests_seen) == 6
+        assert service.get_cache_stats()['size'] == 0
+        print("✅ Urgency bypass test passed")
+    finally:
+        service.http.close()
+        server.shutdown()
+
+
+def test_emotion_scores_memoized_on_normalized_text():
+    """Repeated short messages are scored once, with an identical dict shape"""
+    print("\n🧪 Testing emotion score memo...")
+    server, service = start_fake_gemini()
+    try:
+        first = service.score_emotional_state("I'm hungry")
+        second = service.score_emotional_state("  im HUNGRY!! ")
+        assert len(server.requests_seen) == 1
+        assert first == second
+        assert service.get_emotion_memo_stats()['hits'] == 1
+        print("✅ Emotion memo test passed")
+    finally:
+        service.http.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    print("Starting Response Cache Tests...\n")
+    test_cache_key_normalization()
+    test_lru_eviction_and_ttl()
+    test_redis_backend()
+    test_service_serves_repeat_prompts_from_cache()
+    test_urgent_prompts_are_not_cached()
+    test_emotion_scores_memoized_on_normalized_text()
+    print("\n🎉 All response cache tests passed!")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for the materialized admin stats counters
+"""
+
+from datetime import datetime, timedelta
+from models.user import db, User
+from models.conversation import Conversation
+from models.stats import StatsCounter, delete_conversations, get_counter_stats, reconcile_stats_counters
+from testing_helpers import capture_statements, explain, make_app
+
+
+def add_user_with_messages(messages, created_at=None):
+    user = User(name="Counter Test", created_at=created_at)
+    db.session.add(user)
+    db.session.flush()
+    db.session.add_all(Conversation(user_id=user.id, message=m, created_at=created_at) for m in messages)
+    db.session.commit()
+    return user
+
+
+def test_counters_follow_inserts_and_deletes():
+    """ORM writes and the bulk-delete helpers keep counters exact"""
+    print("🧪 Testing counter maintenance...")
+    app = make_app()
+    with app.app_context():
+        yesterday = datetime.utcnow() - timedelta(days=1)
+        add_user_with_messages(["old message", "I feel hopeless"], created_at=yesterday)
+        user = add_user_with_messages(["hello", "need food", "I want to die"])
+        stats = get_counter_stats()
+        print(f"   After inserts: {stats}")
+        assert stats == {'total_users': 2, 'total_conversations': 5, 'today_users': 1,
+                         'today_conversations': 3, 'flagged_conversations': 2}
+
+        db.session.delete(Conversation.query.filter_by(message="I want to die").one())
+        db.session.commit()
+        assert delete_conversations(Conversation.query.filter(Conversation.created_at < datetime.utcnow() - timedelta(hours=1))) == 2
+        db.session.commit()
+        stats = get_counter_stats()
+        print(f"   After deletes: {stats}")
+        assert stats == {'total_users': 2, 'total_conversations': 2, 'today_users': 1,
+                         'today_conversations': 2, 'flagged_conversations': 0}
+
+        # Past days were never counted, so deleting their rows leaves no
+        # negative per-day counters behind
+        assert StatsCounter.query.filter(StatsCounter.value < 0).count() == 0
+        assert StatsCounter.query.filter(StatsCounter.name.like('%:' + yesterday.date().isoformat())).count() == 0
+
+        client = app.test_client()
+        assert client.delete(f'/admin/api/user/{user.id}').get_json()['success']
+        assert get_counter_stats()['total_conversations'] == 0
+        assert reconcile_stats_counters() == {}
+    print("✅ Counter maintenance test passed")
+
+
+def test_daily_rollover_and_reconcile():
+    """Yesterday's activity is not today's, and drift is repaired"""
+    print("\n🧪 Testing rollover and reconciliation...")
+    app = make_app()
+    with app.app_context():
+        add_user_with_messages(["a", "b"])
+        today = datetime.utcnow().date()
+        assert get_counter_stats(today)['today_conversations'] == 2
+        assert get_counter_stats(today + timedelta(days=1))['today_conversations'] == 0
+
+        # Writes that bypass the ORM leave the counters behind
+        Conversation.query.delete()
+        db.session.commit()
+        drift = reconcile_stats_counters()
+        print(f"   Drift: {drift}")
+        assert drift['conversations'] == {'stored': 2, 'actual': 0}
+        assert get_counter_stats()['total_conversations'] == 0
+
+        # Past-day counters are pruned on reconcile
+        db.session.add(StatsCounter(name='users:2000-01-01', value=3))
+        db.session.commit()
+        reconcile_stats_counters()
+        assert StatsCounter.query.get('users:2000-01-01') is None
+
+        response = app.test_client().post('/admin/api/stats/reconcile').get_json()
+        assert response['success'] and response['drift'] == {}
+    print("✅ Rollover and reconcile test passed")
+
+
+def test_stats_read_is_one_lookup():
+    """/admin/api/stats costs one primary-key query whatever the table sizes"""
+    print("\n🧪 Testing stats read cost...")
+    app = make_app()
+    with app.app_context():
+        for _ in range(50):
+            add_user_with_messages(["hi"] * 5)
+    responses = []
+    statements = capture_statements(app, lambda: responses.append(app.test_client().get('/admin/api/stats')))
+    assert responses[0].get_json()['total_conversations'] == 250
+    assert len(statements) == 1
+    plan = ' '.join(explain(app, *statements[0]))
+    print(f"   Plan: {plan}")
+    assert plan.startswith('SEARCH stats_counters')
+    print("✅ Stats read test passed")
+
+
+if __name__ == "__main__":
+    print("Starting Stats Counter Tests...\n")
+    test_counters_follow_inserts_and_deletes()
+    test_daily_rollover_and_reconcile()
+    test_stats_read_is_one_lookup()
+    print("\n🎉 All stats counter tests passed!")
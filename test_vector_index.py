@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for the hashed-embedding vector index and semantic retrieval mode
+"""
+
+import numpy as np
+from config import Config
+from services.rag_pipeline import rag_pipeline
+from services.vector_index import HashingEmbedder
+
+
+def test_embeddings_are_unit_and_stable():
+    """Same text, same unit vector; related words overlap"""
+    print("🧪 Testing hashing embedder...")
+    embedder = HashingEmbedder(dim=256)
+    first = embedder.embed("Emergency shelter beds")
+    assert abs(np.linalg.norm(first) - 1.0) < 1e-5
+    assert np.array_equal(first, embedder.embed("emergency  SHELTER beds"))
+    related = float(embedder.embed("counselling") @ embedder.embed("counseling"))
+    unrelated = float(embedder.embed("counselling") @ embedder.embed("groceries"))
+    print(f"   counselling~counseling={related:.2f}, counselling~groceries={unrelated:.2f}")
+    assert related > unrelated
+    print("✅ Embedder test passed")
+
+
+def test_search_matches_exhaustive_sort():
+    """argpartition top-k agrees with a full sort, with and without a filter"""
+    print("\n🧪 Testing vector top-k search...")
+    index = rag_pipeline.snapshot.vector_index
+    query = "free meals and groceries"
+    scores = index.vectors @ index.embedder.embed(query)
+    expected = list(np.argsort(-scores, kind='stable')[:5])
+    assert [record_id for _, record_id in index.search(query, 5)] == expected
+
+    sf = rag_pipeline.resource_index.facet_ids('san_francisco', None)
+    filtered = index.search(query, 3, candidates=sf)
+    assert all(record_id in sf for _, record_id in filtered)
+    print("✅ Vector search test passed")
+
+
+def test_semantic_mode_maps_unlisted_needs():
+    """Needs missing from the keyword lists no longer default to food"""
+    print("\n🧪 Testing semantic retrieval mode...")
+    assert rag_pipeline._map_need_to_category("somewhere to sleep tonight") == 'shelter'
+    assert rag_pipeline._map_need_to_category("need to see a therapist") == 'food'
+
+    original = Config.RAG_RETRIEVAL_MODE
+    Config.RAG_RETRIEVAL_MODE = 'semantic'
+    try:
+        results = rag_pipeline.retrieve_resources("Oakland", ["need to see a therapist"])
+        print(f"   Categories: {list(results['resources'])}")
+        assert list(results['resources']) == ['healthcare']
+    finally:
+        Config.RAG_RETRIEVAL_MODE = original
+
+    found = rag_pipeline.semantic_search("counseling for grief", location="Oakland", k=3)
+    assert found['resources'][0]['category'] == 'healthcare'
+    print("✅ Semantic mode test passed")
+
+
+def test_bm25_prefers_documents_matching_every_term():
+    """BM25 ranks the resource matching all query terms first"""
+    print("\n🧪 Testing BM25 scoring...")
+    index = rag_pipeline.resource_index
+    hits = index.bm25("24/7 family shelter no documentation", limit=5)
+    names = [index.record(record_id)['name'] for _, record_id in hits]
+    print(f"   Top: {names[:3]}")
+    assert names[0] == 'Hamilton Family Center'
+    assert [score for score, _ in hits] == sorted((score for score, _ in hits), reverse=True)
+    assert all(index.record_categories[record_id] == 'food'
+               for _, record_id in index.bm25("free meals", category='food'))
+    assert index.bm25("zzzz unknownword") == []
+    print("✅ BM25 test passed")
+
+
+def test_hybrid_mode_reranks_small_candidate_set():
+    """Hybrid retrieval fuses relevance with the distance/beds heuristics"""
+    print("\n🧪 Testing hybrid retrieval mode...")
+    original = Config.RAG_RETRIEVAL_MODE
+    Config.RAG_RETRIEVAL_MODE = 'hybrid'
+    try:
+        results = rag_pipeline.retrieve_resources(
+            "94612", ["somewhere to sleep with my kids", "therapist for trauma"], "family emergency")
+    finally:
+        Config.RAG_RETRIEVAL_MODE = original
+    print(f"   Categories: {list(results['resources'])}")
+    assert list(results['resources']) == ['shelter', 'healthcare']
+    shelters = results['resources']['shelter']
+    assert len(shelters) == 3
+    assert all(r['distance'] is not None for r in shelters)
+    scores = [r['relevance_score'] for r in shelters]
+    assert scores == sorted(scores, reverse=True)
+
+    found = rag_pipeline.hybrid_search("grief counseling", "Oakland", k=3)
+    assert found['category'] == 'healthcare'
+    assert found['normalized_location'] == 'oakland'
+    assert len(found['resources']) == 3
+
+    empty = rag_pipeline.hybrid_search("grief counseling", "Oakland", k=0)
+    assert empty['resources'] == [] and empty['normalized_location'] is None
+    print("✅ Hybrid mode test passed")
+
+
+if __name__ == "__main__":
+    print("Starting Vector Index Tests...\n")
+    test_embeddings_are_unit_and_stable()
+    test_search_matches_exhaustive_sort()
+    test_semantic_mode_maps_unlisted_needs()
+    test_bm25_prefers_documents_matching_every_term()
+    test_hybrid_mode_reranks_small_candidate_set()
+    print("\n🎉 All vector index tests passed!")
@@ -0,0 +1,64 @@
+"""
+Shared helpers for the database-backed test scripts: an app factory over a
+throwaway SQLite database, and statement capture for query counts and plans
+"""
+
+from typing import Any, Callable, List, Tuple
+from flask import Flask
+from sqlalchemy import event
+from models.user import db
+from routes.admin import admin_bp
+from routes.chat import chat_bp
+
+
+def make_app(database_uri: str = 'sqlite://') -> Flask:
+    """Flask app with the chat and admin blueprints; missing tables are created"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    app.register_blueprint(chat_bp)
+    app.register_blueprint(admin_bp)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def capture_statements(app: Flask, action: Callable[[], Any]) -> List[Tuple[str, Any]]:
+    """(sql, parameters) for every statement issued by action()"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            action()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+    return statements
+
+
+def explain(app: Flask, statement: str, parameters: Any = ()) -> List[str]:
+    """SQLite's EXPLAIN QUERY PLAN lines for one captured statement"""
+    with app.app_context(), db.engine.connect() as connection:
+        return [row[-1] for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters)]
+
+
+def count_queries(app: Flask, action: Callable[[], Any]) -> int:
+    """Number of statements issued by action()"""
+    return len(capture_statements(app, action))
+
+
+def statement_plans(app: Flask, action: Callable[[], Any]) -> List[Tuple[str, List[str]]]:
+    """(sql, plan lines) for every statement issued by action()"""
+    return [(statement, explain(app, statement, parameters))
+            for statement, parameters in capture_statements(app, action)]
+
+
+def query_plans(app: Flask, action: Callable[[], Any]) -> List[Tuple[str, List[str]]]:
+    """(sql, plan lines) for every conversations SELECT issued by action()"""
+    return [(statement, explain(app, statement, parameters))
+            for statement, parameters in capture_statements(app, action)
+            if statement.lstrip().upper().startswith('SELECT') and 'conversations' in statement]
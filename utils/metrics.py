@@ -0,0 +1,44 @@
+# Lightweight in-process metrics helpers
+
+import threading
+from collections import deque
+from typing import Dict, Any
+
+
+class LatencyStats:
+    """Thread-safe latency tracker with percentiles over a recent window"""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        """Record one observation in seconds"""
+        with self._lock:
+            self._recent.append(seconds)
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Summary in milliseconds"""
+        with self._lock:
+            recent = sorted(self._recent)
+            count, total, maximum = self.count, self.total, self.max
+
+        def percentile(p: float) -> float:
+            if not recent:
+                return 0.0
+            return recent[min(len(recent) - 1, int(p * len(recent)))]
+
+        return {
+            'count': count,
+            'avg_ms': round(total / count * 1000, 2) if count else 0.0,
+            'p50_ms': round(percentile(0.50) * 1000, 2),
+            'p95_ms': round(percentile(0.95) * 1000, 2),
+            'max_ms': round(maximum * 1000, 2)
+        }
@@ -0,0 +1,127 @@
+# Keyset pagination over (created_at, id) with opaque cursors
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(created_at: Optional[datetime], row_id: int) -> str:
+    """Opaque cursor for the row a page ended on"""
+    payload = [created_at.isoformat() if created_at else None, row_id]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """
+    (created_at, id) from a cursor made by encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return (datetime.fromisoformat(created_at) if created_at else None), int(row_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def page_size(requested: Optional[int], default: int = DEFAULT_PAGE_SIZE) -> int:
+    """Clamp a requested page size to 1..MAX_PAGE_SIZE"""
+    if requested is None:
+        return default
+    return max(1, min(requested, MAX_PAGE_SIZE))
+
+
+def keyset_page(query, created_at_column, id_column, cursor: Optional[str] = None,
+                limit: int = DEFAULT_PAGE_SIZE, descending: bool = True,
+                key: Optional[Callable[[Any], Tuple[Optional[datetime], int]]] = None) -> Tuple[List[Any], Optional[str]]:
+    """
+    One page of a query ordered by (created_at, id)
+
+    Seeks past the cursor with a WHERE clause instead of OFFSET, so every
+    page costs the same however deep it is, and rows inserted meanwhile do
+    not shift later pages. Rows with a NULL timestamp come after every dated
+    row newest first, and before them oldest first, as SQL orders NULLs.
+
+    Args:
+        query: SQLAlchemy query, without ORDER BY or LIMIT
+        created_at_column: Timestamp column to order by
+        id_column: Unique tie-breaker column
+        cursor: Cursor from the previous page, or None for the first page
+        limit: Page size
+        descending: Newest first (default) or oldest first
+        key: (created_at, id) of a result row; defaults to row.created_at, row.id
+
+    Returns:
+        Tuple of (rows, cursor for the next page or None on the last page)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    key = key or (lambda row: (row.created_at, row.id))
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        # SQL sorts NULL timestamps first ascending and last descending, but
+        # a row-value comparison with NULL is never true, so rows without a
+        # timestamp are sought separately, as their own segment
+        undated = query.filter(created_at_column.is_(None))
+        if created_at is None:
+            if descending:
+                segments = [undated.filter(id_column < row_id)]
+            else:
+                segments = [undated.filter(id_column > row_id),
+                            query.filter(created_at_column.isnot(None))]
+        else:
+            # A row-value comparison lets SQLite turn this into an index range;
+            # the equivalent OR of two comparisons does not
+            position = tuple_(created_at_column, id_column)
+            if descending:
+                segments = [query.filter(position < tuple_(created_at, row_id)), undated]
+            else:
+                segments = [query.filter(position > tuple_(created_at, row_id))]
+    else:
+        segments = [query]
+
+    if descending:
+        order = (created_at_column.desc(), id_column.desc())
+    else:
+        order = (created_at_column.asc(), id_column.asc())
+
+    # One extra row tells us whether another page follows; a later segment
+    # is only read when the earlier ones run out
+    rows = []
+    for segment in segments:
+        rows.extend(segment.order_by(*order).limit(limit + 1 - len(rows)).all())
+        if len(rows) > limit:
+            break
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]))
+
+
+def iter_keyset(query, created_at_column, id_column, cursor: Optional[str] = None,
+                batch_size: int = 500, descending: bool = True,
+                key: Optional[Callable[[Any], Tuple[Optional[datetime], int]]] = None) -> Iterator[Tuple[List[Any], Optional[str]]]:
+    """
+    Walk a whole result set one keyset page at a time
+
+    Only one batch of rows is held at once, so memory stays flat however
+    many rows the query matches.
+
+    Yields:
+        (rows, cursor after this batch or None after the last one)
+    """
+    while True:
+        rows, cursor = keyset_page(query, created_at_column, id_column, cursor,
+                                   batch_size, descending, key)
+        yield rows, cursor
+        if cursor is None:
+            return